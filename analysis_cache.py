@@ -0,0 +1,86 @@
+"""
+Analysis Cache
+Remembers AI match results so a job that was already scored against the
+same profile, with the same model and prompt, is not sent to Gemini again.
+"""
+
+import hashlib
+import re
+from typing import Optional
+
+from disk_cache import DiskCache
+
+
+def fingerprint(text: str) -> str:
+    """Stable short hash of a piece of text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+def normalize_job_text(text: str) -> str:
+    """Collapse whitespace so trivially re-rendered pages hash the same."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class AnalysisCache(DiskCache):
+    """
+    Caches analyze_job results.
+
+    The key combines hashes of the profile, the (normalized, truncated) job
+    text, the model name and the prompt (version + template), so changing
+    MY_PROFILE, the CV file or the prompt automatically misses. When the
+    prompt itself changes, old entries can never match again and are
+    purged on first use.
+    """
+
+    _PROMPT_MARKER = '__prompt__'
+
+    def __init__(self, ttl: float = 7 * 24 * 3600, max_entries: int = 5000, path: Optional[str] = None):
+        super().__init__('analyses', default_ttl=ttl, max_entries=max_entries, path=path)
+        self._checked_prompt = None
+
+    def _ensure_prompt(self, prompt_hash: str):
+        """Drop everything cached under a different prompt template/version."""
+        if self._checked_prompt == prompt_hash:
+            return
+        marker = self.get_entry(self._PROMPT_MARKER, allow_stale=True)
+        if marker is not None and marker['value'] != prompt_hash:
+            print("🧹 Analysis cache: prompt changed, purging old results")
+            self.clear()
+        if marker is None or marker['value'] != prompt_hash:
+            self.set(self._PROMPT_MARKER, prompt_hash, ttl=10 * 365 * 24 * 3600)
+        self._checked_prompt = prompt_hash
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        """Store a value; failed or offline analyses are never cached, so the next run retries them."""
+        if isinstance(value, dict) and (value.get('error') or value.get('offline')):
+            return
+        super().set(key, value, ttl=ttl)
+
+    def make_key(self, profile: str, job_text: str, model_name: str, prompt_version: str, prompt_template: str,
+                 profile_hash: Optional[str] = None) -> str:
+        """
+        Build the cache key for one analysis.
+
+        Args:
+            profile (str): Candidate profile / CV text
+            job_text (str): Job text exactly as it will be sent (already truncated)
+            model_name (str): Gemini model name
+            prompt_version (str): Manually bumped prompt version
+            prompt_template (str): The prompt template text
+            profile_hash (str): fingerprint(profile), when the caller already has it
+
+        Returns:
+            str: Cache key
+        """
+        prompt_hash = fingerprint(f"{prompt_version}\n{prompt_template}")
+        self._ensure_prompt(prompt_hash)
+        return ':'.join([
+            profile_hash or fingerprint(profile),
+            fingerprint(normalize_job_text(job_text)),
+            model_name,
+            prompt_hash
+        ])
+
+
+# Global instance used by the analyzer
+analysis_cache = AnalysisCache()
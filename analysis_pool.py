@@ -0,0 +1,155 @@
+"""
+Concurrent AI Analysis Pool
+Scores jobs with Gemini on a thread pool, throttled by requests-per-minute
+and tokens-per-minute token buckets, retrying quota/429 errors with
+exponential backoff instead of silently returning a zero score.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator
+
+from analyzer import Analyzer, get_analyzer
+from rate_limiter import TokenBucket, backoff_delay, is_retryable_error
+
+
+# Defaults match the Gemini free tier; override in .env for paid plans
+DEFAULT_RPM = float(os.getenv("GEMINI_RPM", "10"))
+DEFAULT_TPM = float(os.getenv("GEMINI_TPM", "250000"))
+
+
+class AnalysisExecutor:
+    """
+    Runs Analyzer.analyze concurrently under shared rate limits.
+
+    Cache hits are returned immediately and do not consume rate-limit
+    budget. Retryable errors (quota, 429, 503, timeouts) are retried up to
+    `max_retries` times with jittered exponential backoff; when retries run
+    out the result carries `"error": True` so callers can tell it apart
+    from a genuine low score - unless a `fallback` scorer is given (e.g.
+    semantic_index.offline_analysis), which then answers instead.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        requests_per_minute: float = DEFAULT_RPM,
+        tokens_per_minute: float = DEFAULT_TPM,
+        max_retries: int = 5,
+        backoff_base: float = 2.0,
+        backoff_cap: float = 60.0,
+        use_cv_file: bool = False,
+        analyzer: Analyzer = None,
+        fallback=None,
+        logger=None
+    ):
+        self.concurrency = max(1, concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.use_cv_file = use_cv_file
+        self.analyzer = analyzer or get_analyzer(use_cv_file)
+        self.fallback = fallback
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self.counters = {'cached': 0, 'requests': 0, 'retries': 0, 'rate_limited': 0, 'failed': 0, 'offline': 0}
+
+    def _log(self, msg, level="INFO"):
+        if self.logger:
+            self.logger(msg, level)
+        else:
+            print(f"[{level}] {msg}")
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def analyze(self, job_text: str) -> dict:
+        """
+        Analyze one job, respecting rate limits and retrying transient errors.
+
+        Returns:
+            dict: match_score, reason, apply_link (+ error=True if it ultimately failed)
+        """
+        cached = self.analyzer.cached(job_text)
+        if cached:
+            self._count('cached')
+            return cached
+
+        estimated_tokens = self.analyzer.estimate_tokens(job_text)
+
+        for attempt in range(self.max_retries + 1):
+            self.request_bucket.acquire(1)
+            self.token_bucket.acquire(estimated_tokens)
+            self._count('requests')
+
+            try:
+                return self.analyzer.analyze(job_text, logger=self.logger, raise_errors=True)
+            except Exception as e:
+                if not is_retryable_error(e) or attempt == self.max_retries:
+                    self._count('failed')
+                    self._log(f"AI Analysis failed after {attempt + 1} attempt(s): {e}", "ERROR")
+                    if self.fallback and is_retryable_error(e):
+                        # Quota exhausted or API unreachable: score locally instead
+                        self._count('offline')
+                        return self.fallback(job_text)
+                    return {
+                        "match_score": 0,
+                        "reason": f"Error during analysis: {str(e)}",
+                        "apply_link": None,
+                        "error": True
+                    }
+
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                self._count('rate_limited')
+                self._count('retries')
+                self._log(f"⏳ Rate limited ({type(e).__name__}), retrying in {delay:.1f}s "
+                          f"(attempt {attempt + 2}/{self.max_retries + 1})", "WARN")
+                # Pausing the shared bucket slows every worker down, and the
+                # next acquire() above is what actually waits out the delay
+                self.request_bucket.penalize(delay)
+
+    def analyze_stream(self, jobs: Iterable[tuple]) -> Iterator[tuple]:
+        """
+        Analyze a stream of jobs concurrently, yielding results as they finish.
+
+        The input is consumed lazily (at most 2x `concurrency` jobs are
+        queued at once), so it can be fed by a producer that is still
+        discovering or scraping jobs.
+
+        Args:
+            jobs (iterable): (key, job_text) pairs; key is any caller id
+
+        Yields:
+            tuple: (key, analysis dict) in completion order
+        """
+        jobs = iter(jobs)
+        max_in_flight = self.concurrency * 2
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="analysis") as pool:
+            in_flight = {}
+            exhausted = False
+
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    try:
+                        key, text = next(jobs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight[pool.submit(self.analyze, text)] = key
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), future.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
@@ -0,0 +1,273 @@
+"""
+Analysis Response Schema
+JSON schemas for Gemini's structured output, a validator compiled from
+them once, and local repair of malformed JSON so a fixable response does
+not cost another API call.
+"""
+
+import json
+import re
+from typing import Callable
+
+
+# Gemini response schemas (OpenAPI subset). Keys the API does not know
+# (minimum, maximum, pattern, min_length) are checked locally only.
+ANALYSIS_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'match_score': {'type': 'INTEGER', 'minimum': 0, 'maximum': 100},
+        'reason': {'type': 'STRING', 'min_length': 1},
+        'apply_link': {'type': 'STRING', 'nullable': True, 'pattern': r'https?://[^\s"\'<>]+'},
+    },
+    'required': ['match_score', 'reason'],
+}
+
+BATCH_ANALYSIS_SCHEMA = {
+    'type': 'ARRAY',
+    'items': {
+        'type': 'OBJECT',
+        'properties': dict(ANALYSIS_SCHEMA['properties'], job_id={'type': 'STRING'}),
+        'required': ['job_id', 'match_score', 'reason'],
+    },
+}
+
+_LOCAL_ONLY_KEYS = {'minimum', 'maximum', 'pattern', 'min_length'}
+
+
+class SchemaError(ValueError):
+    """A response that does not fit the schema."""
+
+
+def api_schema(schema: dict) -> dict:
+    """The schema without the locally checked keys, for generation_config['response_schema']."""
+    cleaned = {}
+    for key, value in schema.items():
+        if key in _LOCAL_ONLY_KEYS:
+            continue
+        if key == 'properties':
+            value = {name: api_schema(prop) for name, prop in value.items()}
+        elif key == 'items':
+            value = api_schema(value)
+        cleaned[key] = value
+    return cleaned
+
+
+def compile_schema(schema: dict, path: str = '$') -> Callable:
+    """
+    Build a validator for `schema` once; calling it checks and normalises a
+    parsed value (returning the normalised value) or raises SchemaError.
+
+    Normalisation is lenient where the intent is unambiguous: integers given
+    as "85", 85.0 or "85/100" are accepted, strings are stripped, unknown
+    object keys are dropped, and a nullable field that fails validation
+    (say, apply_link "N/A") becomes None instead of failing the response.
+    """
+    kind = schema['type']
+    nullable = schema.get('nullable', False)
+
+    if kind == 'OBJECT':
+        properties = {name: compile_schema(prop, f"{path}.{name}") for name, prop in schema['properties'].items()}
+        required = set(schema.get('required', ()))
+
+        def check(value):
+            if not isinstance(value, dict):
+                raise SchemaError(f"{path}: expected an object")
+            result = {}
+            for name, validate in properties.items():
+                if value.get(name) is None:
+                    if name in required:
+                        raise SchemaError(f"{path}.{name}: missing")
+                    result[name] = None
+                else:
+                    result[name] = validate(value[name])
+            return result
+
+    elif kind == 'ARRAY':
+        validate_item = compile_schema(schema['items'], f"{path}[]")
+
+        def check(value):
+            if not isinstance(value, list):
+                raise SchemaError(f"{path}: expected an array")
+            return [validate_item(item) for item in value]
+
+    elif kind in ('INTEGER', 'NUMBER'):
+        low, high = schema.get('minimum'), schema.get('maximum')
+        cast = int if kind == 'INTEGER' else float
+
+        def check(value):
+            if isinstance(value, bool):
+                raise SchemaError(f"{path}: expected a number")
+            if isinstance(value, str):
+                match = re.match(r'\s*(-?\d+(?:\.\d+)?)', value)
+                if not match:
+                    raise SchemaError(f"{path}: expected a number, got {value!r}")
+                value = float(match.group(1))
+            if not isinstance(value, (int, float)):
+                raise SchemaError(f"{path}: expected a number")
+            number = cast(round(value)) if kind == 'INTEGER' else cast(value)
+            if (low is not None and number < low) or (high is not None and number > high):
+                raise SchemaError(f"{path}: {number} outside [{low}, {high}]")
+            return number
+
+    elif kind == 'STRING':
+        pattern = re.compile(schema['pattern']) if 'pattern' in schema else None
+        min_length = schema.get('min_length', 0)
+
+        def check(value):
+            if not isinstance(value, str):
+                if nullable:
+                    return None
+                raise SchemaError(f"{path}: expected a string")
+            value = value.strip()
+            if pattern and not pattern.fullmatch(value):
+                if nullable:
+                    return None
+                raise SchemaError(f"{path}: {value[:50]!r} has the wrong format")
+            if len(value) < min_length:
+                raise SchemaError(f"{path}: empty")
+            return value
+
+    elif kind == 'BOOLEAN':
+        def check(value):
+            if not isinstance(value, bool):
+                raise SchemaError(f"{path}: expected true/false")
+            return value
+
+    else:
+        raise ValueError(f"Unsupported schema type {kind}")
+
+    return check
+
+
+def repair_json(text: str) -> str:
+    """
+    Best-effort fix of common model JSON mistakes: code fences and chatter
+    around the JSON, smart quotes, Python literals, single-quoted strings,
+    trailing commas and output cut off mid-object.
+    """
+    text = text.strip().replace('```json', '').replace('```', '')
+    text = text.translate(str.maketrans({'“': '"', '”': '"', '‘': "'", '’': "'"}))
+
+    starts = [i for i in (text.find('{'), text.find('[')) if i >= 0]
+    if starts:
+        text = text[min(starts):]
+    ends = max(text.rfind('}'), text.rfind(']'))
+    if ends >= 0 and _is_balanced(text[:ends + 1]):
+        text = text[:ends + 1]
+
+    if '"' not in text:
+        text = text.replace("'", '"')
+    text = re.sub(r'\bNone\b', 'null', text)
+    text = re.sub(r'\bTrue\b', 'true', text)
+    text = re.sub(r'\bFalse\b', 'false', text)
+    text = re.sub(r',\s*([}\]])', r'\1', text)
+    return _close_truncated(text)
+
+
+def _scan(text: str):
+    """Open brackets left on the stack and whether a string is still open."""
+    stack, in_string, escaped = [], False, False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(char)
+        elif char in '}]' and stack:
+            stack.pop()
+    return stack, in_string
+
+
+def _is_balanced(text: str) -> bool:
+    stack, in_string = _scan(text)
+    return not stack and not in_string
+
+
+def _close_truncated(text: str) -> str:
+    stack, in_string = _scan(text)
+    if in_string:
+        text += '"'
+    text = re.sub(r',\s*$', '', text)
+    text = re.sub(r'(,\s*)?"[^"]*"\s*:\s*$', '', text)  # key with its value cut off
+    if stack and stack[-1] == '{':
+        text = re.sub(r',\s*"[^"]*"\s*$', '', text)  # key cut off mid-name
+    return text + ''.join('}' if opener == '{' else ']' for opener in reversed(stack))
+
+
+def parse_response(text: str, validate: Callable) -> tuple:
+    """
+    Parse and validate a model response, repairing it locally if needed.
+
+    Args:
+        text (str): Raw response text
+        validate (callable): A validator from compile_schema
+
+    Returns:
+        tuple: (value, status) - status is 'clean', 'repaired' or 'invalid'
+               (value is None when invalid)
+    """
+    try:
+        return validate(json.loads(text)), 'clean'
+    except (ValueError, TypeError):
+        pass
+    try:
+        return validate(json.loads(repair_json(text))), 'repaired'
+    except (ValueError, TypeError):
+        return None, 'invalid'
+
+
+# Compiled once at import
+validate_analysis = compile_schema(ANALYSIS_SCHEMA)
+validate_batch_entry = compile_schema(BATCH_ANALYSIS_SCHEMA['items'])
+
+
+def _any_list(value) -> list:
+    if not isinstance(value, list):
+        raise SchemaError("$: expected an array")
+    return value
+
+
+def parse_analysis(text: str) -> tuple:
+    """parse_response for one analysis."""
+    return parse_response(text, validate_analysis)
+
+
+def parse_batch(text: str) -> tuple:
+    """
+    parse_response for a batch: the array is parsed (and repaired) as a
+    whole, entries are left for validate_batch_entry so one bad entry does
+    not sink the others.
+    """
+    return parse_response(text, _any_list)
+
+
+if __name__ == "__main__":
+    CASES = [
+        ('{"match_score": 85, "reason": "Good", "apply_link": "https://a.com/apply"}', 'clean', 85),
+        ('```json\n{"match_score": 85, "reason": "Good", "apply_link": null}\n```', 'repaired', 85),
+        ('Here is the analysis: {"match_score": "72", "reason": "Fine",}', 'repaired', 72),
+        ("{'match_score': 60, 'reason': 'ok', 'apply_link': None}", 'repaired', 60),
+        ('{"match_score": 90, "reason": "Strong match for Go and', 'repaired', 90),
+        ('{"match_score": 90, "reason": "Strong", "apply_li', 'repaired', 90),
+        ('{"match_score": 55, "reason": "Meh", "apply_link": "N/A"}', 'clean', 55),
+        ('{"match_score": 150, "reason": "Too high"}', 'invalid', None),
+        ('{"reason": "No score"}', 'invalid', None),
+        ('Sorry, I cannot help with that.', 'invalid', None),
+    ]
+    failures = 0
+    for text, expected_status, expected_score in CASES:
+        value, status = parse_analysis(text)
+        score = value['match_score'] if value else None
+        if (status, score) != (expected_status, expected_score):
+            failures += 1
+            print(f"❌ {text!r}: expected {expected_status}/{expected_score}, got {status}/{score}")
+    print(f"🧪 {len(CASES) - failures}/{len(CASES)} response parsing cases passed")
+    print(f"   API schema: {json.dumps(api_schema(ANALYSIS_SCHEMA))}")
+    if failures:
+        raise SystemExit(1)
@@ -4,15 +4,36 @@ Uses Google Gemini AI to match job descriptions against your profile.
 """
 
 import os
-import google.generativeai as genai
+import threading
 from dotenv import load_dotenv
-import json
+from analysis_cache import analysis_cache, fingerprint
+from text_condenser import condense_job_text, text_condenser
+from analysis_schema import (
+    ANALYSIS_SCHEMA, BATCH_ANALYSIS_SCHEMA, SchemaError,
+    api_schema, parse_analysis, parse_batch, validate_batch_entry
+)
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def get_genai():
+    """
+    Import and configure google.generativeai on first use.
+    
+    The SDK is slow to import, so modules that only need the profile,
+    prompt or cache helpers (and cache hits) never pay for it.
+    """
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            _genai = genai
+    return _genai
 
 
 # ============================================
@@ -27,60 +48,25 @@ Preferred locations: India, USA, Europe (remote)
 Industries: Tech startups, SaaS companies, fintech
 """
 
-# You can also load your CV from a file instead:
-def load_cv_from_file(filepath="my_cv.txt"):
-    """
-    Optional: Load your CV/profile from a text file instead of hardcoding it.
-    Create a file called 'my_cv.txt' in the same directory.
-    """
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
-        print(f"⚠️  CV file '{filepath}' not found. Using default profile.")
-        return MY_PROFILE
+# Model and request settings (override in .env)
+MODEL_NAME = os.getenv("GEMINI_MODEL", 'gemini-2.5-flash')
+TEMPERATURE = float(os.getenv("GEMINI_TEMPERATURE", "0.2"))
+REQUEST_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))
 
+# Bump PROMPT_VERSION when changing the prompt in a way that should
+# invalidate previously cached analyses
+PROMPT_VERSION = '2'
 
-def analyze_job(job_text, use_cv_file=False, logger=None):
-    """
-    Analyzes a job description using AI to determine match quality with logging.
-    
-    Args:
-        job_text (str): The full text content of the job posting
-        use_cv_file (bool): If True, loads profile from 'my_cv.txt'
-        logger: Logger function for detailed logging
-        
-    Returns:
-        dict: Contains match_score (0-100), reason, and apply_link
-    """
-    def log(msg, level="INFO"):
-        if logger:
-            logger(msg, level)
-        else:
-            print(f"[{level}] {msg}")
-    
-    profile = load_cv_from_file() if use_cv_file else MY_PROFILE
-    
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    
-    # Truncate job text to avoid token limits (keep first 10,000 chars)
-    truncated_job_text = job_text[:10000]
-    
-    log(f"Preparing AI analysis...")
-    log(f"  Job text length: {len(job_text)} chars (truncated to {len(truncated_job_text)})")
-    log(f"  Using model: gemini-2.5-flash")
-    
-    prompt = f"""
+# Instructions + profile: identical for every job, so it is sent as the
+# model's system instruction and only the job text goes in each request
+SYSTEM_PROMPT_TEMPLATE = """
 You are an expert career advisor and recruiter. Your job is to analyze whether a job posting matches a candidate's profile.
 
 CANDIDATE PROFILE:
 {profile}
 
-JOB DESCRIPTION TEXT:
-{truncated_job_text}
-
 INSTRUCTIONS:
-1. Analyze how well this job matches the candidate's skills, experience, and preferences.
+1. Analyze how well the job posting you are given matches the candidate's skills, experience, and preferences.
 2. Assign a match score from 0-100:
    - 90-100: Excellent match, highly recommended
    - 70-89: Good match, worth applying
@@ -100,77 +86,447 @@ Required JSON format:
 
 If no apply link is found in the text, set apply_link to null.
 """
-    
+
+JOB_PROMPT_TEMPLATE = """
+JOB DESCRIPTION TEXT:
+{job_text}
+"""
+
+# The whole prompt as the model sees it (part of the analysis cache key)
+PROMPT_TEMPLATE = SYSTEM_PROMPT_TEMPLATE + JOB_PROMPT_TEMPLATE
+
+
+# Used by batch_analyze_jobs to score several jobs in one request
+BATCH_SYSTEM_PROMPT_TEMPLATE = """
+You are an expert career advisor and recruiter. Analyze how well EACH of the job postings you are given matches the candidate's profile.
+
+CANDIDATE PROFILE:
+{profile}
+
+INSTRUCTIONS:
+1. Score every job independently from 0-100:
+   - 90-100: Excellent match, highly recommended
+   - 70-89: Good match, worth applying
+   - 50-69: Moderate match, could apply if interested
+   - 0-49: Poor match, not recommended
+2. Extract the direct application URL from each job's text if present, otherwise use null.
+3. Provide a concise 1-2 sentence explanation for each score.
+
+IMPORTANT: Return ONLY a valid JSON array with exactly one object per job, with no additional text, markdown formatting, or code blocks.
+
+Required JSON format:
+[
+    {{"job_id": "J1", "match_score": 85, "reason": "Strong backend match.", "apply_link": "https://company.com/careers/apply/12345"}},
+    {{"job_id": "J2", "match_score": 40, "reason": "Requires 10+ years of Java.", "apply_link": null}}
+]
+"""
+
+BATCH_JOBS_TEMPLATE = """
+JOB POSTINGS:
+{jobs}
+"""
+
+# You can also load your CV from a file instead:
+def load_cv_from_file(filepath="my_cv.txt"):
+    """
+    Optional: Load your CV/profile from a text file instead of hardcoding it.
+    Create a file called 'my_cv.txt' in the same directory.
+    """
     try:
-        log("Sending request to Gemini AI...")
-        response = model.generate_content(prompt)
-        log("Received AI response")
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        print(f"⚠️  CV file '{filepath}' not found. Using default profile.")
+        return MY_PROFILE
+
+
+def _estimate_tokens(text):
+    """Rough token count (~4 characters per token) for budgeting prompts."""
+    return len(text) // 4 + 1
+
+
+class Analyzer:
+    """
+    Scores jobs against one profile with one reusable Gemini client.
+
+    The profile is loaded and fingerprinted once, and the instructions +
+    profile are rendered once into the model's system instruction, so each
+    request carries only the job text. Models are created on first use
+    (importing the SDK lazily) and shared by all threads.
+    
+    Responses are requested as schema-constrained JSON and validated
+    against analysis_schema; malformed JSON is repaired locally, and only
+    a response that cannot be repaired is asked for again.
+    """
+    
+    def __init__(
+        self,
+        profile=None,
+        cv_file=None,
+        model_name=MODEL_NAME,
+        temperature=TEMPERATURE,
+        json_mode=True,
+        timeout=REQUEST_TIMEOUT,
+        parse_retries=1
+    ):
+        """
+        Args:
+            profile (str): Candidate profile text (default: MY_PROFILE)
+            cv_file (str): Load the profile from this file instead
+            model_name (str): Gemini model name
+            temperature (float): Sampling temperature (low = consistent scores)
+            json_mode (bool): Ask the API for JSON matching the response schema
+            timeout (float): Per-request timeout in seconds
+            parse_retries (int): New requests allowed when a response cannot be parsed or repaired
+        """
+        self.profile = load_cv_from_file(cv_file) if cv_file else (profile or MY_PROFILE)
+        self.profile_hash = fingerprint(self.profile)
+        self.model_name = model_name
+        self.temperature = temperature
+        self.json_mode = json_mode
+        self.timeout = timeout
+        self.parse_retries = parse_retries
         
-        # Clean up response - remove markdown code blocks if present
-        clean_json = response.text.strip()
-        log(f"  Raw response preview: {clean_json[:150]}...")
-        clean_json = clean_json.replace('```json', '').replace('```', '').strip()
+        self.system_instruction = SYSTEM_PROMPT_TEMPLATE.format(profile=self.profile)
+        self.batch_system_instruction = BATCH_SYSTEM_PROMPT_TEMPLATE.format(profile=self.profile)
+        self.system_tokens = _estimate_tokens(self.system_instruction)
+        self.batch_system_tokens = _estimate_tokens(self.batch_system_instruction)
         
-        # Parse JSON
-        log("Parsing AI response as JSON...")
-        result = json.loads(clean_json)
+        self._models = {}
+        self._lock = threading.Lock()
+        self.counters = {'responses': 0, 'clean': 0, 'repaired': 0, 'invalid': 0, 'parse_retries': 0}
+    
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+    
+    def _model(self, system_instruction, schema):
+        with self._lock:
+            model = self._models.get(system_instruction)
+            if model is None:
+                genai = get_genai()
+                generation_config = {'temperature': self.temperature}
+                if self.json_mode:
+                    generation_config['response_mime_type'] = 'application/json'
+                    generation_config['response_schema'] = api_schema(schema)
+                model = genai.GenerativeModel(
+                    self.model_name,
+                    system_instruction=system_instruction,
+                    generation_config=generation_config
+                )
+                self._models[system_instruction] = model
+            return model
+    
+    def _generate(self, system_instruction, schema, prompt):
+        """Send one request and return the raw response text."""
+        response = self._model(system_instruction, schema).generate_content(
+            prompt, request_options={'timeout': self.timeout}
+        )
+        self._count('responses')
+        return response.text
+    
+    def _parsed(self, parse, text):
+        """Run a parse_* function from analysis_schema and record how it went."""
+        value, status = parse(text)
+        self._count(status)
+        return value
+    
+    def cache_key(self, job_text):
+        # Keyed on text that does not change as the condenser learns a site's boilerplate
+        return analysis_cache.make_key(
+            self.profile, text_condenser.stable_text(job_text), self.model_name, PROMPT_VERSION, PROMPT_TEMPLATE,
+            profile_hash=self.profile_hash
+        )
+    
+    def cached(self, job_text):
+        """
+        Return the cached analysis for this job text, or None.
+        Lets callers skip rate limiting for results that need no API call.
+        """
+        return analysis_cache.get(self.cache_key(job_text))
+    
+    def estimate_tokens(self, job_text):
+        """Approximate prompt + response tokens for one analyze() call."""
+        prompt_tokens = self.system_tokens + _estimate_tokens(JOB_PROMPT_TEMPLATE.format(job_text=condense_job_text(job_text)))
+        return prompt_tokens + 200  # room for the JSON answer
+    
+    def analyze(self, job_text, logger=None, use_cache=True, raise_errors=False):
+        """
+        Analyzes a job description using AI to determine match quality with logging.
         
-        # Validate structure
-        if not all(key in result for key in ['match_score', 'reason']):
-            raise ValueError("Invalid JSON structure")
+        Args:
+            job_text (str): The full text content of the job posting
+            logger: Logger function for detailed logging
+            use_cache (bool): Reuse/persist results in the analysis cache
+            raise_errors (bool): Re-raise API errors (quota, network) instead of
+                returning a zero score, so the caller can retry
             
-        # Ensure apply_link exists (even if null)
-        if 'apply_link' not in result:
-            result['apply_link'] = None
+        Returns:
+            dict: Contains match_score (0-100), reason, and apply_link
+        """
+        def log(msg, level="INFO"):
+            if logger:
+                logger(msg, level)
+            else:
+                print(f"[{level}] {msg}")
         
-        log(f"✅ AI analysis successful", "SUCCESS")
-        log(f"  Match score: {result['match_score']}/100")
-        log(f"  Reason: {result['reason'][:100]}...")
+        # Strip boilerplate and keep requirements/responsibilities within the token budget
+        condensed_job_text = condense_job_text(job_text)
+        
+        log(f"Preparing AI analysis...")
+        log(f"  Job text length: {len(job_text)} chars (condensed to {len(condensed_job_text)})")
+        log(f"  Using model: {self.model_name}")
+        
+        # Same profile + job + model + prompt as a previous run: reuse its result
+        cache_key = None
+        if use_cache:
+            cache_key = self.cache_key(job_text)
+            cached = analysis_cache.get(cache_key)
+            if cached:
+                log(f"📦 Analysis cache hit - skipping Gemini call", "SUCCESS")
+                log(f"  Match score: {cached['match_score']}/100")
+                return cached
+        
+        prompt = JOB_PROMPT_TEMPLATE.format(job_text=condensed_job_text)
+        try:
+            for attempt in range(self.parse_retries + 1):
+                log("Sending request to Gemini AI...")
+                raw = self._generate(self.system_instruction, ANALYSIS_SCHEMA, prompt)
+                log("Received AI response")
+                log(f"  Raw response preview: {raw[:150]}...")
+                
+                # Parse, validate against the schema, repair locally if needed
+                result = self._parsed(parse_analysis, raw)
+                if result:
+                    break
+                log(f"AI response could not be parsed or repaired: {raw[:200]}", "ERROR")
+                if attempt < self.parse_retries:
+                    self._count('parse_retries')
+                    log("🔁 Asking the model again...", "WARN")
+            else:
+                return {
+                    "match_score": 0,
+                    "reason": "AI response format error - could not parse analysis",
+                    "apply_link": None,
+                    "error": True
+                }
+            
+            log(f"✅ AI analysis successful", "SUCCESS")
+            log(f"  Match score: {result['match_score']}/100")
+            log(f"  Reason: {result['reason'][:100]}...")
+            
+            # Only successful analyses are cached; errors should be retried next run
+            if cache_key:
+                analysis_cache.set(cache_key, result)
+                
+            return result
             
-        return result
+        except Exception as e:
+            if raise_errors:
+                raise
+            log(f"AI Analysis failed: {str(e)}", "ERROR")
+            return {
+                "match_score": 0,
+                "reason": f"Error during analysis: {str(e)}",
+                "apply_link": None,
+                "error": True
+            }
+    
+    def analyze_batch(self, batch, log):
+        """
+        Score several jobs with a single model request.
+        
+        Returns:
+            dict: job_id -> validated analysis, for every entry that came back valid
+        """
+        jobs_block = "\n\n".join(
+            f"=== JOB {job_id} ===\n{text}" for job_id, text in batch
+        )
+        prompt = BATCH_JOBS_TEMPLATE.format(jobs=jobs_block)
         
-    except json.JSONDecodeError as e:
-        log(f"JSON parsing failed: {e}", "ERROR")
-        log(f"Raw AI response: {response.text[:200]}", "ERROR")
-        return {
-            "match_score": 0,
-            "reason": "AI response format error - could not parse analysis",
-            "apply_link": None
-        }
+        log(f"Sending batch of {len(batch)} jobs to Gemini AI (~{self.batch_system_tokens + _estimate_tokens(prompt)} tokens)...")
+        entries = self._parsed(parse_batch, self._generate(self.batch_system_instruction, BATCH_ANALYSIS_SCHEMA, prompt))
+        if entries is None:
+            raise ValueError("Batch response is not a JSON array")
+        
+        expected_ids = {job_id for job_id, _ in batch}
+        results = {}
+        for entry in entries:
+            try:
+                analysis = validate_batch_entry(entry)
+            except SchemaError:
+                continue
+            job_id = analysis.pop('job_id')
+            if job_id in expected_ids:
+                results[job_id] = analysis
+        return results
+    
+    def parse_stats(self):
+        """Response parsing metrics: how often JSON was clean, repaired, or unusable."""
+        with self._lock:
+            stats = dict(self.counters)
+        responses = stats['responses']
+        stats['repair_rate'] = round(100 * stats['repaired'] / responses, 1) if responses else 0.0
+        stats['failure_rate'] = round(100 * stats['invalid'] / responses, 1) if responses else 0.0
+        return stats
+
+
+_analyzers = {}
+_analyzers_lock = threading.Lock()
+
+
+def get_analyzer(use_cv_file=False):
+    """Shared Analyzer for MY_PROFILE, or for 'my_cv.txt' when use_cv_file is True."""
+    with _analyzers_lock:
+        if use_cv_file not in _analyzers:
+            _analyzers[use_cv_file] = Analyzer(cv_file="my_cv.txt" if use_cv_file else None)
+        return _analyzers[use_cv_file]
+
+
+def get_cached_analysis(job_text, use_cv_file=False):
+    """
+    Return the cached analysis for this job text, or None.
+    Lets callers skip rate limiting for results that need no API call.
+    """
+    return get_analyzer(use_cv_file).cached(job_text)
+
+
+def estimate_request_tokens(job_text, use_cv_file=False):
+    """Approximate prompt + response tokens for one analyze_job call."""
+    return get_analyzer(use_cv_file).estimate_tokens(job_text)
+
+
+def analyze_job(job_text, use_cv_file=False, logger=None, use_cache=True, raise_errors=False):
+    """
+    Analyzes a job description using AI to determine match quality with logging.
+    
+    Args:
+        job_text (str): The full text content of the job posting
+        use_cv_file (bool): If True, loads profile from 'my_cv.txt'
+        logger: Logger function for detailed logging
+        use_cache (bool): Reuse/persist results in the analysis cache
+        raise_errors (bool): Re-raise API errors (quota, network) instead of
+            returning a zero score, so the caller can retry
         
-    except Exception as e:
-        log(f"AI Analysis failed: {str(e)}", "ERROR")
-        return {
-            "match_score": 0,
-            "reason": f"Error during analysis: {str(e)}",
-            "apply_link": None
-        }
+    Returns:
+        dict: Contains match_score (0-100), reason, and apply_link
+    """
+    return get_analyzer(use_cv_file).analyze(job_text, logger=logger, use_cache=use_cache, raise_errors=raise_errors)
+
+
+def _pack_batches(items, fixed_tokens, token_budget, max_jobs_per_batch):
+    """
+    Greedily group (job_id, job_text) items so each batch prompt stays
+    within `token_budget` tokens, `fixed_tokens` (profile and instructions)
+    included.
+    """
+    batches, current, current_tokens = [], [], fixed_tokens
+    
+    for job_id, text in items:
+        job_tokens = _estimate_tokens(text) + 10  # per-job header overhead
+        if current and (current_tokens + job_tokens > token_budget or len(current) >= max_jobs_per_batch):
+            batches.append(current)
+            current, current_tokens = [], fixed_tokens
+        current.append((job_id, text))
+        current_tokens += job_tokens
+    
+    if current:
+        batches.append(current)
+    return batches
 
 
-def batch_analyze_jobs(job_list):
+def batch_analyze_jobs(
+    job_list,
+    batch_size=5,
+    token_budget=20000,
+    use_cv_file=False,
+    logger=None,
+    use_cache=True
+):
     """
-    Analyze multiple jobs in sequence.
+    Analyze multiple jobs, packing several jobs into each AI request.
+    
+    Jobs are grouped into batches of up to `batch_size` jobs that fit in
+    `token_budget` tokens. The model returns a JSON array keyed by job id;
+    every entry is validated and only jobs missing from (or invalid in) the
+    batch response are retried one by one with analyze_job.
     
     Args:
         job_list (list): List of dicts with 'title', 'company', and 'text' keys
+        batch_size (int): Maximum jobs per request (1 disables batching)
+        token_budget (int): Approximate prompt token budget per request
+        use_cv_file (bool): If True, loads profile from 'my_cv.txt'
+        logger: Logger function for detailed logging
+        use_cache (bool): Reuse/persist results in the analysis cache
         
     Returns:
         list: List of results with original job data plus analysis
     """
-    results = []
+    def log(msg, level="INFO"):
+        if logger:
+            logger(msg, level)
+        else:
+            print(f"[{level}] {msg}")
     
-    for idx, job in enumerate(job_list, 1):
-        print(f"\n📊 Analyzing job {idx}/{len(job_list)}: {job.get('title', 'Unknown')}")
-        
-        analysis = analyze_job(job.get('text', ''))
+    analyzer = get_analyzer(use_cv_file)
+    analyses = {}
+    pending = []
+    cache_keys = {}
+    raw_texts = {}
+    
+    # Cached jobs never reach the model; keys come from the raw text, as in analyze()
+    for idx, job in enumerate(job_list):
+        job_id = f"J{idx + 1}"
+        raw_texts[job_id] = job.get('text', '')
+        text = condense_job_text(raw_texts[job_id])
+        if use_cache:
+            cache_keys[job_id] = analyzer.cache_key(raw_texts[job_id])
+            cached = analysis_cache.get(cache_keys[job_id])
+            if cached:
+                analyses[job_id] = cached
+                continue
+        pending.append((job_id, text))
+    
+    if analyses:
+        log(f"📦 {len(analyses)}/{len(job_list)} jobs served from the analysis cache")
+    
+    batches = _pack_batches(pending, analyzer.batch_system_tokens, token_budget, max(1, batch_size)) if batch_size > 1 else []
+    if batches:
+        log(f"📊 Analyzing {len(pending)} jobs in {len(batches)} batched requests")
+    
+    retry_ids = [job_id for job_id, _ in pending] if not batches else []
+    for batch in batches:
+        try:
+            batch_results = analyzer.analyze_batch(batch, log)
+        except Exception as e:
+            log(f"Batch request failed: {e}", "ERROR")
+            batch_results = {}
         
+        for job_id, _ in batch:
+            if job_id in batch_results:
+                analyses[job_id] = batch_results[job_id]
+                if use_cache:
+                    analysis_cache.set(cache_keys[job_id], batch_results[job_id])
+            else:
+                retry_ids.append(job_id)
+    
+    # Anything the batch could not answer is analyzed individually
+    if retry_ids and batches:
+        log(f"🔁 Retrying {len(retry_ids)} jobs individually", "WARN")
+    for job_id in retry_ids:
+        analyses[job_id] = analyzer.analyze(raw_texts[job_id], logger=logger, use_cache=use_cache)
+    
+    results = []
+    for idx, job in enumerate(job_list):
+        analysis = analyses[f"J{idx + 1}"]
         results.append({
             'title': job.get('title'),
             'company': job.get('company'),
             'url': job.get('url'),
             'match_score': analysis['match_score'],
             'reason': analysis['reason'],
-            'apply_link': analysis.get('apply_link')
+            'apply_link': analysis.get('apply_link'),
+            'error': bool(analysis.get('error'))
         })
         
     return results
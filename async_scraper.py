@@ -0,0 +1,240 @@
+"""
+Async Concurrent Scraping Engine
+Scrapes many job pages in parallel with playwright.async_api.
+Human-like waits are applied per page with asyncio.sleep, so one page
+"reading" never blocks the others. Per-host crawl-delays are enforced by
+the politeness scheduler rather than by global sleeps.
+"""
+
+import asyncio
+import random
+import itertools
+from typing import AsyncIterator, Iterable, Optional
+
+from browser_pool import LAUNCH_ARGS, CONTEXT_OPTIONS, EXTRA_HTTP_HEADERS
+from robots_checker import robots_checker
+from politeness import PolitenessScheduler
+from resource_blocker import resource_blocker
+from http_fetcher import http_fetcher, MIN_CONTENT_LENGTH
+from page_cache import page_cache
+
+
+async def _simulate_reading(page):
+    """Async twin of the human behaviour in scraper.get_page_content."""
+    # Human-like behavior: Random sleep (2-5 seconds)
+    await asyncio.sleep(random.uniform(2, 5))
+
+    # Simulate reading behavior - scroll slowly
+    await page.mouse.wheel(0, random.randint(300, 700))
+    await asyncio.sleep(random.uniform(1, 2))
+
+    # Optionally scroll down further (mimics reading)
+    if random.random() > 0.5:
+        await page.mouse.wheel(0, random.randint(400, 800))
+        await asyncio.sleep(random.uniform(0.5, 1.5))
+
+
+async def _check_robots(url: str) -> bool:
+    """Run the (blocking) robots.txt check off the event loop."""
+    allowed, reason = await robots_checker.can_fetch_async(url)
+    print(f"   {reason}")
+
+    if not allowed:
+        print(f"⛔ Skipping {url} - Blocked by robots.txt")
+        return False
+
+    return True
+
+
+async def _scrape_one(
+    context,
+    url: str,
+    fast_mode: bool = False,
+    http_first: bool = False,
+    use_cache: bool = True
+) -> Optional[str]:
+    # A stale cached page may only need a conditional GET (robots.txt already allowed it)
+    if use_cache:
+        revalidated = await asyncio.to_thread(page_cache.revalidate, url)
+        if revalidated:
+            return revalidated
+
+    # Tier 1: plain HTTP for server-rendered pages
+    if http_first:
+        result = await asyncio.to_thread(http_fetcher.fetch_page, url)
+        if result:
+            content = result['text']
+            http_fetcher.record_tier('http')
+            print(f"✅ Fetched {len(content)} characters over HTTP from {url}")
+            if use_cache:
+                page_cache.store(url, content, 'http', result['etag'], result['last_modified'])
+            return content
+
+    # Tier 2: full stealth browser tab
+    from playwright_stealth import stealth_async
+
+    http_fetcher.record_tier('browser')
+    print(f"🕵️  Stealth visiting (async): {url}")
+    page = await context.new_page()
+    await stealth_async(page)
+    if fast_mode:
+        await resource_blocker.install_async(page)
+
+    try:
+        await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+        await _simulate_reading(page)
+
+        content = await page.evaluate("document.body.innerText")
+        print(f"✅ Successfully scraped {len(content)} characters from {url}")
+        if use_cache and len(content) >= MIN_CONTENT_LENGTH:
+            page_cache.store(url, content, 'browser')
+        return content
+
+    except Exception as e:
+        print(f"❌ Error scraping {url}: {e}")
+        return None
+
+    finally:
+        await page.close()
+
+
+async def scrape_many(
+    urls: Iterable[str],
+    concurrency: int = 4,
+    contexts: int = 2,
+    respect_robots: bool = True,
+    per_host_concurrency: int = 1,
+    fast_mode: bool = False,
+    http_first: bool = False,
+    use_cache: bool = True
+) -> AsyncIterator[tuple]:
+    """
+    Scrape many URLs concurrently, yielding results as they finish.
+
+    One browser is launched for the whole batch. Pages are spread as tabs
+    across `contexts` stealth contexts. A PolitenessScheduler decides which
+    URL starts next: at most `concurrency` pages overall, at most
+    `per_host_concurrency` per host, and each host's robots.txt
+    crawl-delay only holds back that host's URLs.
+
+    Args:
+        urls (iterable): URLs to scrape (duplicates are scraped once)
+        concurrency (int): Maximum number of pages loading at the same time
+        contexts (int): Number of browser contexts to spread tabs across
+        respect_robots (bool): Whether to check robots.txt compliance
+        per_host_concurrency (int): Maximum pages open on the same host
+        fast_mode (bool): Abort images/media/fonts/trackers (see resource_blocker.py)
+        http_first (bool): Try the pooled HTTP tier before opening a tab
+        use_cache (bool): Serve and fill the persistent page cache
+
+    Yields:
+        tuple: (url, content) in completion order; content is None on failure
+    """
+    unique_urls = list(dict.fromkeys(u for u in urls if u))
+    if not unique_urls:
+        return
+
+    # Fresh cached pages are served before anything touches the network;
+    # stale ones are revalidated in _scrape_one, after the robots.txt check
+    if use_cache:
+        cached_pages = await asyncio.gather(
+            *(asyncio.to_thread(page_cache.lookup_text, url) for url in unique_urls)
+        )
+        for url, cached in zip(unique_urls, cached_pages):
+            if cached:
+                print(f"📦 Page cache hit: {url} ({len(cached)} characters)")
+                yield url, cached
+        unique_urls = [url for url, cached in zip(unique_urls, cached_pages) if not cached]
+        if not unique_urls:
+            return
+
+    # robots.txt first: blocked URLs are reported immediately and the
+    # crawl-delays of allowed hosts are cached for the scheduler
+    allowed_urls = unique_urls
+    if respect_robots:
+        # Download each domain's robots.txt once, all domains in parallel
+        await robots_checker.prefetch_async(unique_urls)
+        verdicts = await asyncio.gather(*(_check_robots(url) for url in unique_urls))
+        allowed_urls = [url for url, ok in zip(unique_urls, verdicts) if ok]
+        for url, ok in zip(unique_urls, verdicts):
+            if not ok:
+                yield url, None
+        if not allowed_urls:
+            return
+
+    scheduler = PolitenessScheduler(
+        global_concurrency=concurrency,
+        per_host_concurrency=per_host_concurrency
+    )
+
+    # Imported here so importing this module does not load Playwright
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        try:
+            browser_contexts = []
+            for _ in range(max(1, min(contexts, len(allowed_urls)))):
+                context = await browser.new_context(**CONTEXT_OPTIONS)
+                await context.set_extra_http_headers(EXTRA_HTTP_HEADERS)
+                browser_contexts.append(context)
+            context_cycle = itertools.cycle(browser_contexts)
+
+            async def fetch(url):
+                return await _scrape_one(next(context_cycle), url, fast_mode, http_first, use_cache)
+
+            async for url, content in scheduler.dispatch(allowed_urls, fetch):
+                yield url, content
+
+        finally:
+            await browser.close()
+
+
+def scrape_all(
+    urls: Iterable[str],
+    concurrency: int = 4,
+    respect_robots: bool = True,
+    fast_mode: bool = False,
+    http_first: bool = False
+) -> dict:
+    """
+    Blocking convenience wrapper around `scrape_many`.
+
+    Must not be called from inside a running event loop.
+
+    Args:
+        urls (iterable): URLs to scrape
+        concurrency (int): Maximum number of pages loading at the same time
+        respect_robots (bool): Whether to check robots.txt compliance
+        fast_mode (bool): Abort images/media/fonts/trackers
+        http_first (bool): Try the pooled HTTP tier before opening a tab
+
+    Returns:
+        dict: url -> scraped text (or None if scraping failed / was blocked)
+    """
+    async def collect():
+        results = {}
+        async for url, content in scrape_many(
+            urls, concurrency=concurrency, respect_robots=respect_robots,
+            fast_mode=fast_mode, http_first=http_first
+        ):
+            results[url] = content
+        return results
+
+    return asyncio.run(collect())
+
+
+if __name__ == "__main__":
+    # Test the async scraper
+    test_urls = [
+        "https://www.python.org",
+        "https://docs.python.org/3/",
+        "https://pypi.org",
+    ]
+
+    async def demo():
+        async for url, content in scrape_many(test_urls, concurrency=3):
+            size = len(content) if content else 0
+            print(f"\n📄 {url}: {size} characters")
+
+    asyncio.run(demo())
@@ -0,0 +1,211 @@
+"""
+Persistent Browser Pool
+Keeps a few warm, stealth-configured Chromium instances alive so scraping
+many job pages pays for browser startup only a handful of times.
+"""
+
+import atexit
+import itertools
+import threading
+from contextlib import contextmanager
+
+
+# Realistic Chrome fingerprint shared by every scraping path
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process'
+]
+
+CONTEXT_OPTIONS = {
+    'user_agent': USER_AGENT,
+    'viewport': {'width': 1920, 'height': 1080},
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+    'permissions': ['geolocation'],
+    'geolocation': {'latitude': 28.6139, 'longitude': 77.2090},  # Delhi coordinates
+    'color_scheme': 'light'
+}
+
+EXTRA_HTTP_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+
+class _BrowserSlot:
+    """One warm browser plus its reusable stealth context."""
+
+    def __init__(self, playwright, headless: bool):
+        self.browser = playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+        self.context = self.browser.new_context(**CONTEXT_OPTIONS)
+        self.context.set_extra_http_headers(EXTRA_HTTP_HEADERS)
+        self.pages_served = 0
+
+    def is_healthy(self) -> bool:
+        """A slot is usable while its browser process is still connected."""
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            self.browser.close()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """
+    A small pool of long-lived Chromium browsers.
+
+    Each browser keeps one stealth-configured context that is reused for
+    every page. Browsers are recycled after `max_pages_per_browser` pages
+    (to cap memory growth and fingerprint reuse) or as soon as a health
+    check fails.
+
+    Sync Playwright objects are bound to the thread that created them, so
+    a pool must only be used from one thread. Use `get_browser_pool()` to
+    get the pool belonging to the current thread.
+    """
+
+    def __init__(self, size: int = 2, max_pages_per_browser: int = 25, headless: bool = True):
+        self.size = max(1, size)
+        self.max_pages_per_browser = max_pages_per_browser
+        self.headless = headless  # Set to False to watch the browser in action
+        self._playwright = None
+        self._slots = []
+        self._round_robin = itertools.cycle(range(self.size))
+        self.launches = 0
+        self.pages_served = 0
+
+    def _ensure_started(self):
+        if self._playwright is None:
+            # Imported on first use so modules that only need the constants stay light
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+            self._slots = [None] * self.size
+
+    def _launch_slot(self, index: int) -> _BrowserSlot:
+        slot = _BrowserSlot(self._playwright, self.headless)
+        self._slots[index] = slot
+        self.launches += 1
+        print(f"🚀 Browser pool: launched browser {index + 1}/{self.size} (total launches: {self.launches})")
+        return slot
+
+    def _get_slot(self) -> _BrowserSlot:
+        self._ensure_started()
+        index = next(self._round_robin)
+        slot = self._slots[index]
+
+        if slot is not None and not slot.is_healthy():
+            print(f"   ⚠️  Browser {index + 1} failed health check, relaunching")
+            slot.close()
+            slot = None
+        elif slot is not None and slot.pages_served >= self.max_pages_per_browser:
+            print(f"   ♻️  Recycling browser {index + 1} after {slot.pages_served} pages")
+            slot.close()
+            slot = None
+
+        if slot is None:
+            slot = self._launch_slot(index)
+        return slot
+
+    @contextmanager
+    def page(self):
+        """
+        Borrow a fresh stealth page from a warm browser.
+
+        The page is always closed on exit; the browser and context stay
+        alive for the next caller.
+
+        Yields:
+            Page: A Playwright page with stealth applied
+        """
+        from playwright_stealth import stealth_sync
+        
+        slot = self._get_slot()
+        page = slot.context.new_page()
+        stealth_sync(page)
+        slot.pages_served += 1
+        self.pages_served += 1
+        try:
+            yield page
+        finally:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def close(self):
+        """Close every browser and stop Playwright."""
+        for slot in self._slots:
+            if slot is not None:
+                slot.close()
+        self._slots = []
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def stats(self) -> dict:
+        """Return launch/page counters for logging."""
+        return {
+            'launches': self.launches,
+            'pages_served': self.pages_served,
+            'pages_per_launch': round(self.pages_served / self.launches, 1) if self.launches else 0.0
+        }
+
+
+# One pool per thread (sync Playwright is not thread-safe)
+_thread_local = threading.local()
+_all_pools = []
+_all_pools_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the browser pool owned by the calling thread, creating it on first use."""
+    pool = getattr(_thread_local, 'pool', None)
+    if pool is None:
+        pool = BrowserPool()
+        _thread_local.pool = pool
+        with _all_pools_lock:
+            _all_pools.append(pool)
+    return pool
+
+
+def close_thread_browser_pool():
+    """Close the calling thread's pool, if it has one. Call before a worker thread exits."""
+    pool = getattr(_thread_local, 'pool', None)
+    if pool is None:
+        return
+    pool.close()
+    _thread_local.pool = None
+    with _all_pools_lock:
+        if pool in _all_pools:
+            _all_pools.remove(pool)
+
+
+def shutdown_browser_pools():
+    """Close all pools created in this process. Registered with atexit."""
+    with _all_pools_lock:
+        pools = list(_all_pools)
+        _all_pools.clear()
+    for pool in pools:
+        pool.close()
+    _thread_local.__dict__.pop('pool', None)
+
+
+atexit.register(shutdown_browser_pools)
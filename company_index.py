@@ -0,0 +1,110 @@
+"""
+Company Index
+Maps the free-text `company_name` of a SerpApi job back to a company from
+companies.py, so one batched search can serve several companies.
+"""
+
+import re
+from typing import Iterable, Optional
+
+
+# Legal suffixes that never distinguish one employer from another
+LEGAL_SUFFIXES = {
+    'ltd', 'limited', 'inc', 'incorporated', 'llc', 'llp', 'plc', 'pvt',
+    'private', 'corp', 'corporation', 'co', 'company', 'gmbh', 'ag', 'sa'
+}
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Lowercase, '&' -> 'and', punctuation stripped and trailing legal
+    suffixes removed: "Goldman Sachs & Co. LLC" -> "goldman sachs and".
+    """
+    name = name.lower().replace('&', ' and ')
+    tokens = re.sub(r'[^a-z0-9]+', ' ', name).split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def company_aliases(name: str) -> list:
+    """
+    Names a company may appear under. "Meta (Facebook)" -> ["meta", "facebook"];
+    "McKinsey & Company" -> ["mckinsey and", "mckinsey"].
+    """
+    aliases = []
+    outside = re.sub(r'\(.*?\)', ' ', name)
+    inside = re.findall(r'\((.*?)\)', name)
+    for candidate in [outside] + inside:
+        alias = normalize_company_name(candidate)
+        # Single letters ("Twitter (X)") would match far too much
+        if len(alias) > 1 and alias not in aliases:
+            aliases.append(alias)
+        # "X and Company" style names are often listed as plain "X"
+        if alias.endswith(' and'):
+            aliases.append(alias[:-4])
+    return aliases
+
+
+def search_term(name: str) -> str:
+    """The company name as it should appear in a search query (no parenthetical)."""
+    return re.sub(r'\s*\(.*?\)', '', name).strip()
+
+
+class CompanyIndex:
+    """
+    Whole-word alias matcher over a set of company names.
+
+    All aliases are compiled into one regex (longest first), so routing a
+    job is a single scan of its company_name regardless of how many
+    companies are indexed.
+    """
+
+    def __init__(self, companies: Iterable[str]):
+        self._by_alias = {}
+        for company in companies:
+            for alias in company_aliases(company):
+                self._by_alias.setdefault(alias, company)
+
+        aliases = sorted(self._by_alias, key=len, reverse=True)
+        self._pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(alias) for alias in aliases) + r')\b'
+        ) if aliases else None
+
+    def match(self, job_company_name: str) -> Optional[str]:
+        """
+        Return the indexed company a job belongs to, or None.
+
+        Args:
+            job_company_name (str): `company_name` field from SerpApi
+
+        Returns:
+            str: Company name as it appears in companies.py
+        """
+        if not self._pattern or not job_company_name:
+            return None
+        found = self._pattern.search(normalize_company_name(job_company_name))
+        return self._by_alias[found.group(1)] if found else None
+
+    def route(self, jobs: Iterable[dict]) -> dict:
+        """
+        Group jobs by the company they match; unmatched jobs are dropped.
+
+        Returns:
+            dict: Company name -> list of jobs (in result order)
+        """
+        routed = {}
+        for job in jobs:
+            company = self.match(job.get('company_name', ''))
+            if company:
+                routed.setdefault(company, []).append(job)
+        return routed
+
+
+if __name__ == "__main__":
+    from companies import get_all_companies
+
+    index = CompanyIndex(get_all_companies())
+    for raw in ["Google LLC", "Meta", "Facebook India", "Goldman Sachs & Co. LLC",
+                "McKinsey & Company", "Tata Consultancy Services Limited", "Some Staffing Agency"]:
+        print(f"  {raw!r:40} -> {index.match(raw)}")
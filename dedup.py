@@ -0,0 +1,185 @@
+"""
+Job Deduplication
+Drops repeat postings between search and scraping, so the same job found
+through two queries, two apply links or two utm_* variants is only
+scraped and analyzed once.
+"""
+
+import hashlib
+import re
+import threading
+from typing import Optional
+
+from url_utils import normalize_url
+
+
+SIMHASH_BITS = 64
+# Same title/company/location and descriptions within this many bits -> duplicate
+SIMHASH_MAX_DISTANCE = 6
+
+
+def _tokens(text: str) -> list:
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash over word shingles. Near-identical texts (re-posted
+    descriptions, different whitespace or boilerplate) end up a few bits
+    apart; unrelated texts differ in about half the bits.
+    """
+    words = _tokens(text)
+    if len(words) < shingle_size:
+        shingles = [' '.join(words)] if words else []
+    else:
+        shingles = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def job_identity(job: dict) -> str:
+    """Normalized title + company + location: what a posting claims to be."""
+    return ' | '.join(
+        ' '.join(_tokens(job.get(field, '')))
+        for field in ('title', 'company_name', 'location')
+    )
+
+
+class JobDeduplicator:
+    """
+    Remembers every job it has accepted and rejects later repeats by, in
+    order: SerpApi job_id, normalized posting URL, then same title +
+    company + location with a near-identical description (SimHash).
+
+    Only URLs that point at a specific posting are used as keys (route
+    fragments such as #/job/1 are part of the key, see normalize_url); a job
+    that fell back to its company's generic career page (url_source
+    'none') is judged on job_id and SimHash alone. Thread-safe, so
+    pipeline search workers can share one instance.
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._job_ids = set()
+        self._urls = set()
+        self._fingerprints = {}  # identity -> description SimHashes
+        self.seen = 0
+        self.duplicates = {'job_id': 0, 'url': 0, 'simhash': 0}
+
+    @staticmethod
+    def _posting_url(job: dict) -> Optional[str]:
+        url = job.get('career_page_url')
+        if not url or job.get('url_source') == 'none':
+            return None
+        return normalize_url(url)
+
+    def _near_duplicate(self, identity: str, fingerprint: int) -> bool:
+        return any(
+            hamming_distance(fingerprint, candidate) <= self.max_distance
+            for candidate in self._fingerprints.get(identity, ())
+        )
+
+    def check(self, job: dict) -> Optional[str]:
+        """
+        Record a job and say whether it repeats an earlier one.
+
+        Args:
+            job (dict): Job from SerpApi (ideally with career_page_url set)
+
+        Returns:
+            str: Why it is a duplicate ('job_id', 'url', 'simhash'), or None if new
+        """
+        job_id = job.get('job_id')
+        url = self._posting_url(job)
+        identity = job_identity(job)
+        fingerprint = simhash(job.get('description', '') or identity)
+
+        with self._lock:
+            self.seen += 1
+            if job_id and job_id in self._job_ids:
+                reason = 'job_id'
+            elif url and url in self._urls:
+                reason = 'url'
+            elif self._near_duplicate(identity, fingerprint):
+                reason = 'simhash'
+            else:
+                reason = None
+
+            if reason:
+                self.duplicates[reason] += 1
+                return reason
+
+            if job_id:
+                self._job_ids.add(job_id)
+            if url:
+                self._urls.add(url)
+            self._fingerprints.setdefault(identity, []).append(fingerprint)
+            return None
+
+    def filter(self, jobs: list) -> list:
+        """Return the jobs that are not duplicates, keeping their order."""
+        return [job for job in jobs if self.check(job) is None]
+
+    def stats(self) -> dict:
+        """Jobs seen, duplicates by reason, and the scrape/AI calls avoided."""
+        with self._lock:
+            removed = sum(self.duplicates.values())
+            return {
+                'seen': self.seen,
+                'unique': self.seen - removed,
+                'duplicates': removed,
+                'by_reason': dict(self.duplicates),
+                # Each duplicate would have cost one page fetch and one Gemini call
+                'scrapes_saved': removed,
+                'ai_calls_saved': removed
+            }
+
+
+if __name__ == "__main__":
+    dedup = JobDeduplicator()
+    jobs = [
+        {'job_id': 'a1', 'title': 'Backend Engineer', 'company_name': 'Acme', 'location': 'Bengaluru',
+         'career_page_url': 'https://acme.com/careers/42?utm_source=google', 'url_source': 'apply_link',
+         'description': 'Build APIs in Python and Go. Own services end to end. 3+ years experience.'},
+        {'job_id': 'a1', 'title': 'Backend Engineer', 'company_name': 'Acme', 'location': 'Bengaluru'},
+        {'job_id': 'b2', 'title': 'Backend Engineer (Python)', 'company_name': 'Acme', 'location': 'Pune',
+         'career_page_url': 'https://acme.com/careers/42', 'url_source': 'apply_options'},
+        {'job_id': 'c3', 'title': 'Backend Engineer', 'company_name': 'Acme', 'location': 'Bengaluru',
+         'career_page_url': 'https://acme.com/careers/', 'url_source': 'none',
+         'description': 'Build APIs in Python and Go. Own services end to end. 3+ years experience.'},
+        {'job_id': 'd4', 'title': 'Data Analyst', 'company_name': 'Acme', 'location': 'Bengaluru',
+         'career_page_url': 'https://acme.com/careers/', 'url_source': 'none',
+         'description': 'SQL dashboards and experimentation for the growth team.'},
+    ]
+    expected = ['new', 'job_id', 'url', 'simhash', 'new']
+    for job, want in zip(jobs, expected):
+        verdict = dedup.check(job) or 'new'
+        print(f"  {job['job_id']}: {verdict}")
+        assert verdict == want, f"{job['job_id']}: expected {want}, got {verdict}"
+
+    # Two postings of a hash-routed careers SPA differ only in the fragment
+    spa = [
+        {'job_id': 'e5', 'title': 'Platform Engineer', 'company_name': 'Globex', 'location': 'Remote',
+         'career_page_url': 'https://globex.com/careers/#/job/101', 'url_source': 'apply_link',
+         'description': 'Run Kubernetes clusters and build internal developer tooling.'},
+        {'job_id': 'f6', 'title': 'Product Designer', 'company_name': 'Globex', 'location': 'Remote',
+         'career_page_url': 'https://globex.com/careers/#/job/102', 'url_source': 'apply_link',
+         'description': 'Design onboarding flows and run usability studies.'},
+    ]
+    assert [dedup.check(job) for job in spa] == [None, None], "distinct SPA postings must both survive"
+    print(dedup.stats())
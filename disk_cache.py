@@ -0,0 +1,194 @@
+"""
+Disk Cache
+Small SQLite-backed key/value store with TTL and size-bounded LRU
+eviction. Shared by the page, analysis and search caches.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+# All caches live here unless a path is given explicitly
+CACHE_DIR = os.getenv("JOBBOT_CACHE_DIR", ".cache")
+
+
+class DiskCache:
+    """
+    Persistent JSON value cache.
+
+    Entries carry an expiry time; expired entries are kept (so callers can
+    revalidate or serve them stale) until evicted. When `max_entries` or
+    `max_bytes` is exceeded, the least recently used entries are dropped.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        default_ttl: float,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        path: Optional[str] = None
+    ):
+        self.name = name
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path or os.path.join(CACHE_DIR, f"{name}.sqlite3")
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get_entry(self, key: str, allow_stale: bool = False, count: bool = True) -> Optional[dict]:
+        """
+        Look up an entry.
+
+        Args:
+            key (str): Cache key
+            allow_stale (bool): Also return entries past their expiry
+            count (bool): Count the lookup in the hit/miss statistics
+
+        Returns:
+            dict: value, stored_at, expires_at, stale - or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += count
+                return None
+
+            stale = row[2] <= now
+            if stale and not allow_stale:
+                self.misses += count
+                return None
+
+            if stale:
+                self.stale_hits += count
+            else:
+                self.hits += count
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        return {
+            'value': json.loads(row[0]),
+            'stored_at': row[1],
+            'expires_at': row[2],
+            'stale': stale
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a fresh value, or `default`."""
+        entry = self.get_entry(key)
+        return entry['value'] if entry else default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serialisable value, then evict if over budget."""
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload.encode('utf-8')), now, expires_at, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str, ttl: Optional[float] = None) -> bool:
+        """Extend an entry's expiry without changing its value (e.g. after HTTP 304)."""
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE entries SET stored_at = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                (now, expires_at, now, key)
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry. Returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until within budget. Caller holds the lock."""
+        if self.max_entries is not None:
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+                doomed = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this session plus current size on disk."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_rate': round(100 * self.hits / lookups, 1) if lookups else 0.0,
+            'entries': entries,
+            'kb_on_disk': round(size / 1024)
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,198 @@
+"""
+HTTP-First Fetch Tier
+Many career pages are server-rendered, so a plain pooled HTTP request is
+enough to read them. Playwright is only needed when the HTML turns out to
+be a JavaScript shell or the extracted text is too short.
+"""
+
+import re
+import threading
+from html.parser import HTMLParser
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from browser_pool import USER_AGENT, EXTRA_HTTP_HEADERS
+
+
+# Same "too short to be a job posting" threshold the callers use
+MIN_CONTENT_LENGTH = 100
+
+# Tags whose text never shows up in innerText
+_SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'head', 'iframe'}
+
+# Tags that start a new line in rendered text
+_BLOCK_TAGS = {
+    'p', 'div', 'br', 'li', 'ul', 'ol', 'tr', 'table', 'section', 'article',
+    'header', 'footer', 'nav', 'main', 'aside', 'h1', 'h2', 'h3', 'h4', 'h5',
+    'h6', 'dt', 'dd', 'pre', 'blockquote', 'form', 'hr'
+}
+
+# Signs that the HTML is an SPA shell that only renders in a browser
+_JS_SHELL_PATTERNS = re.compile(
+    r'enable javascript|requires javascript|javascript is (?:disabled|required)'
+    r'|<div id="(?:root|app|__next)">\s*</div>|<noscript>[^<]*javascript',
+    re.IGNORECASE
+)
+
+
+class _TextExtractor(HTMLParser):
+    """Approximates document.body.innerText from raw HTML."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """
+    Extract readable text from HTML, dropping scripts, styles and markup.
+
+    Args:
+        html (str): Raw HTML
+
+    Returns:
+        str: Text with one line per block element
+    """
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+
+    lines = (re.sub(r'[ \t\r\f\v]+', ' ', line).strip() for line in ''.join(parser.parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def looks_js_rendered(html: str, text: str) -> bool:
+    """True if the page probably needs a real browser to show its content."""
+    if len(text) < MIN_CONTENT_LENGTH:
+        return True
+    # A JS warning on a page with little real text is an SPA shell
+    return bool(_JS_SHELL_PATTERNS.search(html)) and len(text) < 10 * MIN_CONTENT_LENGTH
+
+
+class HttpFetcher:
+    """
+    Pooled HTTP client sending the same browser-like headers as the
+    Playwright scraper, plus per-tier hit counters.
+    """
+
+    def __init__(self, timeout: float = 15, pool_size: int = 20):
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        headers = dict(EXTRA_HTTP_HEADERS)
+        # requests cannot decode brotli without an extra package
+        headers['Accept-Encoding'] = 'gzip, deflate'
+        headers['User-Agent'] = USER_AGENT
+        self.session.headers.update(headers)
+
+        self._lock = threading.Lock()
+        self.tier_counts = {'http': 0, 'browser': 0}
+
+    def fetch(self, url: str, extra_headers: Optional[dict] = None) -> Optional[dict]:
+        """
+        GET a page over plain HTTP.
+
+        Args:
+            url (str): The URL to fetch
+            extra_headers (dict): Optional per-request headers
+
+        Returns:
+            dict: status, url, html, text, etag, last_modified - or None on network error
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=extra_headers, allow_redirects=True)
+        except requests.RequestException as e:
+            print(f"   ⚠️  HTTP fetch failed for {url}: {e}")
+            return None
+
+        html = response.text if response.status_code == 200 else ''
+        return {
+            'status': response.status_code,
+            'url': response.url,
+            'html': html,
+            'text': html_to_text(html) if html else '',
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+    def fetch_page(self, url: str) -> Optional[dict]:
+        """
+        Try the HTTP tier for a page.
+
+        Returns:
+            dict: The `fetch` result, or None if the page needs the browser tier
+        """
+        result = self.fetch(url)
+        if not result or result['status'] != 200:
+            return None
+        if looks_js_rendered(result['html'], result['text']):
+            print(f"   ↪️  HTTP tier: page looks JS-rendered ({len(result['text'])} chars), escalating to browser")
+            return None
+        return result
+
+    def fetch_text(self, url: str) -> Optional[str]:
+        """
+        Try the HTTP tier for a page's text.
+
+        Returns:
+            str: Extracted text, or None if the page needs the browser tier
+        """
+        result = self.fetch_page(url)
+        return result['text'] if result else None
+
+    def record_tier(self, tier: str):
+        """Count which tier ultimately served a page ('http' or 'browser')."""
+        with self._lock:
+            self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+
+    def tier_stats(self) -> dict:
+        """Per-tier hit counts and rates, e.g. to see how many browser launches were avoided."""
+        with self._lock:
+            total = sum(self.tier_counts.values())
+            stats = {'total': total}
+            for tier, count in self.tier_counts.items():
+                stats[tier] = count
+                stats[f'{tier}_rate'] = round(100 * count / total, 1) if total else 0.0
+            return stats
+
+
+# Global instance shared by the scrapers
+http_fetcher = HttpFetcher()
+
+
+if __name__ == "__main__":
+    # Test the HTTP tier
+    test_url = "https://www.python.org"
+    text = http_fetcher.fetch_text(test_url)
+    if text:
+        print(f"\n📄 HTTP tier preview (first 500 chars):\n{text[:500]}")
+    else:
+        print("\nHTTP tier declined; the browser tier would be used.")
@@ -4,50 +4,70 @@ Searches company career pages directly using SerpApi, avoiding job aggregators.
 """
 
 import os
+import threading
 import time
-from serpapi import GoogleSearch
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
 load_dotenv()
 
-# Domains to AVOID (job aggregators)
-BLOCKED_DOMAINS = [
-    'indeed.com',
-    'linkedin.com',
-    'naukri.com',
-    'monster.com',
-    'glassdoor.com',
-    'ziprecruiter.com',
-    'shine.com',
-    'timesjobs.com',
-    'instahyre.com',
-    'hirist.com',
-    'foundit.in',
-    'apna.co',
-]
+# Imported after load_dotenv so SERPAPI_* settings in .env are honoured
+from serpapi_cache import serpapi_cache, serpapi_limiter, iter_result_pages, SerpApiQuotaExceeded
+from company_index import CompanyIndex, search_term
+from dedup import JobDeduplicator
+from url_classifier import url_classifier
+
+
+class SearchStats:
+    """Per-company SerpApi latency, result counts and errors (thread-safe)."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.companies = {}
+    
+    def record(self, company_name: str, latency: float, jobs: int, error: str = None, calls: int = 1):
+        with self._lock:
+            self.companies[company_name] = {'latency': latency, 'jobs': jobs, 'error': error, 'calls': calls}
+    
+    def reset(self):
+        with self._lock:
+            self.companies = {}
+    
+    def summary(self) -> dict:
+        with self._lock:
+            entries = list(self.companies.values())
+        latencies = sorted(e['latency'] for e in entries)
+        return {
+            'companies': len(entries),
+            'errors': sum(1 for e in entries if e['error']),
+            'jobs': sum(e['jobs'] for e in entries),
+            'api_calls': sum(e['calls'] for e in entries),
+            'avg_latency': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'max_latency': round(latencies[-1], 2) if latencies else 0.0
+        }
+
+
+search_stats = SearchStats()
+
+# Domains to AVOID (job aggregators) - kept for callers that read the list
+BLOCKED_DOMAINS = sorted(url_classifier.aggregator_domains)
 
 
 def is_company_career_page(url: str) -> bool:
     """
     Check if URL is a direct company career page (not a job aggregator).
     
+    Delegates to url_classifier, which matches aggregator hosts on domain
+    boundaries and caches the result per URL.
+    
     Args:
         url (str): URL to check
         
     Returns:
         bool: True if it's a company career page, False if it's an aggregator
     """
-    url_lower = url.lower()
-    
-    # Block known aggregators
-    for domain in BLOCKED_DOMAINS:
-        if domain in url_lower:
-            return False
-    
-    # Prefer URLs with career-related keywords
-    career_keywords = ['career', 'job', 'hiring', 'work-with-us', 'join', 'opportunity']
-    return any(keyword in url_lower for keyword in career_keywords)
+    return url_classifier.is_company_career_page(url)
 
 
 def search_jobs_at_company(company_name: str, job_title: str = "", location: str = "India", logger=None):
@@ -87,10 +107,10 @@ def search_jobs_at_company(company_name: str, job_title: str = "", location: str
     
     log(f"SerpApi Parameters: {params}")
     
+    started = time.monotonic()
     try:
         log("Sending request to SerpApi...")
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = serpapi_cache.search(params, logger=logger)
         
         log(f"SerpApi Response received")
         log(f"Response keys: {list(results.keys())}")
@@ -118,14 +138,107 @@ def search_jobs_at_company(company_name: str, job_title: str = "", location: str
         ]
         
         log(f"Filtered jobs (matching {company_name}): {len(company_jobs)}")
+        search_stats.record(company_name, time.monotonic() - started, len(company_jobs))
         
         return company_jobs
         
+    except SerpApiQuotaExceeded as e:
+        log(f"SerpApi quota: {str(e)}", "WARN")
+        search_stats.record(company_name, time.monotonic() - started, 0, error=str(e))
+        return []
     except Exception as e:
         log(f"SerpApi Error: {str(e)}", "ERROR")
+        search_stats.record(company_name, time.monotonic() - started, 0, error=str(e))
         return []
 
 
+def search_company_batch(
+    company_names: list,
+    job_title: str = "",
+    location: str = "India",
+    jobs_per_company: int = 3,
+    max_pages: int = 3,
+    logger=None
+):
+    """
+    Search several companies with one OR-query and route the results back.
+    
+    The query looks like `Backend Developer ("Google" OR "Microsoft") India`.
+    Further pages are requested via `next_page_token` only while some
+    company in the batch still has fewer than `jobs_per_company` jobs.
+    Results are routed to companies through a CompanyIndex, so variants
+    like "Google LLC" or "Facebook India" land on the right company.
+    
+    Args:
+        company_names (list): Companies (names as in companies.py)
+        job_title (str): Optional job title filter
+        location (str): Location filter
+        jobs_per_company (int): Jobs wanted per company
+        max_pages (int): Maximum result pages to request
+        logger: Logger function
+        
+    Returns:
+        dict: Company name -> job postings (every company present, maybe empty)
+    """
+    def log(msg, level="INFO"):
+        if logger:
+            logger(msg, level)
+        else:
+            print(f"[{level}] {msg}")
+    
+    index = CompanyIndex(company_names)
+    companies_clause = " OR ".join(f'"{search_term(name)}"' for name in company_names)
+    query = f"{job_title or 'jobs'} ({companies_clause}) {location}"
+    log(f"SerpApi batch query ({len(company_names)} companies): '{query}'")
+    
+    params = {
+        "engine": "google_jobs",
+        "q": query,
+        "location": location,
+        "hl": "en",
+        "gl": "in",
+        "api_key": os.getenv("SERPAPI_KEY")
+    }
+    
+    routed = {name: [] for name in company_names}
+    
+    def page_cannot_cover(results):
+        # Fewer jobs on this page than companies still short of jobs: the next page is needed anyway
+        shortfall = sum(max(0, jobs_per_company - len(j)) for j in routed.values())
+        return len(results.get("jobs_results", [])) < shortfall
+    
+    started = time.monotonic()
+    pages = 0
+    error = None
+    try:
+        for results in iter_result_pages(params, max_pages=max_pages, prefetch=page_cannot_cover, logger=logger):
+            pages += 1
+            jobs = results.get("jobs_results", [])
+            for company, company_jobs in index.route(jobs).items():
+                routed[company].extend(company_jobs)
+            log(f"  Page {pages}: {len(jobs)} jobs, "
+                f"{sum(1 for j in routed.values() if j)}/{len(company_names)} companies covered")
+            
+            if all(len(j) >= jobs_per_company for j in routed.values()):
+                break
+    except SerpApiQuotaExceeded as e:
+        error = str(e)
+        log(f"SerpApi quota: {error}", "WARN")
+    except Exception as e:
+        error = str(e)
+        log(f"SerpApi Error: {error}", "ERROR")
+    
+    # Attribute the batch's cost to its first company so totals stay exact
+    latency = time.monotonic() - started
+    for position, name in enumerate(company_names):
+        search_stats.record(name, latency, len(routed[name]), error=error, calls=pages if position == 0 else 0)
+    
+    missing = [name for name, jobs in routed.items() if not jobs]
+    if missing:
+        log(f"  No results routed to: {', '.join(missing)}")
+    return routed
+
+
 def extract_job_posting_url(job, logger=None):
     """
     Extract the ACTUAL job posting URL from SerpApi response.
@@ -195,17 +308,115 @@ def extract_job_posting_url(job, logger=None):
     return None, "none"
 
 
+def iter_qualified_jobs(params: dict, limit: int, max_pages: int = 5, counts: dict = None, ttl: float = None, logger=None):
+    """
+    Stream jobs that link to a company career page, across result pages.
+    
+    Pages are fetched lazily and paging stops as soon as `limit` qualified
+    jobs have been yielded. The next page is prefetched only when the
+    current one has fewer jobs than are still wanted (so it cannot be
+    enough), which keeps prefetching from paying for unneeded pages.
+    
+    Args:
+        params (dict): SerpApi google_jobs params for the first page
+        limit (int): Number of qualified jobs wanted
+        max_pages (int): Hard cap on pages requested
+        counts (dict): Optional dict updated with 'pages', 'seen' and 'qualified'
+        ttl (float): Cache freshness in seconds (default: cache TTL)
+        logger: Logger function (optional)
+        
+    Yields:
+        dict: Job annotated with career_page_url and url_source
+    """
+    counts = counts if counts is not None else {}
+    counts.update({'pages': 0, 'seen': 0, 'qualified': 0})
+    if limit <= 0:
+        return
+    
+    def page_cannot_fill(results):
+        return len(results.get("jobs_results", [])) < limit - counts['qualified']
+    
+    for results in iter_result_pages(params, max_pages=max_pages, prefetch=page_cannot_fill, ttl=ttl, logger=logger):
+        counts['pages'] += 1
+        for job in results.get("jobs_results", []):
+            counts['seen'] += 1
+            career_url, source = extract_job_posting_url(job, logger=logger)
+            if not career_url:
+                continue
+            job['career_page_url'] = career_url
+            job['url_source'] = source
+            counts['qualified'] += 1
+            yield job
+            if counts['qualified'] >= limit:
+                return
+
+
+def prepare_company_jobs(company_name: str, career_url: str, jobs: list, jobs_per_company: int = 3, logger=None):
+    """
+    Keep the first `jobs_per_company` jobs of a company and attach the
+    URLs to scrape (career_page_url, url_source, company_career_url).
+    
+    Args:
+        company_name (str): Company the jobs belong to
+        career_url (str): Company career page (fallback URL)
+        jobs (list): Jobs returned by search_jobs_at_company
+        jobs_per_company (int): Max jobs to keep
+        logger: Logger function (optional)
+        
+    Returns:
+        list: The kept jobs, annotated in place
+    """
+    def log(msg, level="INFO"):
+        if logger:
+            logger(msg, level)
+        else:
+            print(f"[{level}] {msg}")
+    
+    if not jobs:
+        log(f"ℹ️  No jobs found at {company_name}", "WARN")
+        return []
+    
+    log(f"✅ Found {len(jobs)} jobs at {company_name}", "SUCCESS")
+    
+    kept = []
+    # Add company career URL to each job
+    for idx, job in enumerate(jobs[:jobs_per_company], 1):
+        job['company_career_url'] = career_url
+        
+        log(f"  Job {idx}: {job.get('title', 'Unknown')}")
+        log(f"    Location: {job.get('location', 'Unknown')}")
+        
+        # Extract actual job posting URL
+        extracted_url, source = extract_job_posting_url(job, logger=log)
+        job['career_page_url'] = extracted_url or career_url
+        job['url_source'] = source
+        
+        log(f"    Final URL ({source}): {job['career_page_url']}")
+        kept.append(job)
+    
+    return kept
+
+
 def search_multiple_companies(
     companies: dict,
     job_title: str = "",
     location: str = "India",
     max_companies: int = 10,
     jobs_per_company: int = 3,
-    logger=None
+    logger=None,
+    workers: int = 1,
+    batch_size: int = 1,
+    deduplicate: bool = True
 ):
     """
     Search for jobs across multiple companies with detailed logging.
     
+    With workers > 1 the companies are queried concurrently; all searches
+    share `serpapi_limiter`, so the plan's rate limit still holds. With
+    batch_size > 1 companies are grouped into OR-queries (see
+    search_company_batch), which needs far fewer SerpApi calls. Results
+    are always returned in the input (tier priority) order.
+    
     Args:
         companies (dict): Company name -> career URL mapping
         job_title (str): Job title to search for
@@ -213,6 +424,9 @@ def search_multiple_companies(
         max_companies (int): Maximum companies to search
         jobs_per_company (int): Max jobs to return per company
         logger: Logger function (optional)
+        workers (int): Number of concurrent SerpApi searches
+        batch_size (int): Companies per SerpApi query (1 = one query per company)
+        deduplicate (bool): Drop repeat postings (same job_id, URL or near-identical text)
         
     Returns:
         list: All job postings found
@@ -223,51 +437,59 @@ def search_multiple_companies(
         else:
             print(f"[{level}] {msg}")
     
-    all_jobs = []
-    companies_searched = 0
+    selected = list(companies.items())[:int(max_companies)]
+    
+    batch_size = max(1, int(batch_size))
+    batches = [selected[i:i + batch_size] for i in range(0, len(selected), batch_size)]
     
-    log(f"Starting search across {min(max_companies, len(companies))} companies")
+    log(f"Starting search across {len(selected)} companies "
+        f"({len(batches)} queries, {workers} concurrent)")
     log(f"Search query: '{job_title}' in '{location}'")
     
-    for company_name, career_url in list(companies.items())[:max_companies]:
-        if companies_searched >= max_companies:
-            break
-        
+    def search_one(position, company_name, career_url):
         log(f"\\n{'='*60}")
-        log(f"Company {companies_searched + 1}/{max_companies}: {company_name}")
+        log(f"Company {position}/{len(selected)}: {company_name}")
         log(f"Career URL: {career_url}")
         log(f"{'='*60}")
-        
         jobs = search_jobs_at_company(company_name, job_title, location, logger=log)
-        
-        if jobs:
-            log(f"✅ Found {len(jobs)} jobs at {company_name}", "SUCCESS")
-            
-            # Add company career URL to each job
-            for idx, job in enumerate(jobs[:jobs_per_company], 1):
-                job['company_career_url'] = career_url
-                
-                log(f"  Job {idx}: {job.get('title', 'Unknown')}")
-                log(f"    Location: {job.get('location', 'Unknown')}")
-                
-                # Extract actual job posting URL
-                extracted_url, source = extract_job_posting_url(job, logger=log)
-                job['career_page_url'] = extracted_url or career_url
-                job['url_source'] = source
-                
-                log(f"    Final URL ({source}): {job['career_page_url']}")
-                all_jobs.append(job)
-        else:
-            log(f"ℹ️  No jobs found at {company_name}", "WARN")
-        
-        companies_searched += 1
-        
-        # Rate limiting - be nice to SerpApi
-        if companies_searched < max_companies:
-            log("  Waiting 2s (rate limiting)...")
-            time.sleep(2)
+        return prepare_company_jobs(company_name, career_url, jobs, jobs_per_company, logger=log)
     
-    log(f"\\nSearch complete: {len(all_jobs)} total jobs from {companies_searched} companies")
+    def search_batch(position, batch):
+        if len(batch) == 1:
+            return search_one(position, *batch[0])
+        log(f"\\n{'='*60}")
+        log(f"Batch {position}/{len(batches)}: {', '.join(name for name, _ in batch)}")
+        log(f"{'='*60}")
+        routed = search_company_batch(
+            [name for name, _ in batch], job_title, location, jobs_per_company, logger=log
+        )
+        return [
+            job
+            for company_name, career_url in batch
+            for job in prepare_company_jobs(company_name, career_url, routed[company_name], jobs_per_company, logger=log)
+        ]
+    
+    search_stats.reset()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="serpapi") as pool:
+        futures = [
+            pool.submit(search_batch, position, batch)
+            for position, batch in enumerate(batches, 1)
+        ]
+        # Collect in submission order to keep tier priority
+        all_jobs = [job for future in futures for job in future.result()]
+    
+    if deduplicate:
+        deduplicator = JobDeduplicator()
+        all_jobs = deduplicator.filter(all_jobs)
+        dedup_stats = deduplicator.stats()
+        if dedup_stats['duplicates']:
+            log(f"Removed {dedup_stats['duplicates']} duplicate postings {dedup_stats['by_reason']} "
+                f"- saves {dedup_stats['scrapes_saved']} scrapes and {dedup_stats['ai_calls_saved']} AI calls")
+    
+    stats = search_stats.summary()
+    log(f"\\nSearch complete: {len(all_jobs)} total jobs from {len(selected)} companies")
+    log(f"SerpApi: {stats['api_calls']} calls, latency avg {stats['avg_latency']}s, "
+        f"max {stats['max_latency']}s, {stats['errors']} errors")
     return all_jobs
 
 
@@ -317,22 +539,12 @@ def search_by_skills_and_experience(
     }
     
     try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        jobs = results.get("jobs_results", [])[:max_results]
-        
-        # Filter out aggregators and add career URLs
-        filtered_jobs = []
-        for job in jobs:
-            career_url, source = extract_job_posting_url(job)
-            if career_url:  # Only include if we found a company career page
-                job['career_page_url'] = career_url
-                job['url_source'] = source
-                filtered_jobs.append(job)
+        # Only jobs with a company career page count towards max_results
+        counts = {}
+        filtered_jobs = list(iter_qualified_jobs(params, limit=max_results, counts=counts))
         
-        print(f"✅ Found {len(filtered_jobs)} jobs from company career pages")
-        print(f"❌ Filtered out {len(jobs) - len(filtered_jobs)} aggregator links")
+        print(f"✅ Found {len(filtered_jobs)} jobs from company career pages ({counts['pages']} result pages)")
+        print(f"❌ Filtered out {counts['seen'] - counts['qualified']} aggregator links")
         
         return filtered_jobs
         
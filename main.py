@@ -3,21 +3,35 @@ Stealth Job Discovery Bot - Main Controller
 Orchestrates job search, scraping, and AI analysis.
 """
 
+import argparse
 import os
-import time
-from serpapi import GoogleSearch
-from scraper import get_page_content
-from analyzer import analyze_job
+import sys
+from async_scraper import scrape_all
+from http_fetcher import http_fetcher, MIN_CONTENT_LENGTH
+from page_cache import page_cache
+from analysis_pool import AnalysisExecutor
+from analyzer import MY_PROFILE
+from relevance import DEFAULT_FLOOR, RelevanceFilter, RelevanceScorer, extract_skills, years_of_experience
+from semantic_index import semantic_index
+from text_condenser import text_condenser
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+from serpapi_cache import serpapi_cache
+from job_finder import iter_qualified_jobs
+from dedup import JobDeduplicator
+from url_classifier import url_classifier
+
 
 def find_jobs(query="Software Developer", location="India", num_results=5):
     """
     Search for jobs using SerpApi's Google Jobs engine.
     
+    Only jobs that link to a company career page count towards
+    `num_results`; further result pages are fetched until enough are found.
+    
     Args:
         query (str): Job search query (e.g., "Python Developer", "Backend Engineer")
         location (str): Location filter (e.g., "India", "Remote", "San Francisco")
@@ -38,17 +52,16 @@ def find_jobs(query="Software Developer", location="India", num_results=5):
     }
 
     try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        jobs = results.get("jobs_results", [])
+        counts = {}
+        jobs = list(iter_qualified_jobs(params, limit=num_results, counts=counts, ttl=6 * 3600))
         
         if not jobs:
             print("⚠️  No jobs found. Try a different search query.")
             return []
         
-        print(f"✅ Found {len(jobs)} potential jobs. Limiting to top {num_results}...\n")
-        return jobs[:num_results]
+        print(f"✅ Found {len(jobs)} jobs with company career pages "
+              f"({counts['seen']} results scanned over {counts['pages']} page(s))\n")
+        return jobs
         
     except Exception as e:
         print(f"❌ Error searching jobs: {e}")
@@ -67,17 +80,18 @@ def extract_job_url(job):
     Returns:
         str: URL to scrape, or None if no suitable URL found
     """
+    # Already resolved by job_finder.iter_qualified_jobs
+    if job.get('career_page_url'):
+        return job['career_page_url']
+    
     # Try to get related links (company career pages)
     related_links = job.get('related_links', [])
     
     if related_links:
         # Filter out job boards - prefer direct company links
-        excluded_domains = ['linkedin.com', 'indeed.com', 'glassdoor.com', 
-                           'naukri.com', 'monster.com', 'ziprecruiter.com']
-        
         for link in related_links:
             url = link.get('link', '')
-            if not any(domain in url for domain in excluded_domains):
+            if url and not url_classifier.is_aggregator(url):
                 return url
         
         # If no direct company link, use the first one
@@ -90,7 +104,8 @@ def extract_job_url(job):
     return None
 
 
-def run_bot(search_query="Python Developer", location="India", num_jobs=3, min_score=70):
+def run_bot(search_query="Python Developer", location="India", num_jobs=3, min_score=70, scrape_concurrency=4,
+            analysis_concurrency=4, relevance_floor=DEFAULT_FLOOR):
     """
     Main bot execution function.
     
@@ -99,6 +114,9 @@ def run_bot(search_query="Python Developer", location="India", num_jobs=3, min_s
         location (str): Where to search
         num_jobs (int): How many jobs to analyze (default 3 to save API credits)
         min_score (int): Minimum AI match score to be considered a good match (0-100)
+        scrape_concurrency (int): How many job pages to scrape in parallel
+        analysis_concurrency (int): How many AI analyses to run in parallel
+        relevance_floor (float): Local relevance score (0-1) a job needs before it is sent to the AI
     """
     print("="*60)
     print("🤖 STEALTH JOB DISCOVERY BOT - Starting...")
@@ -116,44 +134,87 @@ def run_bot(search_query="Python Developer", location="India", num_jobs=3, min_s
         print("\n❌ No jobs to analyze. Exiting.")
         return
     
+    # Step 1b: Drop repeat postings before paying to scrape/analyze them
+    deduplicator = JobDeduplicator()
+    jobs = deduplicator.filter(jobs)
+    dedup_stats = deduplicator.stats()
+    if dedup_stats['duplicates']:
+        print(f"♊ Removed {dedup_stats['duplicates']} duplicate postings "
+              f"(saved {dedup_stats['scrapes_saved']} scrapes and {dedup_stats['ai_calls_saved']} AI calls)\n")
+    
     good_matches = []
     
-    # Step 2: Analyze each job
-    for idx, job in enumerate(jobs, 1):
+    # Step 2: Stealth scrape all job pages concurrently
+    target_urls = [extract_job_url(job) for job in jobs]
+    print(f"🕵️  Scraping {len([u for u in target_urls if u])} job pages concurrently...\n")
+    scraped_pages = scrape_all(target_urls, concurrency=scrape_concurrency, http_first=True)
+    tiers = http_fetcher.tier_stats()
+    cache = page_cache.stats()
+    print(f"📦 Page cache: {cache['hits']} hits, {cache['misses']} misses, {cache['revalidated']} revalidated, {cache['updated']} updated")
+    print(f"📶 Fetch tiers: {tiers.get('http', 0)} over HTTP, {tiers.get('browser', 0)} needed the browser\n")
+    
+    # Step 3: Keep jobs whose page gave us usable content
+    analyzable = {}
+    for idx, (job, target_url) in enumerate(zip(jobs, target_urls), 1):
+        label = f"Job {idx}/{len(jobs)}: {job.get('title', 'Unknown Title')} @ {job.get('company_name', 'Unknown')}"
+        content = scraped_pages.get(target_url) if target_url else None
+        if content:
+            # Drop menus, banners and footers; keep requirements within the token budget
+            content = text_condenser.condense(content, url=target_url)
+        
+        if not target_url:
+            print(f"   ⚠️  {label} - no direct link found, skipping this job.")
+        elif not content:
+            print(f"   ❌ {label} - failed to scrape content, skipping.")
+        elif len(content) < MIN_CONTENT_LENGTH:
+            print(f"   ⚠️  {label} - content too short (likely access denied or paywall), skipping.")
+        else:
+            analyzable[idx] = content
+    
+    # Step 3b: Only jobs that look relevant to the profile are worth an AI call
+    relevance = RelevanceFilter(
+        RelevanceScorer(extract_skills(MY_PROFILE, limit=None), search_query, years_of_experience(MY_PROFILE)),
+        floor=relevance_floor
+    )
+    analyzable, relevance_scores = relevance.select(analyzable)
+    for idx, score in relevance_scores.items():
+        if idx not in analyzable:
+            job = jobs[idx - 1]
+            print(f"   ⏭️  Job {idx}/{len(jobs)}: {job.get('title', 'Unknown Title')} @ {job.get('company_name', 'Unknown')}"
+                  f" - relevance {score:.2f} below {relevance_floor}, skipping AI analysis.")
+    
+    # Step 3c: Most similar to the profile first; the index also scores jobs offline if Gemini is out of quota
+    semantic_index.set_profile(MY_PROFILE)
+    index_keys = {idx: jobs[idx - 1].get('job_id') or target_urls[idx - 1] for idx in analyzable}
+    semantic_index.add_many((index_keys[idx], content) for idx, content in analyzable.items())
+    similarity = semantic_index.similarities(index_keys.values()) if analyzable else {}
+    analysis_order = sorted(analyzable, key=lambda idx: similarity.get(str(index_keys[idx]), 0.0), reverse=True)
+    
+    # Step 4: Analyze with AI concurrently; results print as they finish
+    executor = AnalysisExecutor(concurrency=analysis_concurrency, fallback=semantic_index.offline_analysis)
+    for idx, analysis in executor.analyze_stream((idx, analyzable[idx]) for idx in analysis_order):
+        job = jobs[idx - 1]
+        target_url = target_urls[idx - 1]
+        
         print(f"\n{'='*60}")
         print(f"📋 Job {idx}/{len(jobs)}: {job.get('title', 'Unknown Title')}")
         print(f"🏢 Company: {job.get('company_name', 'Unknown')}")
         print(f"📍 Location: {job.get('location', 'Unknown')}")
-        print(f"{'='*60}")
-        
-        # Extract the URL to scrape
-        target_url = extract_job_url(job)
-        
-        if not target_url:
-            print("   ⚠️  No direct link found, skipping this job.")
-            continue
-        
         print(f"🔗 URL: {target_url}")
-        
-        # Step 3: Stealth scrape the job page
-        content = get_page_content(target_url)
-        
-        if not content:
-            print("   ❌ Failed to scrape content, moving to next job.")
-            continue
-        
-        if len(content) < 100:
-            print("   ⚠️  Content too short (likely access denied or paywall), skipping.")
-            continue
-        
-        # Step 4: Analyze with AI
-        analysis = analyze_job(content)
+        print(f"{'='*60}")
         
         score = analysis['match_score']
         reason = analysis['reason']
         apply_link = analysis.get('apply_link') or target_url
         
-        print(f"\n   🎯 AI Match Score: {score}/100")
+        if analysis.get('error'):
+            print(f"\n   ❌ AI analysis failed: {reason}")
+            continue
+        
+        if analysis.get('offline'):
+            print(f"\n   📴 Offline Match Score (profile similarity): {score}/100")
+        else:
+            print(f"\n   🎯 AI Match Score: {score}/100")
         print(f"   💡 Reason: {reason}")
         
         # Step 5: Save good matches
@@ -169,10 +230,23 @@ def run_bot(search_query="Python Developer", location="India", num_jobs=3, min_s
             })
         else:
             print(f"   ⏭️  Score too low - Skipping")
-        
-        # Be nice to servers - small delay between requests
-        if idx < len(jobs):
-            time.sleep(2)
+    
+    condensed = text_condenser.stats()
+    print(f"\n✂️  Job text condensed: {condensed['chars_in']} -> {condensed['chars_out']} chars "
+          f"({condensed['saved_pct']}% fewer prompt tokens, {condensed['boilerplate_lines']} boilerplate lines dropped)")
+    relevance_stats = relevance.stats()
+    print(f"🎯 Relevance pre-filter: {relevance_stats['llm_calls_avoided']} of {relevance_stats['considered']} "
+          f"jobs skipped without an AI call")
+    ai_stats = executor.stats()
+    print(f"🤖 AI calls: {ai_stats['requests']} requests, {ai_stats['cached']} cached, "
+          f"{ai_stats['retries']} retries, {ai_stats['failed']} failed, {ai_stats['offline']} scored offline")
+    parsing = executor.analyzer.parse_stats()
+    print(f"🧾 AI responses: {parsing['responses']} received, {parsing['repaired']} repaired locally, "
+          f"{parsing['invalid']} unusable ({parsing['failure_rate']}%), {parsing['parse_retries']} re-asked")
+    semantic_index.save()
+    serp = serpapi_cache.stats()
+    print(f"🔎 SerpApi: {serp['calls_made']} calls made, {serp['calls_saved']} served from cache "
+          f"({serp['quota_used']}/{serp['quota_limit'] or '∞'} of today's quota used)")
     
     # Step 6: Final report
     print("\n" + "="*60)
@@ -231,7 +305,48 @@ def interactive_mode():
     run_bot(search_query=search_query, location=location, num_jobs=num_jobs, min_score=min_score)
 
 
+def parse_args(argv=None):
+    """Command-line options. With no --query the bot asks interactively."""
+    parser = argparse.ArgumentParser(
+        description="Stealth Job Discovery Bot - find jobs, scrape postings, score them with AI."
+    )
+    parser.add_argument("--query", "-q", help="Job search query, e.g. 'Python Developer' (omit for interactive mode)")
+    parser.add_argument("--location", "-l", default="India", help="Location filter (default: India)")
+    parser.add_argument("--num-jobs", "-n", type=int, default=3, help="Jobs to analyze, 1-10 (default: 3)")
+    parser.add_argument("--min-score", "-s", type=int, default=70, help="Minimum match score, 0-100 (default: 70)")
+    parser.add_argument("--relevance-floor", type=float, default=DEFAULT_FLOOR,
+                        help=f"Local relevance score (0-1) needed before a job is sent to the AI (default: {DEFAULT_FLOOR})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Check configuration and caches, then exit without calling any API")
+    return parser.parse_args(argv)
+
+
+def dry_run(args):
+    """Print what a run would do, without touching the network."""
+    print("\n🧪 Dry run - no API calls will be made\n")
+    print(f"Search: {args.query or '(interactive)'} in {args.location}")
+    print(f"Analyze: top {args.num_jobs} jobs, minimum score {args.min_score}/100")
+    
+    for key in ("SERPAPI_KEY", "GEMINI_API_KEY"):
+        value = os.getenv(key)
+        configured = bool(value) and not value.startswith("your_")
+        print(f"{'✅' if configured else '❌'} {key} {'configured' if configured else 'missing'}")
+    
+    serp = serpapi_cache.stats()
+    remaining = serpapi_cache.quota_remaining()
+    print(f"🔎 SerpApi cache: {serp['entries']} queries cached, "
+          f"{'unlimited' if remaining is None else remaining} calls left today")
+    cache = page_cache.stats()
+    print(f"📦 Page cache: {cache['entries']} pages ({cache['kb_on_disk']} KB)")
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    
+    if args.dry_run:
+        dry_run(args)
+        sys.exit(0)
+    
     # Check if API keys are configured
     if not os.getenv("SERPAPI_KEY") or os.getenv("SERPAPI_KEY") == "your_serpapi_key_here":
         print("\n❌ ERROR: SERPAPI_KEY not configured!")
@@ -245,12 +360,23 @@ if __name__ == "__main__":
         print("See .env.example for the required format.\n")
         exit(1)
     
-    # You can either use interactive mode or hardcode your preferences:
+    # You can either use interactive mode or pass options on the command line:
     
     # OPTION 1: Interactive mode (recommended for beginners)
-    interactive_mode()
+    if not args.query:
+        interactive_mode()
+    
+    # OPTION 2: python main.py --query "GoLang Backend Developer" --location Remote --num-jobs 5
+    else:
+        run_bot(
+            search_query=args.query,
+            location=args.location,
+            num_jobs=max(1, min(args.num_jobs, 10)),
+            min_score=max(0, min(args.min_score, 100)),
+            relevance_floor=args.relevance_floor
+        )
     
-    # OPTION 2: Hardcoded search (uncomment below and comment out interactive_mode())
+    # OPTION 3: Hardcoded search (uncomment below and comment out the block above)
     # run_bot(
     #     search_query="GoLang Backend Developer",
     #     location="Remote",
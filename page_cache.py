@@ -0,0 +1,125 @@
+"""
+Page Cache
+Persistent cache of extracted job-page text, keyed by a hash of the
+normalized URL, so repeated searches do not re-scrape the same postings.
+"""
+
+import hashlib
+from contextlib import nullcontext
+from typing import Callable, Optional
+
+from disk_cache import DiskCache
+from url_utils import normalize_url
+from http_fetcher import http_fetcher, looks_js_rendered
+
+
+class PageCache(DiskCache):
+    """
+    Stores {url, text, fetched_at, etag, last_modified, source} per page.
+
+    Fresh entries are served directly. Stale entries that carry an ETag or
+    Last-Modified header are revalidated with a conditional GET once
+    robots.txt allows the URL; a 304 extends their TTL without re-scraping
+    and a 200 replaces the cached text with the new body.
+    """
+
+    def __init__(self, ttl: float = 24 * 3600, max_bytes: int = 50 * 1024 * 1024, path: Optional[str] = None):
+        super().__init__('pages', default_ttl=ttl, max_bytes=max_bytes, path=path)
+        self.revalidated = 0
+        self.updated = 0
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def store(
+        self,
+        url: str,
+        text: str,
+        source: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Cache the extracted text of a page."""
+        self.set(self.key_for(url), {
+            'url': normalize_url(url),
+            'text': text,
+            'source': source,
+            'etag': etag,
+            'last_modified': last_modified
+        })
+
+    def lookup_text(self, url: str) -> Optional[str]:
+        """
+        Return cached text for a URL if it is still fresh (no network).
+
+        Args:
+            url (str): Page URL (tracking parameters are ignored)
+
+        Returns:
+            str: Cached page text, or None if missing or stale
+        """
+        entry = self.get_entry(self.key_for(url), allow_stale=True)
+        if entry is None or entry['stale']:
+            return None
+        return entry['value']['text']
+
+    def revalidate(self, url: str, slot: Optional[Callable] = None) -> Optional[str]:
+        """
+        Revalidate a stale entry with a conditional GET. Call this only once
+        robots.txt allows the URL.
+
+        A 304 extends the entry's TTL. A 200 with usable text is stored (with
+        its new validators) and returned, so the page is not downloaded twice.
+
+        Args:
+            url (str): Page URL
+            slot (callable): Context manager factory held around the request
+                (e.g. polite_scheduler.slot), if the caller is not in one already
+
+        Returns:
+            str: Current page text, or None if the page must be fetched by the scrapers
+        """
+        key = self.key_for(url)
+        entry = self.get_entry(key, allow_stale=True, count=False)  # lookup_text counted it
+        if entry is None:
+            return None
+        page = entry['value']
+        if not entry['stale']:
+            return page['text']
+
+        # Stale: only a validator lets us avoid a full re-fetch
+        conditional_headers = {}
+        if page.get('etag'):
+            conditional_headers['If-None-Match'] = page['etag']
+        if page.get('last_modified'):
+            conditional_headers['If-Modified-Since'] = page['last_modified']
+        if not conditional_headers:
+            return None
+
+        with (slot(url) if slot else nullcontext()):
+            result = http_fetcher.fetch(url, extra_headers=conditional_headers)
+        if not result:
+            return None
+        if result['status'] == 304:
+            self.refresh(key)
+            self.revalidated += 1
+            print(f"   🔁 Page cache revalidated (304 Not Modified): {url}")
+            return page['text']
+        if result['status'] == 200 and not looks_js_rendered(result['html'], result['text']):
+            self.store(url, result['text'], 'http', result['etag'], result['last_modified'])
+            http_fetcher.record_tier('http')
+            self.updated += 1
+            print(f"   🔁 Page changed since it was cached, stored the new version: {url}")
+            return result['text']
+        return None
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats['revalidated'] = self.revalidated
+        stats['updated'] = self.updated
+        return stats
+
+
+# Global instance shared by the scrapers
+page_cache = PageCache()
@@ -0,0 +1,321 @@
+"""
+Streaming Job Pipeline
+Overlaps the three stages of a search: jobs found at one company flow
+straight into scraping, and scraped text flows straight into AI analysis,
+through bounded queues. The first scored job is available as soon as the
+first company returns instead of after the whole search.
+
+    companies -> [search] -> jobs queue -> [fetch] -> texts queue -> [analyze] -> events
+"""
+
+import queue
+import threading
+from typing import Iterator
+
+from job_finder import search_jobs_at_company, search_company_batch, prepare_company_jobs
+from scraper import get_page_content
+from robots_checker import is_url_scrapable
+from http_fetcher import MIN_CONTENT_LENGTH
+from browser_pool import close_thread_browser_pool
+from dedup import JobDeduplicator
+from text_condenser import text_condenser
+from relevance import RelevanceFilter
+
+
+_DONE = object()  # end-of-stream marker passed between stages
+
+
+def fetch_job_content(job, logger=None):
+    """
+    Get analyzable text for one job: scrape its career page, falling back
+    to the SerpApi description when the page is blocked or too short.
+
+    Args:
+        job (dict): Job prepared by job_finder.prepare_company_jobs
+        logger: Logger function (optional)
+
+    Returns:
+        tuple: (content, source) - source is 'scraped', 'serpapi_description',
+               'robots_blocked' or 'too_short' (content is None for the last two)
+    """
+    def log(msg, level="INFO"):
+        if logger:
+            logger(msg, level)
+        else:
+            print(f"[{level}] {msg}")
+
+    job_title_text = job.get('title', 'Unknown')
+    job_url = job.get('career_page_url', '')
+
+    # Check robots.txt
+    if job_url:
+        allowed, reason = is_url_scrapable(job_url)
+        log(f"  robots.txt result for {job_url}: Allowed={allowed}, Reason={reason}")
+        if not allowed:
+            return None, 'robots_blocked'
+
+    content = None
+    if job_url:
+        content = get_page_content(job_url, respect_robots=True, http_first=True)
+        if content and len(content) >= MIN_CONTENT_LENGTH:
+            # Menus, banners and footers can make up most of a page
+            condensed = text_condenser.condense(content, url=job_url)
+            if len(condensed) >= MIN_CONTENT_LENGTH:
+                log(f"  ✅ Scraped {len(content)} characters from {job_url} (condensed to {len(condensed)})")
+                return condensed, 'scraped'
+            content = condensed
+        log(f"  ⚠️  Scraping {job_url} returned insufficient content ({len(content) if content else 0} chars)")
+
+    # Use SerpApi description as fallback (often has good details)
+    description = job.get('description', '')
+    if description:
+        log(f"  Using SerpApi description for {job_title_text}: {len(description)} characters")
+        content = f"Job Title: {job_title_text}\n\n{description}"
+        if len(content) >= 50:
+            return content, 'serpapi_description'
+
+    return None, 'too_short'
+
+
+class JobPipeline:
+    """
+    Three-stage search -> fetch -> analyze pipeline on worker threads.
+
+    Each stage has its own worker count; stages are connected by queues of
+    at most `queue_size` items, so a slow stage applies backpressure to the
+    one before it instead of letting work pile up in memory.
+
+    `run()` yields event dicts as things happen:
+        {'type': 'job_found', 'job': ...}
+        {'type': 'skipped', 'job': ..., 'reason': ...}
+        {'type': 'skipped', 'job': ..., 'reason': 'low_relevance', 'relevance': ...}
+        {'type': 'result', 'job': ..., 'content_source': ..., 'analysis': ..., 'relevance': ...}
+        {'type': 'error', 'stage': ..., 'error': ...}
+
+    Closing the generator (or dropping it) cancels the run: workers stop
+    taking new work, so no further SerpApi or Gemini calls are made once
+    the calls already in flight return.
+    """
+
+    def __init__(
+        self,
+        analyze,
+        job_title: str = "",
+        location: str = "India",
+        jobs_per_company: int = 2,
+        search_workers: int = 1,
+        batch_size: int = 1,
+        fetch_workers: int = 2,
+        analysis_workers: int = 4,
+        queue_size: int = 8,
+        deduplicator: JobDeduplicator = None,
+        relevance: RelevanceFilter = None,
+        logger=None
+    ):
+        """
+        Args:
+            analyze (callable): job_text -> analysis dict (e.g. AnalysisExecutor.analyze)
+            job_title (str): Job title to search for
+            location (str): Location filter
+            jobs_per_company (int): Max jobs to keep per company
+            search_workers (int): Parallel SerpApi searches (throttled by serpapi_cache.serpapi_limiter)
+            batch_size (int): Companies per SerpApi OR-query (1 = one query per company)
+            fetch_workers (int): Parallel page fetches (each owns a browser pool)
+            analysis_workers (int): Parallel AI analyses
+            queue_size (int): Capacity of each inter-stage queue
+            deduplicator (JobDeduplicator): Drops repeat postings before fetching (a fresh one by default)
+            relevance (RelevanceFilter): Skips the AI call for texts scoring below its floor (optional)
+            logger: Logger function (optional)
+        """
+        self.analyze = analyze
+        self.job_title = job_title
+        self.location = location
+        self.jobs_per_company = jobs_per_company
+        self.search_workers = max(1, search_workers)
+        self.batch_size = max(1, int(batch_size))
+        self.fetch_workers = max(1, fetch_workers)
+        self.analysis_workers = max(1, analysis_workers)
+        self.queue_size = max(1, queue_size)
+        self.deduplicator = deduplicator or JobDeduplicator()
+        self.relevance = relevance
+        self.logger = logger
+
+    def _log(self, msg, level="INFO"):
+        if self.logger:
+            self.logger(msg, level)
+        else:
+            print(f"[{level}] {msg}")
+
+    # ------------------------------------------------------------------
+    # Stage workers
+    # ------------------------------------------------------------------
+    def _search_batch(self, batch) -> dict:
+        """Company name -> jobs for one batch of (name, career_url) pairs."""
+        if len(batch) == 1:
+            company_name = batch[0][0]
+            self._log(f"🔎 Searching {company_name}...")
+            return {company_name: search_jobs_at_company(company_name, self.job_title, self.location, logger=self.logger)}
+        self._log(f"🔎 Searching {', '.join(name for name, _ in batch)}...")
+        return search_company_batch(
+            [name for name, _ in batch], self.job_title, self.location,
+            self.jobs_per_company, logger=self.logger
+        )
+
+    def _search_worker(self, batches, jobs_out, events, stop):
+        while not stop.is_set():
+            try:
+                batch = batches.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                found = self._search_batch(batch)
+                for company_name, career_url in batch:
+                    jobs = found.get(company_name, [])
+                    for job in prepare_company_jobs(company_name, career_url, jobs, self.jobs_per_company, logger=self.logger):
+                        if stop.is_set():
+                            return
+                        duplicate = self.deduplicator.check(job)
+                        if duplicate:
+                            self._log(f"  ♊ Duplicate of an earlier posting ({duplicate}): {job.get('title', 'Unknown')}")
+                            continue
+                        events.put({'type': 'job_found', 'job': job})
+                        jobs_out.put(job)  # blocks while the fetch stage is saturated
+            except Exception as e:
+                names = ', '.join(name for name, _ in batch)
+                events.put({'type': 'error', 'stage': 'search', 'error': f"{names}: {e}"})
+
+    def _fetch_worker(self, jobs_in, texts_out, events, stop):
+        try:
+            while True:
+                job = jobs_in.get()
+                if job is _DONE:
+                    return
+                if stop.is_set():
+                    continue  # cancelled: discard work until the end-of-stream marker
+                try:
+                    content, source = fetch_job_content(job, logger=self.logger)
+                except Exception as e:
+                    events.put({'type': 'error', 'stage': 'fetch', 'error': str(e)})
+                    continue
+                if content is None:
+                    events.put({'type': 'skipped', 'job': job, 'reason': source})
+                else:
+                    texts_out.put((job, content, source))
+        finally:
+            # Sync Playwright objects must be closed by the thread that made them
+            close_thread_browser_pool()
+
+    def _analysis_worker(self, texts_in, events, stop):
+        while True:
+            item = texts_in.get()
+            if item is _DONE:
+                return
+            if stop.is_set():
+                continue  # cancelled: discard work until the end-of-stream marker
+            job, content, source = item
+            try:
+                relevance = None
+                if self.relevance:
+                    allowed, relevance = self.relevance.allow(content)
+                    if not allowed:
+                        events.put({'type': 'skipped', 'job': job, 'reason': 'low_relevance', 'relevance': relevance})
+                        continue
+                try:
+                    analysis = self.analyze(content)
+                except Exception as e:
+                    analysis = {
+                        "match_score": 0,
+                        "reason": f"Error during analysis: {str(e)}",
+                        "apply_link": None,
+                        "error": True
+                    }
+                events.put({'type': 'result', 'job': job, 'content_source': source, 'analysis': analysis, 'relevance': relevance})
+            except Exception as e:
+                # A dead worker would leave texts_in full and deadlock the fetch stage
+                events.put({'type': 'error', 'stage': 'analysis', 'error': f"{job.get('title', 'Unknown')}: {e}"})
+
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+    def _start(self, workers, target, *args, name):
+        threads = [
+            threading.Thread(target=target, args=args, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def _drain(work: queue.Queue):
+        """Discard queued work, keeping end-of-stream markers so workers still shut down."""
+        markers = 0
+        while True:
+            try:
+                item = work.get_nowait()
+            except queue.Empty:
+                break
+            markers += item is _DONE
+        for _ in range(markers):
+            work.put(_DONE)
+
+    def _close_stage(self, threads, downstream, downstream_workers):
+        """Wait for a stage to finish, then tell every downstream worker to stop."""
+        for thread in threads:
+            thread.join()
+        for _ in range(downstream_workers):
+            downstream.put(_DONE)
+
+    def run(self, companies: dict, max_companies: int = 10) -> Iterator[dict]:
+        """
+        Run the pipeline over the first `max_companies` companies.
+
+        Args:
+            companies (dict): Company name -> career URL, in priority order
+            max_companies (int): Maximum companies to search
+
+        Yields:
+            dict: Pipeline events (see class docstring) as they happen
+        """
+        selected = list(companies.items())[:int(max_companies)]
+        company_queue = queue.Queue()
+        for start in range(0, len(selected), self.batch_size):
+            company_queue.put(selected[start:start + self.batch_size])
+
+        jobs_queue = queue.Queue(maxsize=self.queue_size)
+        texts_queue = queue.Queue(maxsize=self.queue_size)
+        events = queue.Queue()
+        stop = threading.Event()
+
+        self._log(f"Pipeline: {self.search_workers} search / {self.fetch_workers} fetch / "
+                  f"{self.analysis_workers} analysis workers, queue size {self.queue_size}")
+
+        searchers = self._start(self.search_workers, self._search_worker, company_queue, jobs_queue, events, stop, name="search")
+        fetchers = self._start(self.fetch_workers, self._fetch_worker, jobs_queue, texts_queue, events, stop, name="fetch")
+        analysts = self._start(self.analysis_workers, self._analysis_worker, texts_queue, events, stop, name="analysis")
+
+        # Shut stages down in order as each upstream stage drains
+        def supervise():
+            self._close_stage(searchers, jobs_queue, self.fetch_workers)
+            self._close_stage(fetchers, texts_queue, self.analysis_workers)
+            for thread in analysts:
+                thread.join()
+            events.put(_DONE)
+
+        threading.Thread(target=supervise, name="pipeline-supervisor", daemon=True).start()
+
+        finished = False
+        try:
+            while True:
+                event = events.get()
+                if event is _DONE:
+                    finished = True
+                    return
+                yield event
+        finally:
+            if not finished:
+                # Generator closed or abandoned: stop the workers spending quota
+                self._log("Pipeline cancelled - stopping workers", "WARN")
+                stop.set()
+                for work in (company_queue, jobs_queue, texts_queue, events):
+                    self._drain(work)
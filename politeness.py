@@ -0,0 +1,207 @@
+"""
+Per-Domain Politeness Scheduler
+Spaces out requests per host (honoring robots.txt crawl-delay) instead of
+sleeping globally, so a slow domain only slows down its own URLs.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlparse
+
+from robots_checker import robots_checker
+
+
+class PolitenessScheduler:
+    """
+    Tracks, per host, the next time a request is allowed and how many
+    requests are in flight.
+
+    A URL is eligible when:
+    - its host's next-allowed time has passed,
+    - its host has fewer than `per_host_concurrency` requests running, and
+    - fewer than `global_concurrency` requests are running overall.
+
+    Each dispatched request pushes its host's next-allowed time forward by
+    the robots.txt crawl-delay (or `default_delay` when none is set).
+
+    The same scheduler can be used from threads (`slot`) and from asyncio
+    (`dispatch`).
+    """
+
+    def __init__(
+        self,
+        global_concurrency: int = 4,
+        per_host_concurrency: int = 1,
+        default_delay: float = 1.0,
+        robots=robots_checker
+    ):
+        self.global_concurrency = max(1, global_concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.default_delay = default_delay
+        self.robots = robots
+        self._lock = threading.Condition()
+        self._next_allowed = {}  # host -> monotonic timestamp
+        self._active = {}  # host -> requests in flight
+        self._active_total = 0
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def delay_for(self, url: str) -> float:
+        """Crawl-delay for this URL's host from robots.txt, else the default."""
+        crawl_delay = self.robots.get_crawl_delay(url) if self.robots else None
+        return float(crawl_delay) if crawl_delay else self.default_delay
+
+    # ------------------------------------------------------------------
+    # Shared bookkeeping (callers hold self._lock)
+    # ------------------------------------------------------------------
+    def _has_capacity(self, host: str) -> bool:
+        return (
+            self._active_total < self.global_concurrency
+            and self._active.get(host, 0) < self.per_host_concurrency
+        )
+
+    def _wait_time(self, host: str, now: float) -> Optional[float]:
+        """Seconds until `host` is eligible, or None if blocked on concurrency caps."""
+        if not self._has_capacity(host):
+            return None
+        return max(0.0, self._next_allowed.get(host, 0.0) - now)
+
+    def _reserve(self, host: str, delay: float, now: float):
+        self._active[host] = self._active.get(host, 0) + 1
+        self._active_total += 1
+        self._next_allowed[host] = max(self._next_allowed.get(host, 0.0), now) + delay
+
+    def _release(self, host: str):
+        self._active[host] = max(0, self._active.get(host, 0) - 1)
+        self._active_total = max(0, self._active_total - 1)
+
+    # ------------------------------------------------------------------
+    # Thread API
+    # ------------------------------------------------------------------
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Block the calling thread until `url` may be fetched, then hold a
+        request slot for its host until the block exits.
+
+        Only this host's schedule is waited on; other threads fetching
+        other hosts are not delayed.
+        """
+        host = self.host_of(url)
+        delay = self.delay_for(url)
+
+        announced = False
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(host, now)
+                if wait == 0.0:
+                    break
+                if wait and wait >= 1 and not announced:
+                    print(f"   ⏱️  Waiting {wait:.1f}s for {host} (politeness)")
+                    announced = True
+                self._lock.wait(timeout=wait)
+            self._reserve(host, delay, now)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._release(host)
+                self._lock.notify_all()
+
+    # ------------------------------------------------------------------
+    # asyncio API
+    # ------------------------------------------------------------------
+    async def dispatch(
+        self,
+        urls: Iterable[str],
+        fetch: Callable[[str], Awaitable]
+    ) -> AsyncIterator[tuple]:
+        """
+        Run `fetch(url)` for every URL, always starting whichever URL is
+        eligible next, and yield results as they complete.
+
+        Args:
+            urls (iterable): URLs to fetch
+            fetch (callable): Coroutine function taking a URL
+
+        Yields:
+            tuple: (url, result) in completion order
+        """
+        pending = OrderedDict()  # host -> deque of URLs, rotated for fairness
+        for url in urls:
+            pending.setdefault(self.host_of(url), deque()).append(url)
+
+        running = {}  # task -> (url, host)
+
+        try:
+            while pending or running:
+                next_wake = None
+                progressed = True
+
+                with self._lock:
+                    # Keep dispatching until no host is eligible right now
+                    while progressed:
+                        progressed = False
+                        next_wake = None
+                        now = time.monotonic()
+                        for host in list(pending):
+                            wait = self._wait_time(host, now)
+                            if wait is None:
+                                continue
+                            if wait > 0:
+                                next_wake = wait if next_wake is None else min(next_wake, wait)
+                                continue
+
+                            url = pending[host].popleft()
+                            self._reserve(host, self.delay_for(url), now)
+                            running[asyncio.ensure_future(fetch(url))] = (url, host)
+                            progressed = True
+
+                            if pending[host]:
+                                pending.move_to_end(host)
+                            else:
+                                del pending[host]
+
+                if not running:
+                    # Nothing of ours in flight: wait for a host delay to expire
+                    # (or poll while other users of the scheduler hold the caps)
+                    await asyncio.sleep(next_wake if next_wake is not None else 0.1)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running, timeout=next_wake, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    url, host = running.pop(task)
+                    with self._lock:
+                        self._release(host)
+                        self._lock.notify_all()
+                    yield url, task.result()
+
+        finally:
+            for task, (url, host) in running.items():
+                task.cancel()
+                with self._lock:
+                    self._release(host)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Current in-flight counts, for logging."""
+        with self._lock:
+            return {
+                'active_total': self._active_total,
+                'active_hosts': {h: n for h, n in self._active.items() if n}
+            }
+
+
+# Global instance shared by the sync scraper
+polite_scheduler = PolitenessScheduler()
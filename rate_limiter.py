@@ -0,0 +1,84 @@
+"""
+Rate Limiting Utilities
+Thread-safe token bucket plus exponential backoff helpers for paid APIs
+(Gemini, SerpApi).
+"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate_per_minute` tokens refill continuously up
+    to `capacity`. `acquire` blocks until enough tokens are available.
+
+    Use one bucket for requests-per-minute (1 token per call) and another
+    for tokens-per-minute (estimated prompt tokens per call).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take `tokens` from the bucket, sleeping until they are available.
+
+        Requests larger than the bucket are clamped to its capacity so they
+        can still go through once the bucket is full.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.total_wait += waited
+                    return waited
+                shortfall = tokens - self._tokens
+            delay = shortfall / self.rate_per_second if self.rate_per_second else 1.0
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds: float):
+        """Empty the bucket for `seconds` (e.g. after the server returned 429)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate_per_second
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter: random in [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+# Exception class names / message fragments that mean "slow down and retry"
+_RETRYABLE_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+    'DeadlineExceeded', 'InternalServerError'
+}
+_RETRYABLE_MESSAGES = ('429', 'quota', 'rate limit', 'resource has been exhausted', '503')
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for quota / 429 / transient server errors worth retrying."""
+    if type(error).__name__ in _RETRYABLE_NAMES:
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in _RETRYABLE_MESSAGES)
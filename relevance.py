@@ -0,0 +1,275 @@
+"""
+Local Relevance Pre-Filter
+Scores job texts against the CV skills, job title and experience level
+with BM25 before anything is sent to Gemini, so obvious mismatches never
+cost an LLM call.
+"""
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Iterable, Optional
+
+
+# Jobs scoring below this (0-1) are not sent to the LLM
+DEFAULT_FLOOR = float(os.getenv("RELEVANCE_FLOOR", "0.15"))
+
+# IDF prior: before any job is seen, a query term is assumed to appear in
+# PRIOR_RATE of PRIOR_DOCUMENTS postings. Observed jobs are added to these
+# pseudo-counts, so a handful of streamed jobs cannot swing the weights.
+PRIOR_DOCUMENTS = 20
+PRIOR_RATE = 0.25
+
+COMMON_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'Go', 'Golang', 'C++', 'C#', 'Ruby', 'PHP',
+    'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring', 'Express',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'CI/CD',
+    'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
+    'Machine Learning', 'AI', 'Deep Learning', 'TensorFlow', 'PyTorch',
+    'REST API', 'GraphQL', 'Microservices', 'Git', 'Linux'
+]
+
+# Words that say little about fit when they appear in a job title
+_TITLE_STOPWORDS = {'and', 'or', 'the', 'a', 'an', 'of', 'for', 'in', 'at', 'to', 'with', '-', '/'}
+
+# Seniority words by years of experience
+LEVEL_KEYWORDS = {
+    'entry': ['junior', 'entry', 'graduate', 'fresher', 'intern', 'associate'],
+    'mid': ['engineer', 'developer', 'ii', 'mid'],
+    'senior': ['senior', 'lead', 'staff', 'principal', 'architect'],
+}
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens that keep skill spellings like c++, c#, node.js and ci/cd intact."""
+    return [t.rstrip('.') for t in re.findall(r'[a-z0-9][a-z0-9+#./]*', text.lower())]
+
+
+def extract_skills(text: str, limit: Optional[int] = 10) -> list:
+    """Skills from COMMON_SKILLS that appear in a CV (simple keyword extraction)."""
+    text_lower = text.lower()
+    return [skill for skill in COMMON_SKILLS if skill.lower() in text_lower][:limit]
+
+
+def years_of_experience(text: str) -> Optional[float]:
+    """First "N years" / "N+ years" figure in a CV, or None."""
+    match = re.search(r'(\d+(?:\.\d+)?)\+?\s*(?:years|yrs)', text, re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def level_for(years_experience: Optional[float]) -> Optional[str]:
+    if years_experience is None:
+        return None
+    if years_experience < 2:
+        return 'entry'
+    if years_experience < 5:
+        return 'mid'
+    return 'senior'
+
+
+class RelevanceScorer:
+    """
+    BM25 of a job text against a weighted query built from the candidate:
+    skills (weight 1.0), job-title words (1.5) and seniority words (0.5).
+
+    Corpus statistics (document frequencies, average length) are learned
+    from the jobs seen so far, so the scorer works on a stream. IDF is
+    smoothed with a prior and kept between a third of the prior IDF and
+    the prior IDF itself: a term never seen yet cannot outweigh the terms
+    a job does match, and a skill that appears in every posting of the
+    stream still counts. Scores are normalised to 0-1 against a job that
+    fully matches the `coverage` strongest query terms - no posting
+    mentions every skill on a CV.
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[str],
+        job_title: str = "",
+        years_experience: Optional[float] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        coverage: int = 8
+    ):
+        self.k1 = k1
+        self.b = b
+        self.coverage = coverage
+        self.query = {}  # term (tuple of tokens) -> weight
+        for skill in skills:
+            self._add_term(skill, 1.0)
+        for word in tokenize(job_title):
+            if word not in _TITLE_STOPWORDS:
+                self._add_term(word, 1.5)
+        for word in LEVEL_KEYWORDS.get(level_for(years_experience), []):
+            self._add_term(word, 0.5)
+
+        self.prior_idf = self._smoothed_idf(0, 0)
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.total_length = 0
+        self.document_frequency = Counter()
+
+    def _add_term(self, text: str, weight: float):
+        term = tuple(tokenize(text))
+        if term:
+            self.query[term] = max(weight, self.query.get(term, 0))
+
+    def _term_counts(self, tokens: list) -> Counter:
+        """Occurrences of each query term (multi-word skills matched as phrases)."""
+        counts = Counter()
+        unigrams = Counter(tokens)
+        for term in self.query:
+            if len(term) == 1:
+                if unigrams[term[0]]:
+                    counts[term] = unigrams[term[0]]
+            else:
+                n = len(term)
+                hits = sum(1 for i in range(len(tokens) - n + 1) if tuple(tokens[i:i + n]) == term)
+                if hits:
+                    counts[term] = hits
+        return counts
+
+    def observe(self, text: str) -> tuple:
+        """Add a document to the corpus statistics. Returns (term counts, length)."""
+        tokens = tokenize(text)
+        counts = self._term_counts(tokens)
+        with self._lock:
+            self.documents += 1
+            self.total_length += len(tokens)
+            self.document_frequency.update(counts.keys())
+        return counts, len(tokens)
+
+    @staticmethod
+    def _smoothed_idf(documents: int, frequency: int) -> float:
+        total = documents + PRIOR_DOCUMENTS
+        n = frequency + PRIOR_DOCUMENTS * PRIOR_RATE
+        return math.log(1 + (total - n + 0.5) / (n + 0.5))
+
+    def _idf(self, term) -> float:
+        idf = self._smoothed_idf(self.documents, self.document_frequency[term])
+        return min(max(idf, self.prior_idf / 3), self.prior_idf)
+
+    def score_counts(self, counts: Counter, length: int) -> float:
+        """Normalised BM25 (0-1) for a document already passed to observe()."""
+        if not self.query:
+            return 1.0
+        with self._lock:
+            average_length = self.total_length / self.documents if self.documents else max(length, 1)
+            idf = {term: self._idf(term) for term in self.query}
+
+        norm = self.k1 * (1 - self.b + self.b * length / max(average_length, 1))
+        score = sum(
+            weight * idf[term] * counts[term] * (self.k1 + 1) / (counts[term] + norm)
+            for term, weight in self.query.items() if counts[term]
+        )
+        ideal = sorted((weight * idf[term] * (self.k1 + 1) for term, weight in self.query.items()), reverse=True)
+        best = sum(ideal[:self.coverage])
+        return min(score / best, 1.0) if best else 0.0
+
+    def score(self, text: str) -> float:
+        """Observe and score one job text."""
+        counts, length = self.observe(text)
+        return self.score_counts(counts, length)
+
+    def rank(self, texts: list) -> list:
+        """
+        Score a whole batch with statistics from all of it.
+
+        Returns:
+            list: (index, score) pairs, best first
+        """
+        observed = [self.observe(text) for text in texts]
+        scores = [self.score_counts(counts, length) for counts, length in observed]
+        return sorted(enumerate(scores), key=lambda pair: pair[1], reverse=True)
+
+
+class RelevanceFilter:
+    """
+    Decides which jobs are worth an LLM call and counts the calls avoided.
+
+    Streaming callers use `allow(text)` (score floor only); batch callers
+    use `select(items)`, which also applies `top_k`.
+    """
+
+    def __init__(self, scorer: RelevanceScorer, floor: float = DEFAULT_FLOOR, top_k: Optional[int] = None):
+        self.scorer = scorer
+        self.floor = floor
+        self.top_k = top_k
+        self._lock = threading.Lock()
+        self.considered = 0
+        self.skipped = 0
+
+    def _count(self, considered: int, skipped: int):
+        with self._lock:
+            self.considered += considered
+            self.skipped += skipped
+
+    def allow(self, text: str) -> tuple:
+        """
+        Returns:
+            tuple: (send_to_llm: bool, relevance score 0-1)
+        """
+        score = self.scorer.score(text)
+        allowed = score >= self.floor
+        self._count(1, 0 if allowed else 1)
+        return allowed, score
+
+    def select(self, items: dict) -> tuple:
+        """
+        Keep the best jobs of a batch.
+
+        Args:
+            items (dict): key -> job text
+
+        Returns:
+            tuple: (kept {key: text} in rank order, {key: score} for every job)
+        """
+        keys = list(items)
+        ranked = self.scorer.rank([items[key] for key in keys])
+        scores = {keys[index]: score for index, score in ranked}
+        kept_keys = [keys[index] for index, score in ranked if score >= self.floor]
+        if self.top_k is not None:
+            kept_keys = kept_keys[:self.top_k]
+        self._count(len(keys), len(keys) - len(kept_keys))
+        return {key: items[key] for key in kept_keys}, scores
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'considered': self.considered,
+                'sent_to_llm': self.considered - self.skipped,
+                'llm_calls_avoided': self.skipped,
+                'floor': self.floor,
+                'top_k': self.top_k
+            }
+
+
+if __name__ == "__main__":
+    cv = open("sample_cv.txt", encoding="utf-8").read() if os.path.exists("sample_cv.txt") else "Python Django AWS Docker"
+    skills = extract_skills(cv, limit=None)
+    relevance = RelevanceFilter(RelevanceScorer(skills, "Backend Developer", years_of_experience(cv)))
+    jobs = {
+        'backend': "Backend Developer. Build REST APIs in Python and Django on AWS, deploy with Docker "
+                   "and Kubernetes. PostgreSQL and Redis experience preferred.",
+        'frontend': "Frontend Engineer. React, TypeScript and CSS. Build beautiful UIs with our design team.",
+        'sales': "Enterprise Account Executive. Own the sales pipeline, negotiate contracts, exceed quota.",
+    }
+    kept, scores = relevance.select(jobs)
+    print(f"Skills: {skills}, experience: {years_of_experience(cv)} years")
+    for key, score in sorted(scores.items(), key=lambda kv: -kv[1]):
+        print(f"  {key:10} {score:.2f} {'-> LLM' if key in kept else '(skipped)'}")
+    print(relevance.stats())
+
+    # Streaming: a clear match must still pass after many similar jobs raised its terms' frequencies
+    stream = RelevanceFilter(RelevanceScorer(skills, "Backend Developer", years_of_experience(cv)))
+    for _ in range(50):
+        stream.allow(jobs['backend'])
+    go_backend = ("Senior Software Engineer, Backend. We build our platform in Go on Kubernetes and AWS. "
+                  "You will design microservices and work with PostgreSQL.")
+    for text in (jobs['backend'], go_backend):
+        allowed, score = stream.allow(text)
+        assert allowed, f"clear match dropped in streaming mode (score {score:.3f})"
+    assert not stream.allow(jobs['sales'])[0], "unrelated job passed the floor"
+    print(f"🧪 Streaming check passed (floor {stream.floor})")
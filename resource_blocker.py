@@ -0,0 +1,162 @@
+"""
+Resource Blocker (Fast Mode)
+Aborts images, media, fonts and analytics/tracker requests while scraping.
+We only read document.body.innerText, so none of these change the text
+we extract - they just cost load time and bandwidth.
+"""
+
+import threading
+from urllib.parse import urlparse
+from typing import Iterable, Optional
+
+
+# Playwright resource types that never contribute to innerText.
+# Stylesheets are deliberately kept: CSS decides what is visible and
+# therefore what innerText returns.
+DEFAULT_BLOCKED_RESOURCE_TYPES = ['image', 'media', 'font']
+
+# Third-party analytics / ads / session-replay hosts (subdomains included)
+DEFAULT_BLOCKED_DOMAINS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'facebook.net',
+    'connect.facebook.net',
+    'hotjar.com',
+    'segment.com',
+    'segment.io',
+    'mixpanel.com',
+    'newrelic.com',
+    'nr-data.net',
+    'optimizely.com',
+    'clarity.ms',
+    'fullstory.com',
+    'quantserve.com',
+    'scorecardresearch.com',
+    'adsrvr.org',
+    'bat.bing.com',
+    'snap.licdn.com',
+]
+
+# Rough average transfer sizes used to estimate bandwidth saved, since an
+# aborted request never tells us its real size.
+ESTIMATED_BYTES_BY_TYPE = {
+    'image': 45_000,
+    'media': 400_000,
+    'font': 35_000,
+    'script': 30_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+class ResourceBlocker:
+    """
+    Decides which requests to abort and keeps running metrics.
+
+    One instance can be installed on many pages (sync or async); its
+    counters are shared and thread-safe.
+    """
+
+    def __init__(
+        self,
+        resource_types: Optional[Iterable[str]] = None,
+        domains: Optional[Iterable[str]] = None
+    ):
+        self.resource_types = set(
+            DEFAULT_BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types
+        )
+        self.domains = tuple(
+            d.lower().lstrip('.') for d in (DEFAULT_BLOCKED_DOMAINS if domains is None else domains)
+        )
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests_allowed = 0
+            self.requests_blocked = 0
+            self.blocked_by_reason = {}
+            self.estimated_bytes_saved = 0
+
+    def _blocked_domain(self, url: str) -> Optional[str]:
+        host = (urlparse(url).hostname or '').lower()
+        for domain in self.domains:
+            if host == domain or host.endswith('.' + domain):
+                return domain
+        return None
+
+    def block_reason(self, resource_type: str, url: str) -> Optional[str]:
+        """
+        Return why a request should be blocked, or None to let it through.
+
+        Args:
+            resource_type (str): Playwright request.resource_type
+            url (str): Request URL
+
+        Returns:
+            str: e.g. 'type:image' or 'domain:hotjar.com', or None
+        """
+        if resource_type in self.resource_types:
+            return f"type:{resource_type}"
+        domain = self._blocked_domain(url)
+        if domain:
+            return f"domain:{domain}"
+        return None
+
+    def _record(self, resource_type: str, reason: Optional[str]) -> bool:
+        with self._lock:
+            if reason is None:
+                self.requests_allowed += 1
+                return False
+            self.requests_blocked += 1
+            self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+            self.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(
+                resource_type, DEFAULT_ESTIMATED_BYTES
+            )
+            return True
+
+    def _should_abort(self, route) -> bool:
+        request = route.request
+        reason = self.block_reason(request.resource_type, request.url)
+        return self._record(request.resource_type, reason)
+
+    # Sync Playwright -------------------------------------------------
+    def handle_route(self, route):
+        if self._should_abort(route):
+            route.abort()
+        else:
+            route.continue_()
+
+    def install(self, page):
+        """Install request routing on a sync Playwright page or context."""
+        page.route("**/*", self.handle_route)
+
+    # Async Playwright ------------------------------------------------
+    async def handle_route_async(self, route):
+        if self._should_abort(route):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def install_async(self, page):
+        """Install request routing on an async Playwright page or context."""
+        await page.route("**/*", self.handle_route_async)
+
+    def stats(self) -> dict:
+        """Return blocking metrics for logging."""
+        with self._lock:
+            total = self.requests_allowed + self.requests_blocked
+            return {
+                'requests_total': total,
+                'requests_blocked': self.requests_blocked,
+                'blocked_pct': round(100 * self.requests_blocked / total, 1) if total else 0.0,
+                'estimated_kb_saved': round(self.estimated_bytes_saved / 1024),
+                'blocked_by_reason': dict(self.blocked_by_reason)
+            }
+
+
+# Global instance used by scraper fast mode
+resource_blocker = ResourceBlocker()
@@ -0,0 +1,75 @@
+"""
+Robots.txt Cache
+Persistent per-domain store of raw robots.txt responses, so restarting the
+CLI or the UI does not re-download robots.txt for every career site.
+"""
+
+from typing import Optional
+
+from disk_cache import DiskCache
+
+
+# robots.txt that was actually served (RFC 9309 allows caching for a day)
+ROBOTS_TTL = 24 * 3600
+# 404s, 5xx and unreachable hosts are retried sooner
+NEGATIVE_TTL = 3600
+
+
+def is_negative(status: Optional[int]) -> bool:
+    """True when there is no usable robots.txt body (missing, server error or unreachable)."""
+    return status is None or status >= 400 and status not in (401, 403)
+
+
+class RobotsCache(DiskCache):
+    """
+    Stores {status, body, etag, last_modified} per scheme://host.
+
+    `status` is None when the host could not be reached. Negative entries
+    get NEGATIVE_TTL instead of ROBOTS_TTL. Stale entries stay on disk so
+    their validators can be used for a conditional GET.
+    """
+
+    def __init__(self, ttl: float = ROBOTS_TTL, negative_ttl: float = NEGATIVE_TTL,
+                 max_entries: int = 5000, path: Optional[str] = None):
+        super().__init__('robots', default_ttl=ttl, max_entries=max_entries, path=path)
+        self.negative_ttl = negative_ttl
+        self.revalidated = 0
+
+    def store(
+        self,
+        domain: str,
+        status: Optional[int],
+        body: str = '',
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> dict:
+        """Cache one robots.txt response. Returns the stored record."""
+        record = {'status': status, 'body': body, 'etag': etag, 'last_modified': last_modified}
+        self.set(domain, record, ttl=self.negative_ttl if is_negative(status) else None)
+        return record
+
+    def lookup(self, domain: str) -> Optional[dict]:
+        """
+        Look up a domain.
+
+        Returns:
+            dict: record + 'stale' flag, or None if the domain was never fetched
+        """
+        entry = self.get_entry(domain, allow_stale=True)
+        if entry is None:
+            return None
+        return dict(entry['value'], stale=entry['stale'])
+
+    def revalidate(self, domain: str, record: dict):
+        """Extend an entry after a 304 Not Modified."""
+        self.refresh(domain, ttl=self.negative_ttl if is_negative(record.get('status')) else None)
+        self.revalidated += 1
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats['revalidated'] = self.revalidated
+        return stats
+
+
+# Global instance used by the robots checker
+robots_cache = RobotsCache()
@@ -3,24 +3,141 @@ Robots.txt Compliance Checker
 Ensures we respect website robots.txt rules to avoid IP bans and legal issues.
 """
 
-import urllib.robotparser
-import urllib.parse
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urlparse
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Iterable, Optional
 import time
 
+from robots_cache import robots_cache
+from robots_rules import RobotsRules
+
 class RobotsChecker:
     """
     Checks if a URL can be scraped according to robots.txt rules.
-    Caches robots.txt to avoid repeated requests.
+    Caches robots.txt to avoid repeated requests: parsed rules in memory,
+    raw responses on disk (see robots_cache.py) so they survive restarts.
+    
+    Safe to call from many threads (and, via the *_async methods, from
+    asyncio): concurrent misses for the same domain share one in-flight
+    download instead of each fetching robots.txt.
     """
     
-    def __init__(self, user_agent="Mozilla/5.0 (compatible; JobBot/1.0)"):
+    def __init__(self, user_agent="Mozilla/5.0 (compatible; JobBot/1.0)", timeout=(5, 10), pool_size=16,
+                 disk_cache=robots_cache):
         self.user_agent = user_agent
-        self.cache = {}  # Cache robots.txt parsers by domain
+        self.cache = {}  # Cache compiled robots.txt rules by domain
         self.cache_timeout = 3600  # 1 hour cache
         self.cache_timestamps = {}
+        self.disk_cache = disk_cache  # Raw responses, kept across restarts
+        self.timeout = timeout  # (connect, read) seconds
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = user_agent
+        
+        self._lock = threading.Lock()
+        self._in_flight = {}  # domain -> Future of the parser being downloaded
+        self.fetches = 0
+        self.coalesced = 0
+    
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """scheme://host for a URL (bare hosts are treated as https)."""
+        parsed = urlparse(url if '//' in url else f"https://{url}")
+        return f"{parsed.scheme}://{parsed.netloc}"
+    
+    def _download(self, domain: str, cached: Optional[dict] = None) -> dict:
+        """
+        Fetch robots.txt with the pooled session, conditionally when a cached
+        copy has validators. Returns the record to store (status None = unreachable).
+        """
+        robots_url = f"{domain}/robots.txt"
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        print(f"📋 Checking robots.txt: {robots_url}{' (revalidating)' if headers else ''}")
+        
+        try:
+            response = self.session.get(robots_url, timeout=self.timeout, headers=headers or None)
+        except requests.RequestException as e:
+            # If robots.txt can't be read, allow by default
+            print(f"   ⚠️  Could not read robots.txt: {e}")
+            return self.disk_cache.store(domain, None)
+        
+        if response.status_code == 304 and cached:
+            self.disk_cache.revalidate(domain, cached)
+            return cached
+        
+        if response.status_code >= 500:
+            print(f"   ⚠️  Could not read robots.txt: HTTP {response.status_code} (disallowing for now)")
+        body = response.text if response.status_code < 400 else ''
+        return self.disk_cache.store(
+            domain,
+            response.status_code,
+            body,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+    
+    def _parser_from_record(self, domain: str, record: dict) -> Optional[RobotsRules]:
+        """Compile a cached response into rules (None = unreachable, allow)."""
+        status = record.get('status')
+        if status is None:
+            return None
+        
+        # RFC 9309: a server error means full disallow (cached for NEGATIVE_TTL);
+        # 401/403 as RobotFileParser.read()
+        if status >= 500 or status in (401, 403):
+            return RobotsRules.everything_disallowed()
+        if status >= 400:
+            return RobotsRules.everything_allowed()
+        return RobotsRules(record.get('body', ''), self.user_agent)
+    
+    def _load(self, domain: str) -> Optional[RobotsRules]:
+        """Parser from the disk cache, (re)downloading only when the entry is missing or stale."""
+        cached = self.disk_cache.lookup(domain)
+        if cached is not None and not cached['stale']:
+            return self._parser_from_record(domain, cached)
+        return self._parser_from_record(domain, self._download(domain, cached))
+    
+    def _get_parser(self, domain: str) -> Optional[RobotsRules]:
+        """Cached parser for a domain, downloading it once even under concurrency."""
+        with self._lock:
+            if domain in self.cache and time.time() - self.cache_timestamps.get(domain, 0) < self.cache_timeout:
+                return self.cache[domain]
+            
+            future = self._in_flight.get(domain)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[domain] = future
+                self.fetches += 1
+            else:
+                self.coalesced += 1
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            rp = self._load(domain)
+        except Exception as e:
+            print(f"   ⚠️  Could not read robots.txt: {e}")
+            rp = None
+        
+        with self._lock:
+            self.cache[domain] = rp
+            self.cache_timestamps[domain] = time.time()
+            del self._in_flight[domain]
+        future.set_result(rp)
+        return rp
     
     def can_fetch(self, url: str) -> tuple[bool, str]:
         """
@@ -28,87 +145,87 @@ class RobotsChecker:
         
         Args:
             url (str): The URL to check
-            
+        
         Returns:
             tuple: (can_fetch: bool, reason: str)
         """
         try:
-            parsed = urlparse(url)
-            domain = f"{parsed.scheme}://{parsed.netloc}"
-            robots_url = f"{domain}/robots.txt"
-            
-            # Check cache
-            current_time = time.time()
-            if domain in self.cache:
-                if current_time - self.cache_timestamps.get(domain, 0) < self.cache_timeout:
-                    rp = self.cache[domain]
-                    if rp is None:
-                        # Previously failed to fetch robots.txt - allow by default
-                        return True, "No robots.txt found (allowed by default)"
-                    
-                    if rp.can_fetch(self.user_agent, url):
-                        return True, "✅ Allowed by robots.txt"
-                    else:
-                        return False, "❌ Blocked by robots.txt"
-            
-            # Fetch and parse robots.txt
-            print(f"📋 Checking robots.txt: {robots_url}")
+            rp = self._get_parser(self.domain_of(url))
+            if rp is None:
+                # Previously failed to fetch robots.txt - allow by default
+                return True, "No robots.txt found (allowed by default)"
             
-            rp = urllib.robotparser.RobotFileParser()
-            rp.set_url(robots_url)
+            if rp.can_fetch(url):
+                return True, "✅ Allowed by robots.txt"
             
-            try:
-                rp.read()
-                self.cache[domain] = rp
-                self.cache_timestamps[domain] = current_time
-                
-                if rp.can_fetch(self.user_agent, url):
-                    return True, "✅ Allowed by robots.txt"
-                else:
-                    # Check crawl delay
-                    crawl_delay = rp.crawl_delay(self.user_agent)
-                    if crawl_delay:
-                        return False, f"❌ Blocked by robots.txt (crawl-delay: {crawl_delay}s)"
-                    return False, "❌ Blocked by robots.txt"
-                    
-            except Exception as e:
-                # If robots.txt doesn't exist or can't be read, allow by default
-                print(f"   ⚠️  Could not read robots.txt: {e}")
-                self.cache[domain] = None
-                self.cache_timestamps[domain] = current_time
-                return True, "No robots.txt found (allowed by default)"
-                
+            # Check crawl delay
+            crawl_delay = rp.crawl_delay
+            if crawl_delay:
+                return False, f"❌ Blocked by robots.txt (crawl-delay: {crawl_delay}s)"
+            return False, "❌ Blocked by robots.txt"
+        
         except Exception as e:
             print(f"⚠️  Error checking robots.txt: {e}")
             return True, f"Error checking robots.txt (proceeding cautiously)"
     
+    async def can_fetch_async(self, url: str) -> tuple[bool, str]:
+        """`can_fetch` for asyncio code; the download runs off the event loop."""
+        return await asyncio.to_thread(self.can_fetch, url)
+    
+    def prefetch(self, urls_or_domains: Iterable[str], max_workers: int = 8) -> int:
+        """
+        Warm the cache for many domains in parallel before scraping starts.
+        
+        Args:
+            urls_or_domains (iterable): Page URLs or bare domains
+            max_workers (int): Parallel downloads
+        
+        Returns:
+            int: Number of distinct domains warmed
+        """
+        domains = list(dict.fromkeys(self.domain_of(u) for u in urls_or_domains if u))
+        if not domains:
+            return 0
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="robots") as pool:
+            list(pool.map(self._get_parser, domains))
+        return len(domains)
+    
+    async def prefetch_async(self, urls_or_domains: Iterable[str], max_workers: int = 8) -> int:
+        """`prefetch` for asyncio code."""
+        return await asyncio.to_thread(self.prefetch, list(urls_or_domains), max_workers)
+    
     def get_crawl_delay(self, url: str) -> Optional[float]:
         """
         Get the crawl delay specified in robots.txt for this domain.
         
         Args:
             url (str): The URL to check
-            
+        
         Returns:
             float: Crawl delay in seconds, or None if not specified
         """
         try:
-            parsed = urlparse(url)
-            domain = f"{parsed.scheme}://{parsed.netloc}"
+            with self._lock:
+                rp = self.cache.get(self.domain_of(url))
             
-            if domain in self.cache and self.cache[domain] is not None:
-                rp = self.cache[domain]
-                return rp.crawl_delay(self.user_agent)
+            if rp is not None:
+                return rp.crawl_delay
             
             return None
-            
+        
         except Exception:
             return None
     
+    def stats(self) -> dict:
+        """Downloads made vs. concurrent checks that waited on one already in flight."""
+        with self._lock:
+            return {'domains': len(self.cache), 'fetches': self.fetches, 'coalesced': self.coalesced}
+    
     def clear_cache(self):
         """Clear the robots.txt cache."""
-        self.cache.clear()
-        self.cache_timestamps.clear()
+        with self._lock:
+            self.cache.clear()
+            self.cache_timestamps.clear()
 
 
 # Global instance for easy access
@@ -121,7 +238,7 @@ def is_url_scrapable(url: str) -> tuple[bool, str]:
     
     Args:
         url (str): The URL to check
-        
+    
     Returns:
         tuple: (allowed: bool, reason: str)
     """
@@ -139,8 +256,10 @@ if __name__ == "__main__":
     
     print("🧪 Testing Robots.txt Checker\n")
     
+    robots_checker.prefetch(test_urls)
     for url in test_urls:
         allowed, reason = is_url_scrapable(url)
         status = "✅ ALLOWED" if allowed else "❌ BLOCKED"
         print(f"{status}: {url}")
         print(f"   Reason: {reason}\n")
+    print(f"📊 {robots_checker.stats()}")
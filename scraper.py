@@ -2,33 +2,56 @@
 Stealth Web Scraper Module
 Uses Playwright with stealth techniques to scrape job postings undetectably.
 NOW INCLUDES ROBOTS.TXT COMPLIANCE CHECK!
+Pages are served from a persistent browser pool (see browser_pool.py).
 """
 
 import time
 import random
-from playwright.sync_api import sync_playwright
-from playwright_stealth import stealth_sync
-from robots_checker import is_url_scrapable, robots_checker
+from browser_pool import get_browser_pool
+from robots_checker import is_url_scrapable
+from politeness import polite_scheduler
+from resource_blocker import resource_blocker
+from http_fetcher import http_fetcher, MIN_CONTENT_LENGTH
+from page_cache import page_cache
 
 
-def get_page_content(url, respect_robots=True):
+def get_page_content(url, respect_robots=True, fast_mode=False, http_first=False, use_cache=True):
     """
     Visits a URL in stealth mode and returns the text content.
     
+    Pages already in the on-disk page cache are returned without any
+    network request; stale entries are revalidated with a conditional GET
+    once robots.txt allows the URL.
+    
     This function mimics human behavior to avoid detection:
+    - Reuses a warm browser from the pool instead of launching Chromium per URL
     - Uses realistic Chrome user agent
     - Disables automation flags
     - Implements random delays
+    - Spaces requests per host via the politeness scheduler (robots.txt crawl-delay)
     - Simulates mouse movements and scrolling
     - CHECKS ROBOTS.TXT BEFORE SCRAPING (if respect_robots=True)
+    - Optionally skips images/media/fonts/trackers (if fast_mode=True)
+    - Optionally tries a plain HTTP fetch first and only launches the
+      browser when the page looks JS-rendered (if http_first=True)
     
     Args:
         url (str): The URL to scrape
         respect_robots (bool): Whether to check robots.txt compliance
+        fast_mode (bool): Abort requests that cannot affect the page text
+        http_first (bool): Try the pooled HTTP tier before Playwright
+        use_cache (bool): Consult and fill the persistent page cache
         
     Returns:
         str: The extracted text content, or None if scraping fails or blocked
     """
+    # Previously scraped pages need no browser at all
+    if use_cache:
+        cached = page_cache.lookup_text(url)
+        if cached:
+            print(f"📦 Page cache hit: {url} ({len(cached)} characters)")
+            return cached
+    
     # Check robots.txt compliance first
     if respect_robots:
         allowed, reason = is_url_scrapable(url)
@@ -37,55 +60,34 @@ def get_page_content(url, respect_robots=True):
         if not allowed:
             print(f"⛔ Skipping {url} - Blocked by robots.txt")
             return None
-        
-        # Respect crawl delay if specified
-        crawl_delay = robots_checker.get_crawl_delay(url)
-        if crawl_delay:
-            print(f"   ⏱️  Respecting crawl-delay: {crawl_delay}s")
-            time.sleep(crawl_delay)
     
+    # A stale cached page may only need a conditional GET
+    if use_cache:
+        revalidated = page_cache.revalidate(url, slot=polite_scheduler.slot)
+        if revalidated:
+            return revalidated
+    
+    # Tier 1: plain HTTP for server-rendered pages
+    if http_first:
+        with polite_scheduler.slot(url):
+            result = http_fetcher.fetch_page(url)
+        if result:
+            content = result['text']
+            http_fetcher.record_tier('http')
+            print(f"✅ Fetched {len(content)} characters over HTTP (browser not needed)")
+            if use_cache:
+                page_cache.store(url, content, 'http', result['etag'], result['last_modified'])
+            return content
+    
+    # Tier 2: full stealth browser
+    http_fetcher.record_tier('browser')
     print(f"🕵️  Stealth visiting: {url}")
     
-    with sync_playwright() as p:
-        # Launch browser with anti-detection settings
-        browser = p.chromium.launch(
-            headless=True,  # Set to False to watch the browser in action
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process'
-            ]
-        )
-        
-        # Create context with realistic browser fingerprint
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080},
-            locale='en-US',
-            timezone_id='America/New_York',
-            permissions=['geolocation'],
-            geolocation={'latitude': 28.6139, 'longitude': 77.2090},  # Delhi coordinates
-            color_scheme='light'
-        )
-        
-        # Add realistic headers
-        context.set_extra_http_headers({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+    # Wait only for this host's crawl-delay, then borrow a warm browser page
+    with polite_scheduler.slot(url), get_browser_pool().page() as page:
+        if fast_mode:
+            resource_blocker.install(page)
         
-        page = context.new_page()
-        
-        # Apply stealth techniques to hide automation
-        stealth_sync(page)
-
         try:
             # Navigate with realistic timeout
             page.goto(url, timeout=30000, wait_until="domcontentloaded")
@@ -106,14 +108,17 @@ def get_page_content(url, respect_robots=True):
             content = page.evaluate("document.body.innerText")
             
             print(f"✅ Successfully scraped {len(content)} characters")
+            if use_cache and len(content) >= MIN_CONTENT_LENGTH:
+                page_cache.store(url, content, 'browser')
+            if fast_mode:
+                stats = resource_blocker.stats()
+                print(f"   ⚡ Fast mode: {stats['requests_blocked']}/{stats['requests_total']} requests blocked "
+                      f"(~{stats['estimated_kb_saved']} KB saved so far)")
             return content
             
         except Exception as e:
             print(f"❌ Error scraping {url}: {e}")
             return None
-            
-        finally:
-            browser.close()
 
 
 def get_page_html(url):
@@ -129,20 +134,7 @@ def get_page_html(url):
     """
     print(f"🕵️  Stealth visiting (HTML mode): {url}")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
-        )
-        
-        page = context.new_page()
-        stealth_sync(page)
-
+    with polite_scheduler.slot(url), get_browser_pool().page() as page:
         try:
             page.goto(url, timeout=30000, wait_until="domcontentloaded")
             time.sleep(random.uniform(2, 4))
@@ -154,9 +146,6 @@ def get_page_html(url):
         except Exception as e:
             print(f"❌ Error scraping {url}: {e}")
             return None
-            
-        finally:
-            browser.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,291 @@
+"""
+Semantic Match Index
+Local CV-to-job similarity with hashed n-gram embeddings in a NumPy
+matrix. Scoring every pending job against the profile is one matrix-vector
+product, so the index works as a pre-ranker before Gemini and as an
+offline fallback scorer when the Gemini quota is exhausted.
+
+NumPy and the saved index are loaded on first use, so importing this
+module keeps CLI/UI startup fast.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import Counter
+from typing import Iterable, Optional
+
+from disk_cache import CACHE_DIR
+
+
+DEFAULT_DIM = 4096
+INDEX_FILE = os.path.join(CACHE_DIR, "semantic_index.npz")
+
+# Cosine similarities between a CV and a job posting rarely leave this
+# range; it is stretched to a 0-100 match score for the offline fallback
+SIMILARITY_FLOOR = 0.05
+SIMILARITY_CEILING = 0.45
+
+
+def text_fingerprint(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _features(text: str) -> Counter:
+    """Word unigrams, word bigrams and (at half weight) character trigrams."""
+    words = re.findall(r'[a-z0-9][a-z0-9+#.]*', text.lower())
+    features = Counter()
+    features.update(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in set(words):
+        padded = f"<{word}>"
+        for i in range(len(padded) - 2):
+            features[f"#{padded[i:i + 3]}"] += 0.5
+    return features
+
+
+def embed(text: str, dim: int = DEFAULT_DIM) -> "numpy.ndarray":
+    """
+    Hashed n-gram embedding (L2-normalised, float32).
+
+    Each feature lands in one of `dim` buckets with a hash-derived sign, so
+    collisions cancel out on average; counts are log-scaled so one repeated
+    word cannot dominate a posting.
+    """
+    import numpy as np
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, count in _features(text).items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+        vector[h % dim] += (1.0 if h >> 63 else -1.0) * np.log1p(count)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def similarity_to_score(similarity: float) -> int:
+    """Map a cosine similarity onto the 0-100 scale used by analyze_job."""
+    scaled = (similarity - SIMILARITY_FLOOR) / (SIMILARITY_CEILING - SIMILARITY_FLOOR)
+    return int(round(100 * min(max(scaled, 0.0), 1.0)))
+
+
+class SemanticIndex:
+    """
+    Job embeddings keyed by caller ids, plus one profile embedding.
+
+    Rows live in a preallocated matrix that doubles when full, so adds are
+    amortised O(1). A job re-added with the same text is not re-embedded.
+    `save()` writes everything to an .npz file that is loaded again on
+    first use. Safe to share between threads.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM, path: Optional[str] = INDEX_FILE):
+        self.dim = dim
+        self.path = path
+        self._lock = threading.Lock()
+        self.keys = []
+        self.rows = {}          # key -> row in matrix
+        self.fingerprints = []  # per row, text_fingerprint of the embedded text
+        self.matrix = None      # allocated (or loaded from `path`) on first use
+        self.profile = None
+        self.profile_fingerprint = None
+        self.embedded = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        self._ready()
+        return len(self.keys)
+
+    def __contains__(self, key) -> bool:
+        self._ready()
+        return str(key) in self.rows
+
+    def _ready(self):
+        """Import NumPy and load the saved index the first time the index is used."""
+        if self.matrix is not None:
+            return
+        import numpy as np
+
+        with self._lock:
+            if self.matrix is not None:
+                return
+            matrix = None
+            if self.path and os.path.exists(self.path):
+                matrix = self._load(self.path)
+            self.matrix = matrix if matrix is not None else np.zeros((64, self.dim), dtype=np.float32)
+
+    def _load(self, path: str):
+        """Read a saved index into self. Returns its matrix, or None if it was built with another dimension."""
+        import numpy as np
+
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['dim']) != self.dim:
+                return None  # start over
+            self.keys = [str(key) for key in data['keys']]
+            self.fingerprints = [str(fp) for fp in data['fingerprints']]
+            self.rows = {key: row for row, key in enumerate(self.keys)}
+            matrix = np.zeros((max(64, 2 * len(self.keys)), self.dim), dtype=np.float32)
+            matrix[:len(self.keys)] = data['matrix']
+            if data['profile'].size:
+                self.profile = data['profile']
+                self.profile_fingerprint = str(data['profile_fingerprint'])
+            return matrix
+
+    def save(self, path: Optional[str] = None):
+        """Write the index to disk (atomically, via a temporary file); a no-op if it was never used."""
+        path = path or self.path
+        if not path or self.matrix is None:
+            return
+        import numpy as np
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            count = len(self.keys)
+            tmp_path = f"{path}.tmp.npz"
+            np.savez_compressed(
+                tmp_path,
+                dim=self.dim,
+                keys=np.array(self.keys, dtype=str),
+                fingerprints=np.array(self.fingerprints, dtype=str),
+                matrix=self.matrix[:count],
+                profile=self.profile if self.profile is not None else np.zeros(0, dtype=np.float32),
+                profile_fingerprint=self.profile_fingerprint or ''
+            )
+        os.replace(tmp_path, path)
+
+    def set_profile(self, text: str):
+        """Embed the CV/profile, unless this exact text is already embedded."""
+        self._ready()
+        fingerprint = text_fingerprint(text)
+        if fingerprint != self.profile_fingerprint:
+            self.profile = embed(text, self.dim)
+            self.profile_fingerprint = fingerprint
+
+    def add(self, key, text: str):
+        """Add or update one job text."""
+        import numpy as np
+
+        self._ready()
+        key = str(key)
+        fingerprint = text_fingerprint(text)
+        with self._lock:
+            row = self.rows.get(key)
+            if row is not None and self.fingerprints[row] == fingerprint:
+                self.reused += 1
+                return
+        vector = embed(text, self.dim)  # outside the lock: the slow part
+
+        with self._lock:
+            row = self.rows.get(key)
+            if row is None:
+                row = len(self.keys)
+                if row == len(self.matrix):
+                    grown = np.zeros((2 * len(self.matrix), self.dim), dtype=np.float32)
+                    grown[:row] = self.matrix
+                    self.matrix = grown
+                self.keys.append(key)
+                self.fingerprints.append(fingerprint)
+                self.rows[key] = row
+            else:
+                self.fingerprints[row] = fingerprint
+            self.matrix[row] = vector
+            self.embedded += 1
+
+    def add_many(self, items: Iterable[tuple]):
+        """Add (key, text) pairs."""
+        for key, text in items:
+            self.add(key, text)
+
+    def similarities(self, keys: Optional[Iterable] = None) -> dict:
+        """
+        Cosine similarity of jobs to the profile (all jobs, or just `keys`).
+
+        Returns:
+            dict: key -> similarity
+        """
+        import numpy as np
+
+        self._ready()
+        if self.profile is None:
+            raise ValueError("No profile set; call set_profile() first")
+        with self._lock:
+            if keys is None:
+                selected = list(self.keys)
+                rows = np.arange(len(selected))
+            else:
+                selected = [str(key) for key in keys if str(key) in self.rows]
+                rows = np.array([self.rows[key] for key in selected], dtype=np.intp)
+            scores = self.matrix[rows] @ self.profile
+        return dict(zip(selected, scores.tolist()))
+
+    def rank(self, keys: Optional[Iterable] = None, top_k: Optional[int] = None) -> list:
+        """
+        Returns:
+            list: (key, similarity) pairs, most similar first
+        """
+        ranked = sorted(self.similarities(keys).items(), key=lambda pair: pair[1], reverse=True)
+        return ranked[:top_k] if top_k is not None else ranked
+
+    def score(self, text: str) -> float:
+        """Similarity of one text to the profile, without adding it to the index."""
+        self._ready()
+        if self.profile is None:
+            raise ValueError("No profile set; call set_profile() first")
+        return float(embed(text, self.dim) @ self.profile)
+
+    def offline_analysis(self, job_text: str) -> dict:
+        """
+        Stand-in for analyze_job when Gemini cannot be reached.
+
+        Returns:
+            dict: match_score, reason, apply_link - with offline=True
+        """
+        similarity = self.score(job_text)
+        return {
+            "match_score": similarity_to_score(similarity),
+            "reason": f"Offline estimate from profile similarity ({similarity:.2f}); AI analysis unavailable",
+            "apply_link": None,
+            "offline": True
+        }
+
+    def stats(self) -> dict:
+        self._ready()
+        with self._lock:
+            return {
+                'jobs': len(self.keys),
+                'embedded': self.embedded,
+                'reused': self.reused,
+                'dim': self.dim,
+                'mb_in_memory': round(self.matrix.nbytes / 1e6, 1)
+            }
+
+
+# Global instance shared by the CLI and the UI
+semantic_index = SemanticIndex()
+
+
+if __name__ == "__main__":
+    import time
+
+    cv = open("sample_cv.txt", encoding="utf-8").read() if os.path.exists("sample_cv.txt") else "Python Django AWS Docker"
+    index = SemanticIndex(path=None)
+    index.set_profile(cv)
+
+    jobs = {
+        'backend': "Backend Developer. Build REST APIs in Python and Django on AWS, deploy with Docker "
+                   "and Kubernetes. PostgreSQL and Redis experience preferred.",
+        'golang': "Senior Go Engineer to build microservices on Kubernetes with PostgreSQL.",
+        'frontend': "Frontend Engineer. React, TypeScript and CSS. Build beautiful UIs with our design team.",
+        'sales': "Enterprise Account Executive. Own the sales pipeline, negotiate contracts, exceed quota.",
+    }
+    index.add_many(jobs.items())
+    for key, similarity in index.rank():
+        print(f"  {key:10} similarity {similarity:.3f} -> offline score {similarity_to_score(similarity)}")
+
+    # One matrix-vector product over many pending jobs
+    filler = list(jobs.values())
+    for i in range(2000):
+        index.add(f"job-{i}", f"{filler[i % len(filler)]} Team {i}.")
+    started = time.perf_counter()
+    ranked = index.rank(top_k=5)
+    print(f"⚡ Ranked {len(index)} jobs in {(time.perf_counter() - started) * 1000:.1f} ms; {index.stats()}")
@@ -0,0 +1,324 @@
+"""
+SerpApi Response Cache
+Persistent cache of SerpApi results keyed by the canonical query params,
+with stale-while-revalidate and a daily quota budget so repeated searches
+do not burn paid credits.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional, Union
+
+from disk_cache import DiskCache
+from rate_limiter import TokenBucket
+
+
+# Shared SerpApi throttle for every search in this process. The default
+# (30/min, bursts of 5) matches the old fixed 2 s spacing; raise it in .env
+# to match your plan's throughput.
+serpapi_limiter = TokenBucket(
+    rate_per_minute=float(os.getenv("SERPAPI_RATE_PER_MINUTE", "30")),
+    capacity=float(os.getenv("SERPAPI_BURST", "5"))
+)
+
+# Fresh results are served for this long, then refreshed in the background
+DEFAULT_TTL_HOURS = float(os.getenv("SERPAPI_CACHE_TTL_HOURS", "12"))
+# Stale results older than this are never served
+MAX_STALE_HOURS = float(os.getenv("SERPAPI_MAX_STALE_HOURS", "72"))
+# Paid calls allowed per calendar day (0 = no budget, the default; opt in via .env)
+DAILY_QUOTA = int(os.getenv("SERPAPI_DAILY_QUOTA", "0"))
+# Warn once this fraction of the daily budget has been used
+QUOTA_WARN_FRACTION = 0.9
+
+# Params that do not change the result set
+_IGNORED_PARAMS = {'api_key', 'output', 'async', 'no_cache'}
+
+
+class SerpApiQuotaExceeded(Exception):
+    """Raised when the daily SerpApi budget is spent and no cached result exists."""
+
+
+def _is_empty_result(results: dict) -> bool:
+    """True for the 'no results' error: a completed search SerpApi still bills."""
+    return "hasn't returned any results" in str(results.get('error', ''))
+
+
+def canonical_params(params: dict) -> str:
+    """
+    Canonical form of a query: api_key and empty values dropped, keys
+    sorted, values stripped, so equivalent queries share a cache entry.
+    """
+    cleaned = {
+        key: str(value).strip()
+        for key, value in params.items()
+        if key not in _IGNORED_PARAMS and value is not None and str(value).strip() != ''
+    }
+    return json.dumps(cleaned, sort_keys=True, ensure_ascii=False)
+
+
+class SerpApiCache(DiskCache):
+    """
+    Caches SerpApi `get_dict()` responses.
+
+    - Fresh hit: returned directly, no API call.
+    - Stale hit (younger than `max_stale`): returned immediately while one
+      background call refreshes the entry.
+    - Miss: goes to SerpApi through `serpapi_limiter`, counted against the
+      daily quota.
+
+    When the daily budget is spent, stale entries of any age are served and
+    uncached queries raise SerpApiQuotaExceeded instead of spending money.
+    Responses carrying an `error` key are never cached.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL_HOURS * 3600,
+        max_stale: float = MAX_STALE_HOURS * 3600,
+        daily_quota: int = DAILY_QUOTA,
+        max_entries: int = 2000,
+        path: Optional[str] = None
+    ):
+        super().__init__('serpapi', default_ttl=ttl, max_entries=max_entries, path=path)
+        # Kept apart so quota bookkeeping does not skew the hit/miss counters
+        self._quota = DiskCache(
+            'serpapi_quota',
+            default_ttl=2 * 24 * 3600,
+            path=':memory:' if path == ':memory:' else None
+        )
+        self.max_stale = max_stale
+        self.daily_quota = daily_quota
+        self.calls_made = 0
+        self.calls_saved = 0
+        self.background_refreshes = 0
+        self._quota_lock = threading.Lock()
+        self._refreshing = set()
+        self._warned_quota = False
+
+    @staticmethod
+    def key_for(params: dict) -> str:
+        return hashlib.sha256(canonical_params(params).encode('utf-8')).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Daily quota
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _quota_key() -> str:
+        return f"__quota__:{time.strftime('%Y-%m-%d')}"
+
+    def quota_used(self) -> int:
+        """Paid calls made today (persisted across runs)."""
+        return self._quota.get(self._quota_key(), 0)
+
+    def quota_remaining(self) -> Optional[int]:
+        """Calls left in today's budget, or None when no budget is set."""
+        if not self.daily_quota:
+            return None
+        return max(0, self.daily_quota - self.quota_used())
+
+    def _reserve_call(self, log) -> Optional[str]:
+        """
+        Count one paid call against today's budget.
+
+        Returns:
+            str: The quota key the call was counted under (for _refund_call),
+                 or None if the budget is spent
+        """
+        with self._quota_lock:
+            quota_key = self._quota_key()
+            used = self._quota.get(quota_key, 0)
+            if self.daily_quota and used >= self.daily_quota:
+                return None
+            self._quota.set(quota_key, used + 1)
+            if (self.daily_quota and not self._warned_quota
+                    and used + 1 >= self.daily_quota * QUOTA_WARN_FRACTION):
+                self._warned_quota = True
+                log(f"⚠️  SerpApi quota: {used + 1}/{self.daily_quota} calls used today", "WARN")
+            return quota_key
+
+    def _refund_call(self, quota_key: str):
+        """Give back a reserved call that failed before SerpApi could bill it."""
+        with self._quota_lock:
+            used = self._quota.get(quota_key, 0)
+            if used > 0:
+                self._quota.set(quota_key, used - 1)
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+    def _call_api(self, key: str, params: dict, ttl: Optional[float], log, quota_key: str) -> dict:
+        try:
+            waited = serpapi_limiter.acquire()
+            if waited >= 1:
+                log(f"  Waited {waited:.1f}s for SerpApi rate limit")
+
+            from serpapi import GoogleSearch  # only needed on a cache miss
+
+            results = GoogleSearch(params).get_dict()
+        except Exception:
+            self._refund_call(quota_key)  # network failure: nothing was billed
+            raise
+        with self._quota_lock:
+            self.calls_made += 1
+        if 'error' not in results:
+            self.set(key, results, ttl=ttl)
+        elif not _is_empty_result(results):
+            self._refund_call(quota_key)  # API error (bad key, plan limit, ...): not a billed search
+        return results
+
+    def _count_saved(self):
+        with self._quota_lock:
+            self.calls_saved += 1
+
+    def _refresh_in_background(self, key: str, params: dict, ttl: Optional[float], log):
+        with self._quota_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                quota_key = self._reserve_call(log)
+                if quota_key:
+                    self._call_api(key, params, ttl, log, quota_key)
+                    with self._quota_lock:
+                        self.background_refreshes += 1
+            except Exception as e:
+                log(f"SerpApi background refresh failed: {e}", "WARN")
+            finally:
+                with self._quota_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="serpapi-refresh", daemon=True).start()
+
+    def search(self, params: dict, ttl: Optional[float] = None, logger=None) -> dict:
+        """
+        Cached replacement for `GoogleSearch(params).get_dict()`.
+
+        Args:
+            params (dict): SerpApi params (api_key is ignored for the cache key)
+            ttl (float): Freshness in seconds for this query (default: cache TTL)
+            logger: Logger function (optional)
+
+        Returns:
+            dict: SerpApi response
+
+        Raises:
+            SerpApiQuotaExceeded: Daily budget spent and nothing cached
+        """
+        def log(msg, level="INFO"):
+            if logger:
+                logger(msg, level)
+            else:
+                print(f"[{level}] {msg}")
+
+        key = self.key_for(params)
+        entry = self.get_entry(key, allow_stale=True)
+
+        if entry is not None and not entry['stale']:
+            self._count_saved()
+            log("📦 SerpApi cache hit")
+            return entry['value']
+
+        if entry is not None and time.time() - entry['stored_at'] <= self.max_stale:
+            self._count_saved()
+            log("📦 SerpApi cache hit (stale, refreshing in background)")
+            self._refresh_in_background(key, params, ttl, log)
+            return entry['value']
+
+        quota_key = self._reserve_call(log)
+        if not quota_key:
+            if entry is not None:
+                self._count_saved()
+                log("⚠️  SerpApi daily quota reached - serving an old cached result", "WARN")
+                return entry['value']
+            raise SerpApiQuotaExceeded(
+                f"SerpApi daily quota of {self.daily_quota} calls reached "
+                f"(raise SERPAPI_DAILY_QUOTA in .env to continue)"
+            )
+
+        return self._call_api(key, params, ttl, log, quota_key)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update({
+            'calls_made': self.calls_made,
+            'calls_saved': self.calls_saved,
+            'background_refreshes': self.background_refreshes,
+            'quota_used': self.quota_used(),
+            'quota_limit': self.daily_quota
+        })
+        return stats
+
+
+# Global instance used by every SerpApi caller
+serpapi_cache = SerpApiCache()
+
+
+def cached_search(params: dict, ttl: Optional[float] = None, logger=None) -> dict:
+    """Shortcut for `serpapi_cache.search(...)`."""
+    return serpapi_cache.search(params, ttl=ttl, logger=logger)
+
+
+def next_page_token(results: dict) -> Optional[str]:
+    """Token for the following Google Jobs page, if there is one."""
+    return results.get("serpapi_pagination", {}).get("next_page_token")
+
+
+def iter_result_pages(
+    params: dict,
+    max_pages: int = 5,
+    prefetch: Union[bool, Callable[[dict], bool]] = False,
+    ttl: Optional[float] = None,
+    logger=None
+) -> Iterator[dict]:
+    """
+    Lazily walk Google Jobs result pages via `next_page_token`.
+
+    Each page goes through the cache. Stop iterating to stop paging. With
+    `prefetch`, the next page is requested in the background as soon as
+    its token is known, so it is usually ready by the time the caller has
+    finished with the current one - but a caller that stops early has
+    then paid a SerpApi call for nothing. Callers that stop based on page
+    content should pass a predicate instead: it gets the current page and
+    returns True only when that page cannot be enough, so the prefetch is
+    never wasted.
+
+    Args:
+        params (dict): SerpApi params for the first page
+        max_pages (int): Hard cap on pages requested
+        prefetch (bool or callable): Fetch page N+1 while page N is being
+            consumed - always, or only when prefetch(page N) is True
+        ttl (float): Cache freshness in seconds (default: cache TTL)
+        logger: Logger function (optional)
+
+    Yields:
+        dict: One SerpApi response per page
+    """
+    def fetch(page_params):
+        return serpapi_cache.search(page_params, ttl=ttl, logger=logger)
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serpapi-prefetch") if prefetch else None
+    try:
+        results = fetch(params)
+        page = 1
+        while True:
+            token = next_page_token(results)
+            has_next = bool(token) and page < max_pages
+            next_params = dict(params, next_page_token=token) if has_next else None
+            wanted = has_next and (prefetch(results) if callable(prefetch) else prefetch)
+            pending = pool.submit(fetch, next_params) if wanted else None
+
+            yield results
+
+            if not has_next:
+                return
+            results = pending.result() if pending else fetch(next_params)
+            page += 1
+    finally:
+        if pool:
+            pool.shutdown(wait=False)
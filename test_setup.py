@@ -145,6 +145,52 @@ except Exception as e:
     print("   → Run: playwright install chromium")
     sys.exit(1)
 
+# Test 8: Startup time (heavy SDKs must load lazily)
+print("\n8️⃣  Checking Startup Time...")
+import subprocess
+import time
+
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+CLI_HELP_BUDGET_MS = float(os.getenv("CLI_HELP_BUDGET_MS", "2000"))
+HEAVY_MODULES = ["gradio", "playwright", "serpapi", "google.generativeai", "numpy"]
+
+# -X importtime writes "import time: self [us] | cumulative | package" to stderr
+profile = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c",
+     "import sys, main, ui_app, robots_checker, companies; "
+     f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"],
+    capture_output=True, text=True
+)
+if profile.returncode != 0:
+    print(f"   ❌ Importing main/ui_app failed:\n{profile.stderr[-500:]}")
+    sys.exit(1)
+
+import_ms = {}
+for line in profile.stderr.splitlines():
+    parts = [p.strip() for p in line.split("|")]
+    if len(parts) == 3 and parts[2] in ("main", "ui_app") and parts[1].isdigit():
+        import_ms[parts[2]] = int(parts[1]) / 1000
+total_import_ms = sum(import_ms.values())
+
+eager = [m for m in profile.stdout.strip().split(",") if m]
+if eager:
+    print(f"   ❌ Imported eagerly at startup: {', '.join(eager)}")
+    sys.exit(1)
+print(f"   ✅ No heavy SDK imported at startup ({', '.join(HEAVY_MODULES)} load on first use)")
+
+if total_import_ms > IMPORT_BUDGET_MS:
+    print(f"   ❌ Import time {total_import_ms:.0f} ms exceeds budget of {IMPORT_BUDGET_MS:.0f} ms {import_ms}")
+    sys.exit(1)
+print(f"   ✅ Import time {total_import_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+
+started = time.perf_counter()
+subprocess.run([sys.executable, "main.py", "--help"], capture_output=True, check=True)
+help_ms = (time.perf_counter() - started) * 1000
+if help_ms > CLI_HELP_BUDGET_MS:
+    print(f"   ❌ 'python main.py --help' took {help_ms:.0f} ms (budget {CLI_HELP_BUDGET_MS:.0f} ms)")
+    sys.exit(1)
+print(f"   ✅ 'python main.py --help' in {help_ms:.0f} ms (budget {CLI_HELP_BUDGET_MS:.0f} ms)")
+
 # All tests passed!
 print("\n" + "="*60)
 print("✅ ALL TESTS PASSED!")
@@ -0,0 +1,298 @@
+"""
+Job Text Condenser
+Turns the full innerText of a career page into a compact job description
+for the AI prompt: drops cookie banners, menus and footers (including
+lines that repeat across pages of the same site), removes repeated blocks,
+and fills a token budget with the requirements and responsibilities first
+instead of blindly keeping the first N characters.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlparse
+
+from disk_cache import DiskCache
+
+
+# Prompt budget for one job's text (~4 characters per token)
+MAX_JOB_TEXT_TOKENS = int(os.getenv("JOB_TEXT_TOKEN_BUDGET", "2500"))
+CHARS_PER_TOKEN = 4
+
+# Section headings by how much they say about fit (higher is kept first);
+# text before the first heading counts as 1
+SECTION_PRIORITIES = [
+    (3, re.compile(
+        r"(minimum |basic |preferred |required |key )?(requirements|qualifications|skills|experience)"
+        r"|must[- ]haves?|nice[- ]to[- ]haves?|what you('ll)? (need|bring)|who you are|about you"
+        r"|what we('re| are)? looking for|you (have|bring|should have)"
+    )),
+    (2, re.compile(
+        r"(key |your |main )?(responsibilities|duties)|what you('ll| will)? (do|be doing)|the role"
+        r"|about the (role|job|position|team)|job (description|summary|details)|role overview|your impact"
+        r"|day[- ]to[- ]day|compensation|salary|pay range|location|work (arrangement|model)"
+    )),
+    (0, re.compile(
+        r"about (us|the company|\w+)|who we are|our (mission|culture|values|story)|benefits|perks"
+        r"|why (join|work)|what we offer|equal (employment )?opportunity|diversity|eeo|privacy"
+    )),
+]
+
+# Single lines that are never part of a job description
+BOILERPLATE_LINE = re.compile(
+    r"cookie|accept all|reject all|privacy (policy|notice|settings)|terms (of|and) (use|service|conditions)"
+    r"|all rights reserved|©|skip to (main )?content|^(sign|log) ?in\b|create (an )?account"
+    r"|share (this )?(job|role)|back to (search|jobs|results)|follow us|subscribe|newsletter"
+    r"|^(home|menu|search|close|apply( now)?|save( job)?|linkedin|twitter|facebook|instagram|youtube|x)$",
+    re.IGNORECASE
+)
+_MAX_BOILERPLATE_LINE = 120  # longer lines are real content even if they mention cookies
+_MAX_LINE = 500  # longer lines (whole descriptions on one line) are split into sentences
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _normalize_line(line: str) -> str:
+    return re.sub(r'\s+', ' ', line.strip(' \t•·*-–—>').lower())
+
+
+def _line_fingerprint(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _split_long_line(line: str) -> list:
+    """Sentences of an overlong line, hard-wrapped where a sentence is still too long."""
+    if len(line) <= _MAX_LINE:
+        return [line]
+    pieces = []
+    for sentence in re.split(r'(?<=[.!?;])\s+', line):
+        pieces.extend(sentence[i:i + _MAX_LINE] for i in range(0, len(sentence), _MAX_LINE))
+    return pieces
+
+
+def heading_priority(line: str) -> Optional[int]:
+    """Priority of a section heading line, or None if the line is not a heading."""
+    normalized = _normalize_line(line).rstrip(':')
+    if not normalized or len(normalized) > 60 or len(normalized.split()) > 8:
+        return None
+    for priority, pattern in SECTION_PRIORITIES:
+        if pattern.fullmatch(normalized):
+            return priority
+    return None
+
+
+class TextCondenser:
+    """
+    Condenses job-page text to a token budget.
+
+    When the page URL is given, the condenser remembers which lines it has
+    seen on each site (persistently, in a DiskCache) and treats lines that
+    appear on at least half of a site's pages - and on `min_pages` or
+    more - as boilerplate. Only low-priority sections (about us, benefits,
+    EEO) lose lines that way; the header block with title, location and
+    employment type never does. The output keeps document order, so
+    condensing condensed text changes nothing.
+
+    Because that output depends on what has been learned so far,
+    `stable_text()` maps it back to the condensation of the same page
+    without site learning, for cache keys that must not drift.
+    """
+
+    def __init__(self, max_tokens: int = MAX_JOB_TEXT_TOKENS, min_pages: int = 3,
+                 max_lines_per_site: int = 5000, path: Optional[str] = None):
+        self.max_tokens = max_tokens
+        self.min_pages = min_pages
+        self.max_lines_per_site = max_lines_per_site
+        self.sites = DiskCache('boilerplate', default_ttl=14 * 24 * 3600, max_entries=2000, path=path)
+        self._lock = threading.Lock()
+        self._stable = OrderedDict()  # fingerprint of site-condensed text -> text condensed without learning
+        self.counters = {'pages': 0, 'chars_in': 0, 'chars_out': 0,
+                         'boilerplate_lines': 0, 'duplicate_lines': 0, 'budget_cut_chars': 0}
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self.counters[name] += amount
+
+    @staticmethod
+    def site_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _learn(self, site: str, fingerprints: set, page_fingerprint: str) -> dict:
+        """Record one page's lines for its site. Returns the site record."""
+        with self._lock:
+            record = self.sites.get(site) or {'pages': [], 'lines': {}}
+            if page_fingerprint not in record['pages']:
+                record['pages'] = (record['pages'] + [page_fingerprint])[-100:]
+                lines = record['lines']
+                for fp in fingerprints:
+                    lines[fp] = lines.get(fp, 0) + 1
+                if len(lines) > self.max_lines_per_site:
+                    keep = sorted(lines.items(), key=lambda kv: kv[1], reverse=True)[:self.max_lines_per_site]
+                    record['lines'] = dict(keep)
+                self.sites.set(site, record)
+            return record
+
+    def _site_boilerplate(self, record: dict) -> set:
+        threshold = max(self.min_pages, len(record['pages']) / 2)
+        return {fp for fp, count in record['lines'].items() if count >= threshold}
+
+    def _sections(self, text: str, url: Optional[str]) -> tuple:
+        """
+        Split text into [priority, [lines], has_heading] sections, dropping
+        boilerplate and repeated lines on the way.
+
+        Returns:
+            tuple: (sections, repeated lines dropped, boilerplate lines dropped)
+        """
+        lines = []
+        seen = set()
+        duplicates = banned = 0
+        for line in (piece.strip() for raw in text.splitlines() for piece in _split_long_line(raw.strip())):
+            normalized = _normalize_line(line)
+            if not normalized:
+                continue
+            if normalized in seen:
+                duplicates += 1
+                continue
+            seen.add(normalized)
+            if len(line) <= _MAX_BOILERPLATE_LINE and BOILERPLATE_LINE.search(normalized):
+                banned += 1
+                continue
+            lines.append((line, normalized))
+
+        site_boilerplate = set()
+        if url:
+            fingerprints = {_line_fingerprint(n) for _, n in lines}
+            record = self._learn(self.site_of(url), fingerprints, _line_fingerprint(text))
+            site_boilerplate = self._site_boilerplate(record)
+
+        sections = [[1, [], False]]  # priority, lines, starts with a heading
+        for line, normalized in lines:
+            priority = heading_priority(line)
+            if priority is not None:
+                sections.append([priority, [line], True])
+                continue
+            current = sections[-1]
+            if current[0] == 0 and _line_fingerprint(normalized) in site_boilerplate:
+                banned += 1
+                continue
+            current[1].append(line)
+
+        return [section for section in sections if section[1]], duplicates, banned
+
+    def _fill(self, sections: list, budget: int) -> tuple:
+        """Fill the budget by priority; sections of equal priority in page order. Returns (text, chars used)."""
+        kept = [[] for _ in sections]
+        used = 0
+        for index in sorted(range(len(sections)), key=lambda i: -sections[i][0]):
+            for line in sections[index][1]:
+                cost = len(line) + 1
+                if used + cost > budget:
+                    continue  # a shorter line further down may still fit
+                kept[index].append(line)
+                used += cost
+            if sections[index][2] and len(kept[index]) == 1:
+                used -= len(kept[index].pop()) + 1  # heading without any of its text
+        return '\n'.join(line for lines in kept for line in lines), used
+
+    def condense(self, text: str, url: Optional[str] = None, max_tokens: Optional[int] = None) -> str:
+        """
+        Condense one job text.
+
+        Args:
+            text (str): Page text (innerText or a SerpApi description)
+            url (str): Page URL, to learn and drop per-site boilerplate (optional)
+            max_tokens (int): Token budget (default: self.max_tokens)
+
+        Returns:
+            str: Condensed text, at most ~max_tokens tokens
+        """
+        if not text:
+            return ''
+        budget = (max_tokens or self.max_tokens) * CHARS_PER_TOKEN
+        sections, duplicates, banned = self._sections(text, url)
+        condensed, used = self._fill(sections, budget)
+
+        if url:
+            stable, _ = self._fill(self._sections(text, None)[0], budget)
+            if stable != condensed:
+                with self._lock:
+                    self._stable[_line_fingerprint(condensed)] = stable
+                    while len(self._stable) > 1024:
+                        self._stable.popitem(last=False)
+
+        total = sum(len(line) + 1 for _, lines, _ in sections for line in lines)
+        self._count(duplicate_lines=duplicates, boilerplate_lines=banned)
+        if url or condensed != text:  # text condensed once already is not counted again
+            self._count(pages=1, chars_in=len(text), chars_out=len(condensed), budget_cut_chars=max(0, total - used))
+        return condensed
+
+    def stable_text(self, text: str) -> str:
+        """
+        The condensation of `text` that does not depend on site learning.
+
+        For output of condense(url=...) this is the same page condensed
+        without the learned boilerplate; any other text is just condensed.
+        """
+        with self._lock:
+            stable = self._stable.get(_line_fingerprint(text))
+        if stable is None:
+            stable, _ = self._fill(self._sections(text, None)[0], self.max_tokens * CHARS_PER_TOKEN)
+        return stable
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+        stats['saved_pct'] = round(100 * (1 - stats['chars_out'] / stats['chars_in']), 1) if stats['chars_in'] else 0.0
+        return stats
+
+
+# Global instance used by the analyzer and the fetch stages
+text_condenser = TextCondenser()
+
+
+@lru_cache(maxsize=256)
+def condense_job_text(text: str) -> str:
+    """
+    Condense job text with the shared condenser, without site learning.
+
+    Memoised because the analyzer condenses the same text for the cache
+    key, the token estimate and the prompt.
+    """
+    return text_condenser.condense(text)
+
+
+if __name__ == "__main__":
+    def page(title, requirements):
+        return "\n".join([
+            "Skip to main content", "Careers", "Teams", "Locations", "Sign in",
+            "We use cookies to improve your experience. Accept all",
+            title, "Bangalore, India", "Apply now",
+            "About Acme", "Acme builds payments software for millions of merchants. " * 8,
+            "Responsibilities", "Design and build backend services.", "Own services in production.",
+            "Requirements", *requirements,
+            "Benefits", "Health insurance", "Flexible hours", "Learning budget",
+            "Share this job", "Apply now", "© 2024 Acme Inc. All rights reserved.",
+            "Careers", "Teams", "Locations", "Privacy Policy",
+        ])
+
+    condenser = TextCondenser(max_tokens=120, path=":memory:")
+    condenser.condense(page("Frontend Engineer", ["3+ years of React", "TypeScript"]), url="https://jobs.acme.com/1")
+    condenser.condense(page("Data Engineer", ["Spark", "Airflow"]), url="https://jobs.acme.com/2")
+    text = page("Senior Backend Engineer", ["5+ years of Python or Go", "Experience with Kubernetes and AWS",
+                                            "Strong SQL skills"])
+    condensed = condenser.condense(text, url="https://jobs.acme.com/3")
+    print(condensed)
+    assert "Bangalore, India" in condensed, "header metadata must survive site learning"
+    assert condenser.stable_text(condensed) == condenser.condense(text), "cache key text must not depend on learning"
+    print(f"\n{len(text)} -> {len(condensed)} chars; truncating to the same size would keep:\n"
+          f"{text[:len(condensed)]!r}")
+    print(condenser.stats())
+    assert condenser.condense(condensed) == condensed, "condensing must be idempotent"
@@ -3,17 +3,23 @@ Beautiful Gradio UI for Stealth Job Discovery Bot
 Professional, modern interface with CV upload and customization.
 """
 
-import gradio as gr
 import os
 import time
 from dotenv import load_dotenv
 
 # Import our modules
 from companies import get_companies_by_tier, get_all_companies
-from job_finder import search_by_skills_and_experience, search_multiple_companies
-from scraper import get_page_content
-from analyzer import analyze_job
-from robots_checker import is_url_scrapable
+from pipeline import JobPipeline
+from job_finder import search_stats
+from serpapi_cache import serpapi_cache
+from http_fetcher import http_fetcher
+from page_cache import page_cache
+from analysis_pool import AnalysisExecutor
+from analysis_cache import analysis_cache
+from relevance import RelevanceFilter, RelevanceScorer, extract_skills
+from semantic_index import semantic_index
+from text_condenser import text_condenser
+from analyzer import MY_PROFILE
 
 load_dotenv()
 
@@ -36,23 +42,7 @@ def read_cv_file(cv_file):
 
 def extract_skills_from_text(text):
     """Extract key skills from CV text (simple keyword extraction)"""
-    common_skills = [
-        'Python', 'Java', 'JavaScript', 'Go', 'Golang', 'C++', 'C#', 'Ruby', 'PHP',
-        'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring', 'Express',
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'CI/CD',
-        'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
-        'Machine Learning', 'AI', 'Deep Learning', 'TensorFlow', 'PyTorch',
-        'REST API', 'GraphQL', 'Microservices', 'Git', 'Linux'
-    ]
-    
-    found_skills = []
-    text_lower = text.lower()
-    
-    for skill in common_skills:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-    
-    return found_skills[:10]  # Return top 10
+    return extract_skills(text, limit=10)  # Return top 10
 
 
 def run_job_search(
@@ -63,9 +53,17 @@ def run_job_search(
     company_tier,
     max_companies,
     min_match_score,
-    progress=gr.Progress()
+    progress=None
 ):
-    """Main job search function with progress tracking"""
+    """
+    Main job search function with progress tracking.
+    
+    A generator: Gradio re-renders the outputs on every yield, so matches
+    show up while later companies are still being searched. `progress` is
+    the gr.Progress tracker injected by the UI (optional elsewhere).
+    """
+    if progress is None:
+        progress = lambda *args, **kwargs: None
     
     global search_results
     search_results = []
@@ -94,7 +92,8 @@ def run_job_search(
     
     if "Error" in cv_content or "No CV" in cv_content:
         log(f"ERROR: CV read failed - {cv_content}", "ERROR")
-        return cv_content, "❌ Cannot proceed without CV", [], "\n".join(detailed_logs)
+        yield cv_content, "❌ Cannot proceed without CV", [], "\n".join(detailed_logs)
+        return
     
     # Extract skills
     progress(0.2, desc="🔍 Extracting skills from CV...")
@@ -126,131 +125,165 @@ def run_job_search(
     total_companies = min(max_companies, len(companies))
     log(f"Will search {total_companies} companies")
     
-    # Step 3: Search for jobs
+    # Step 3: Search, scrape and analyze as one streaming pipeline
     progress(0.4, desc=f"🔎 Searching jobs at {total_companies} companies...")
-    log("STEP 4: Searching for jobs via SerpApi...")
+    log("STEP 4: Streaming search -> scrape -> AI analysis pipeline...")
     log("-" * 80)
     
-    found_jobs = search_multiple_companies(
-        companies=companies,
+    progress_msg = skills_display + "🤖 Results appear as soon as each job is analyzed...\n\n"
+    good_matches = []
+    results_table = []
+    jobs_found = 0
+    jobs_done = 0
+    
+    search_stats.reset()
+    # The executor analyzes against MY_PROFILE; so does the offline fallback
+    semantic_index.set_profile(MY_PROFILE)
+    executor = AnalysisExecutor(concurrency=4, fallback=semantic_index.offline_analysis, logger=log)
+    relevance = RelevanceFilter(
+        RelevanceScorer(extract_skills(cv_content, limit=None) or skills, job_title, years_experience=years_exp)
+    )
+    pipeline = JobPipeline(
+        analyze=executor.analyze,
         job_title=job_title,
         location=location,
-        max_companies=max_companies,
         jobs_per_company=2,
+        search_workers=2,
+        batch_size=4,
+        analysis_workers=executor.concurrency,
+        relevance=relevance,
         logger=log  # Pass our log function
     )
     
-    log("-" * 80)
-    log(f"Search complete: Found {len(found_jobs)} total job postings")
-    
-    if not found_jobs:
-        log("WARNING: No jobs found from search", "WARN")
-        return (
-            skills_display + "❌ No jobs found. Try different search criteria.",
-            "No jobs to analyze",
-            [],
-            "\n".join(detailed_logs)
-        )
-    
-    progress_msg = f"{skills_display}✅ Found {len(found_jobs)} potential jobs\n\n"
-    progress_msg += "🤖 Starting AI analysis...\n\n"
-    
-    log("STEP 5: Starting AI job analysis...")
-    log("-" * 80)
-    
-    # Step 4: Analyze each job
-    good_matches = []
-    
-    for idx, job in enumerate(found_jobs):
-        progress(
-            0.4 + (0.5 * (idx / len(found_jobs))),
-            desc=f"🤖 Analyzing job {idx+1}/{len(found_jobs)}..."
-        )
-        
+    for event in pipeline.run(companies, max_companies=max_companies):
+        job = event.get('job') or {}
         job_title_text = job.get('title', 'Unknown')
         company_name = job.get('company_name', 'Unknown')
         job_url = job.get('career_page_url', '')
-        url_source = job.get('url_source', 'unknown')
-        
-        log(f"Job {idx+1}/{len(found_jobs)}: {job_title_text} @ {company_name}")
-        log(f"  URL: {job_url or 'No URL'}")
-        log(f"  URL Source: {url_source}")
-        
-        # Check robots.txt
-        if job_url:
-            log(f"  Checking robots.txt for {job_url}...")
-            allowed, reason = is_url_scrapable(job_url)
-            log(f"  robots.txt result: Allowed={allowed}, Reason={reason}")
-            if not allowed:
-                progress_msg += f"⏭️  Skipped: {job_title_text} @ {company_name} (robots.txt blocked)\n"
-                log(f"  SKIPPED due to robots.txt", "WARN")
-                continue
         
-        # Scrape job details
-        progress_msg += f"🕵️  Analyzing: {job_title_text} @ {company_name}\n"
+        if event['type'] == 'job_found':
+            jobs_found += 1
+            continue
         
-        content = None
-        content_source = ""
+        if event['type'] == 'error':
+            log(f"Pipeline {event['stage']} error: {event['error']}", "ERROR")
+            continue
         
-        if job_url:
-            log(f"  Attempting to scrape job page...")
-            content = get_page_content(job_url, respect_robots=True)
-            if content and len(content) >= 100:
-                log(f"  ✅ Scraped {len(content)} characters from job page")
-                content_source = "scraped"
-            else:
-                log(f"  ⚠️  Scraping returned insufficient content ({len(content) if content else 0} chars)")
+        jobs_done += 1
+        progress(
+            0.4 + (0.5 * (jobs_done / max(jobs_found, 1))),
+            desc=f"🤖 Analyzed {jobs_done}/{jobs_found} jobs found so far..."
+        )
         
-        # Use SerpApi description as fallback (often has good details)
-        if not content or len(content) < 100:
-            description = job.get('description', '')
-            if description:
-                log(f"  Using SerpApi description: {len(description)} characters")
-                content = f"Job Title: {job_title_text}\\n\\n{description}"
-                content_source = "serpapi_description"
+        if event['type'] == 'skipped':
+            if event['reason'] == 'robots_blocked':
+                progress_msg += f"⏭️  Skipped: {job_title_text} @ {company_name} (robots.txt blocked)\n"
+            elif event['reason'] == 'low_relevance':
+                progress_msg += f"⏭️  Skipped: {job_title_text} @ {company_name} (relevance {event['relevance']:.2f}, not worth an AI call)\n"
             else:
-                log(f"  No description available from SerpApi")
-        
-        if not content or len(content) < 50:
-            progress_msg += f"   ⚠️  Could not fetch details, skipping\\n\\n"
-            log(f"  SKIPPED: Content too short ({len(content) if content else 0} chars)", "WARN")
+                progress_msg += f"⚠️  Could not fetch details for {job_title_text} @ {company_name}, skipping\n\n"
+            log(f"  SKIPPED {job_title_text} @ {company_name}: {event['reason']}", "WARN")
             continue
         
-        log(f"  Content source: {content_source}, length: {len(content)}")
-        
-        # AI Analysis
-        log(f"  Sending to Gemini AI for analysis...")
-        analysis = analyze_job(content, logger=log)
+        # event['type'] == 'result'
+        analysis = event['analysis']
         score = analysis['match_score']
-        log(f"  AI returned score: {score}/100")
+        offline = bool(analysis.get('offline'))
+        scorer = "Offline similarity estimate" if offline else "AI returned score"
+        log(f"{job_title_text} @ {company_name} ({event['content_source']}): {scorer} {score}/100")
+        progress_msg += f"🕵️  Analyzed: {job_title_text} @ {company_name}\n"
+        
+        if analysis.get('error'):
+            progress_msg += f"   ❌ AI analysis failed: {analysis['reason']}\n\n"
+            continue
         
-        progress_msg += f"   🎯 Score: {score}/100 - {analysis['reason']}\n"
+        if offline:
+            # Gemini was unavailable: a profile-similarity heuristic, not an AI match score
+            progress_msg += f"   📴 Offline estimate (profile similarity, not AI): {score}/100 - {analysis['reason']}\n"
+        else:
+            progress_msg += f"   🎯 Score: {score}/100 - {analysis['reason']}\n"
         
         if score >= min_match_score:
             log(f"  ✅ GOOD MATCH! (score {score} >= threshold {min_match_score})")
-            good_matches.append({
+            match = {
                 'title': job_title_text,
                 'company': company_name,
                 'location': job.get('location', 'Unknown'),
                 'score': score,
                 'reason': analysis['reason'],
                 'url': job_url or job.get('share_url', '#'),
-                'apply_link': analysis.get('apply_link') or job_url
-            })
+                'apply_link': analysis.get('apply_link') or job_url,
+                'offline': offline
+            }
+            good_matches.append(match)
+            results_table.append([
+                match['title'],
+                match['company'],
+                match['location'],
+                f"{match['score']}/100" + (" (offline estimate)" if offline else ""),
+                match['apply_link']
+            ])
+            search_results = good_matches
             progress_msg += f"   ✅ GOOD MATCH!\n\n"
         else:
             log(f"  ⏭️ Score too low ({score} < {min_match_score})")
             progress_msg += f"   ⏭️  Score too low\n\n"
         
-        log("")  # Empty line for readability
-        time.sleep(1)  # Rate limiting
+        # Stream the partial results to the UI
+        yield (
+            progress_msg,
+            f"⏳ {jobs_done}/{jobs_found} jobs analyzed, {len(good_matches)} matches so far...",
+            results_table,
+            "\n".join(detailed_logs)
+        )
     
     log("-" * 80)
-    log(f"Analysis complete: {len(good_matches)} jobs matched criteria")
+    log(f"Pipeline complete: {jobs_found} jobs found, {len(good_matches)} matched criteria")
+    serp = search_stats.summary()
+    log(f"SerpApi: {serp['companies']} companies searched in {serp['api_calls']} calls, avg latency {serp['avg_latency']}s, "
+        f"max {serp['max_latency']}s, {serp['errors']} errors")
+    dedup_stats = pipeline.deduplicator.stats()
+    log(f"Dedup: {dedup_stats['duplicates']} duplicate postings dropped {dedup_stats['by_reason']}, "
+        f"saving {dedup_stats['scrapes_saved']} scrapes and {dedup_stats['ai_calls_saved']} AI calls")
+    serp_cache = serpapi_cache.stats()
+    log(f"SerpApi cache: {serp_cache['calls_made']} calls made, {serp_cache['calls_saved']} saved, "
+        f"{serp_cache['quota_used']}/{serp_cache['quota_limit'] or 'unlimited'} of today's quota used")
+    
+    if not jobs_found:
+        log("WARNING: No jobs found from search", "WARN")
+        yield (
+            skills_display + "❌ No jobs found. Try different search criteria.",
+            "No jobs to analyze",
+            [],
+            "\n".join(detailed_logs)
+        )
+        return
+    
+    condensed = text_condenser.stats()
+    log(f"Text condenser: {condensed['chars_in']} -> {condensed['chars_out']} chars ({condensed['saved_pct']}% saved), "
+        f"{condensed['boilerplate_lines']} boilerplate and {condensed['duplicate_lines']} repeated lines dropped")
+    relevance_stats = relevance.stats()
+    log(f"Relevance pre-filter: {relevance_stats['llm_calls_avoided']} of {relevance_stats['considered']} jobs "
+        f"below {relevance_stats['floor']} skipped without an AI call")
+    ai_stats = executor.stats()
+    log(f"AI calls: {ai_stats['requests']} requests, {ai_stats['cached']} cached, "
+        f"{ai_stats['retries']} retries after rate limiting, {ai_stats['failed']} failed, "
+        f"{ai_stats['offline']} scored offline")
+    parsing = executor.analyzer.parse_stats()
+    log(f"AI responses: {parsing['responses']} received, {parsing['clean']} valid JSON, {parsing['repaired']} repaired locally, "
+        f"{parsing['invalid']} unusable ({parsing['failure_rate']}% failure rate), {parsing['parse_retries']} re-asked")
+    tiers = http_fetcher.tier_stats()
+    log(f"Fetch tiers: {tiers.get('http', 0)} pages over HTTP ({tiers.get('http_rate', 0.0)}%), "
+        f"{tiers.get('browser', 0)} needed the browser")
+    cache = page_cache.stats()
+    log(f"Page cache: {cache['hits']} hits, {cache['misses']} misses, "
+        f"{cache['revalidated']} revalidated, {cache['updated']} updated ({cache['entries']} pages, {cache['kb_on_disk']} KB on disk)")
+    analyses = analysis_cache.stats()
+    log(f"Analysis cache: {analyses['hits']} Gemini calls saved, {analyses['misses']} misses")
     
     # Step 5: Final results
     progress(1.0, desc="✅ Search complete!")
-    log("STEP 6: Preparing final results...")
+    log("STEP 5: Preparing final results...")
     
     if not good_matches:
         final_msg = f"\n\n{'='*50}\n😕 No jobs matched your criteria (min score: {min_match_score})\n"
@@ -260,37 +293,29 @@ def run_job_search(
         log("=" * 80)
         log("SESSION ENDED - NO MATCHES")
         log("=" * 80)
-        return skills_display + progress_msg + final_msg, "No matches found", [], "\n".join(detailed_logs)
+        yield progress_msg + final_msg, "No matches found", [], "\n".join(detailed_logs)
+        return
     
     # Format results
-    results_table = []
     final_summary = f"\n\n{'='*50}\n🎉 Found {len(good_matches)} Excellent Matches!\n{'='*50}\n\n"
     
     for idx, match in enumerate(good_matches, 1):
         final_summary += f"{idx}. **{match['title']}** @ **{match['company']}**\n"
         final_summary += f"   📍 {match['location']}\n"
-        final_summary += f"   🎯 Match Score: {match['score']}/100\n"
+        if match['offline']:
+            final_summary += f"   📴 Offline estimate (profile similarity, not AI): {match['score']}/100\n"
+        else:
+            final_summary += f"   🎯 Match Score: {match['score']}/100\n"
         final_summary += f"   💡 {match['reason']}\n"
         final_summary += f"   🔗 [Apply Here]({match['apply_link']})\n\n"
-        
-        # Table format
-        results_table.append([
-            match['title'],
-            match['company'],
-            match['location'],
-            f"{match['score']}/100",
-            match['apply_link']
-        ])
-    
-    search_results = good_matches
     
     log(f"Formatted {len(good_matches)} results for display")
     log("=" * 80)
     log("SESSION ENDED - SUCCESS")
     log("=" * 80)
     
-    return (
-        skills_display + progress_msg + final_summary,
+    yield (
+        progress_msg + final_summary,
         f"✅ Analysis complete! Found {len(good_matches)} matching jobs.",
         results_table,
         "\n".join(detailed_logs)  # Return logs as 4th value
@@ -311,7 +336,10 @@ def export_results():
         output += f"## {idx}. {job['title']}\n"
         output += f"- **Company:** {job['company']}\n"
         output += f"- **Location:** {job['location']}\n"
-        output += f"- **Match Score:** {job['score']}/100\n"
+        if job.get('offline'):
+            output += f"- **Offline Estimate (profile similarity, not AI):** {job['score']}/100\n"
+        else:
+            output += f"- **Match Score:** {job['score']}/100\n"
         output += f"- **Why:** {job['reason']}\n"
         output += f"- **Apply:** {job['apply_link']}\n\n"
     
@@ -323,187 +351,227 @@ def export_results():
     return filename
 
 
-# Create Gradio Interface
-with gr.Blocks(
-    title="🤖 Stealth Job Discovery Bot",
-    theme=gr.themes.Soft(
-        primary_hue="blue",
-        secondary_hue="purple",
-    ),
-    css="""
-        .gradio-container {
-            max-width: 1200px !important;
-        }
-        .header {
-            text-align: center;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        .footer {
-            text-align: center;
-            padding: 10px;
-            color: #666;
-            font-size: 0.9em;
-        }
+def build_app():
     """
-) as app:
-    
-    # Header
-    gr.HTML("""
-        <div class="header">
-            <h1>🤖 Stealth Job Discovery Bot</h1>
-            <p>AI-Powered Job Matching with Robots.txt Compliance</p>
-        </div>
-    """)
-    
-    with gr.Row():
-        with gr.Column(scale=1):
-            gr.Markdown("## 📝 Your Profile")
-            
-            cv_file = gr.File(
-                label="Upload CV (TXT file)",
-                file_types=[".txt"],
-                type="filepath"
-            )
-            
-            cv_preview = gr.Textbox(
-                label="CV Preview",
-                lines=5,
-                placeholder="CV content will appear here...",
-                interactive=False
-            )
-            
-            cv_file.change(
-                fn=read_cv_file,
-                inputs=[cv_file],
-                outputs=[cv_preview]
-            )
-            
-            gr.Markdown("---")
-            gr.Markdown("## 🎯 Search Parameters")
-            
-            job_title = gr.Textbox(
-                label="Job Title",
-                placeholder="e.g., Backend Developer, Data Scientist",
-                value="Software Engineer"
-            )
-            
-            years_exp = gr.Slider(
-                label="Years of Experience",
-                minimum=0,
-                maximum=20,
-                step=1,
-                value=3
-            )
-            
-            location = gr.Textbox(
-                label="Location",
-                placeholder="e.g., Bangalore, Remote, India",
-                value="India"
-            )
-            
-            company_tier = gr.Radio(
-                label="Company Tier",
-                choices=[
-                    "High-Tier (MNCs)",
-                    "Mid-Tier (Established)",
-                    "Startups (Unicorns)",
-                    "All Tiers"
-                ],
-                value="All Tiers"
-            )
-            
-            max_companies = gr.Slider(
-                label="Max Companies to Search",
-                minimum=1,
-                maximum=50,
-                step=1,
-                value=10,
-                info="More companies = longer search time"
-            )
-            
-            min_match_score = gr.Slider(
-                label="Minimum Match Score",
-                minimum=0,
-                maximum=100,
-                step=5,
-                value=70,
-                info="Jobs scoring below this will be filtered out"
-            )
-            
-            search_btn = gr.Button(
-                "🚀 Start Job Search",
-                variant="primary",
-                size="lg"
-            )
-        
-        with gr.Column(scale=2):
-            gr.Markdown("## 📊 Search Results")
-            
-            status_box = gr.Textbox(
-                label="Status",
-                lines=1,
-                interactive=False
-            )
-            
-            results_box = gr.Markdown(
-                value="Click 'Start Job Search' to begin...",
-                label="Analysis Log"
-            )
-            
-            gr.Markdown("### 🔍 Detailed Logs (Debug)")
-            
-            logs_box = gr.Textbox(
-                label="System Logs",
-                lines=15,
-                max_lines=30,
-                interactive=False,
-                placeholder="Detailed logs will appear here...",
-                show_label=True
-            )
-            
-            gr.Markdown("### 📋 Matching Jobs")
-            
-            results_table = gr.Dataframe(
-                headers=["Job Title", "Company", "Location", "Score", "Apply Link"],
-                datatype=["str", "str", "str", "str", "str"],
-                label="Top Matches",
-                wrap=True
-            )
-            
-            export_btn = gr.Button("💾 Export Results", variant="secondary")
-            export_file = gr.File(label="Download Results")
-    
-    # Event handlers
-    search_btn.click(
-        fn=run_job_search,
-        inputs=[
-            cv_file,
-            job_title,
-            years_exp,
-            location,
-            company_tier,
-            max_companies,
-            min_match_score
-        ],
-        outputs=[results_box, status_box, results_table, logs_box]  # Added logs_box as 4th output
-    )
+    Build the Gradio interface.
     
-    export_btn.click(
-        fn=export_results,
-        outputs=[export_file]
-    )
+    Gradio is imported here rather than at module level so that importing
+    ui_app (e.g. to reuse run_job_search) stays fast. `ui_app.app` still
+    works and builds the interface on first access.
+    """
+    import gradio as gr
+    
+    def search_handler(
+        cv_file,
+        job_title,
+        years_exp,
+        location,
+        company_tier,
+        max_companies,
+        min_match_score,
+        progress=gr.Progress()
+    ):
+        # Gradio only injects progress tracking for a gr.Progress() default
+        yield from run_job_search(
+            cv_file, job_title, years_exp, location, company_tier,
+            max_companies, min_match_score, progress=progress
+        )
     
-    # Footer
-    gr.HTML("""
-        <div class="footer">
-            <p>⚖️ <strong>Legal & Ethical Use:</strong> This bot respects robots.txt, only scrapes public data, and never auto-applies to jobs.</p>
-            <p>🔒 Your CV stays local. No data is uploaded to external servers.</p>
-        </div>
-    """)
+    with gr.Blocks(
+        title="🤖 Stealth Job Discovery Bot",
+        theme=gr.themes.Soft(
+            primary_hue="blue",
+            secondary_hue="purple",
+        ),
+        css="""
+            .gradio-container {
+                max-width: 1200px !important;
+            }
+            .header {
+                text-align: center;
+                padding: 20px;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                color: white;
+                border-radius: 10px;
+                margin-bottom: 20px;
+            }
+            .footer {
+                text-align: center;
+                padding: 10px;
+                color: #666;
+                font-size: 0.9em;
+            }
+        """
+    ) as app:
+        
+        # Header
+        gr.HTML("""
+            <div class="header">
+                <h1>🤖 Stealth Job Discovery Bot</h1>
+                <p>AI-Powered Job Matching with Robots.txt Compliance</p>
+            </div>
+        """)
+        
+        with gr.Row():
+            with gr.Column(scale=1):
+                gr.Markdown("## 📝 Your Profile")
+                
+                cv_file = gr.File(
+                    label="Upload CV (TXT file)",
+                    file_types=[".txt"],
+                    type="filepath"
+                )
+                
+                cv_preview = gr.Textbox(
+                    label="CV Preview",
+                    lines=5,
+                    placeholder="CV content will appear here...",
+                    interactive=False
+                )
+                
+                cv_file.change(
+                    fn=read_cv_file,
+                    inputs=[cv_file],
+                    outputs=[cv_preview]
+                )
+                
+                gr.Markdown("---")
+                gr.Markdown("## 🎯 Search Parameters")
+                
+                job_title = gr.Textbox(
+                    label="Job Title",
+                    placeholder="e.g., Backend Developer, Data Scientist",
+                    value="Software Engineer"
+                )
+                
+                years_exp = gr.Slider(
+                    label="Years of Experience",
+                    minimum=0,
+                    maximum=20,
+                    step=1,
+                    value=3
+                )
+                
+                location = gr.Textbox(
+                    label="Location",
+                    placeholder="e.g., Bangalore, Remote, India",
+                    value="India"
+                )
+                
+                company_tier = gr.Radio(
+                    label="Company Tier",
+                    choices=[
+                        "High-Tier (MNCs)",
+                        "Mid-Tier (Established)",
+                        "Startups (Unicorns)",
+                        "All Tiers"
+                    ],
+                    value="All Tiers"
+                )
+                
+                max_companies = gr.Slider(
+                    label="Max Companies to Search",
+                    minimum=1,
+                    maximum=50,
+                    step=1,
+                    value=10,
+                    info="More companies = longer search time"
+                )
+                
+                min_match_score = gr.Slider(
+                    label="Minimum Match Score",
+                    minimum=0,
+                    maximum=100,
+                    step=5,
+                    value=70,
+                    info="Jobs scoring below this will be filtered out"
+                )
+                
+                search_btn = gr.Button(
+                    "🚀 Start Job Search",
+                    variant="primary",
+                    size="lg"
+                )
+            
+            with gr.Column(scale=2):
+                gr.Markdown("## 📊 Search Results")
+                
+                status_box = gr.Textbox(
+                    label="Status",
+                    lines=1,
+                    interactive=False
+                )
+                
+                results_box = gr.Markdown(
+                    value="Click 'Start Job Search' to begin...",
+                    label="Analysis Log"
+                )
+                
+                gr.Markdown("### 🔍 Detailed Logs (Debug)")
+                
+                logs_box = gr.Textbox(
+                    label="System Logs",
+                    lines=15,
+                    max_lines=30,
+                    interactive=False,
+                    placeholder="Detailed logs will appear here...",
+                    show_label=True
+                )
+                
+                gr.Markdown("### 📋 Matching Jobs")
+                
+                results_table = gr.Dataframe(
+                    headers=["Job Title", "Company", "Location", "Score", "Apply Link"],
+                    datatype=["str", "str", "str", "str", "str"],
+                    label="Top Matches",
+                    wrap=True
+                )
+                
+                export_btn = gr.Button("💾 Export Results", variant="secondary")
+                export_file = gr.File(label="Download Results")
+        
+        # Event handlers
+        search_btn.click(
+            fn=search_handler,
+            inputs=[
+                cv_file,
+                job_title,
+                years_exp,
+                location,
+                company_tier,
+                max_companies,
+                min_match_score
+            ],
+            outputs=[results_box, status_box, results_table, logs_box]  # Added logs_box as 4th output
+        )
+        
+        export_btn.click(
+            fn=export_results,
+            outputs=[export_file]
+        )
+        
+        # Footer
+        gr.HTML("""
+            <div class="footer">
+                <p>⚖️ <strong>Legal & Ethical Use:</strong> This bot respects robots.txt, only scrapes public data, and never auto-applies to jobs.</p>
+                <p>🔒 Your CV stays local. No data is uploaded to external servers.</p>
+            </div>
+        """)
+    
+    return app
+
+
+_app = None
+
+
+def __getattr__(name):
+    """Build the Gradio app lazily on first access to `ui_app.app` (PEP 562)."""
+    global _app
+    if name == 'app':
+        if _app is None:
+            _app = build_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
@@ -526,6 +594,7 @@ if __name__ == "__main__":
     print("\n" + "="*60 + "\n")
     
     # Launch the app
+    app = build_app()
     app.launch(
         server_name="0.0.0.0",
         server_port=7860,
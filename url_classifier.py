@@ -0,0 +1,151 @@
+"""
+URL Classifier
+Decides whether a link is a job aggregator or a company career page.
+Hosts are matched on domain boundaries (so notlinkedin.com is not
+LinkedIn), keywords go through one compiled regex and results are cached.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+
+# Job aggregators - never treated as a company career page
+DEFAULT_AGGREGATOR_DOMAINS = [
+    'indeed.com',
+    'linkedin.com',
+    'naukri.com',
+    'monster.com',
+    'glassdoor.com',
+    'ziprecruiter.com',
+    'shine.com',
+    'timesjobs.com',
+    'instahyre.com',
+    'hirist.com',
+    'foundit.in',
+    'apna.co',
+]
+
+# Words that mark a URL as career / job related
+DEFAULT_CAREER_KEYWORDS = ['career', 'job', 'hiring', 'work-with-us', 'join', 'opportunity']
+
+# Optional JSON file overriding the lists above:
+# {"aggregator_domains": [...], "career_keywords": [...]}
+RULES_FILE = os.getenv("JOBBOT_URL_RULES", "url_rules.json")
+
+AGGREGATOR = 'aggregator'
+CAREER = 'career'
+OTHER = 'other'
+
+
+class UrlClassifier:
+    """
+    Classifies URLs as AGGREGATOR, CAREER or OTHER.
+
+    A URL is an aggregator when its host is one of `aggregator_domains` or
+    a subdomain of one (in.linkedin.com), checked by walking the host's
+    label suffixes against a set. Otherwise it is a career page when any
+    career keyword appears anywhere in the URL.
+    """
+
+    def __init__(
+        self,
+        aggregator_domains: Iterable[str] = DEFAULT_AGGREGATOR_DOMAINS,
+        career_keywords: Iterable[str] = DEFAULT_CAREER_KEYWORDS,
+        cache_size: int = 8192
+    ):
+        self.aggregator_domains = frozenset(d.lower().strip('.') for d in aggregator_domains)
+        self.career_keywords = list(career_keywords)
+        self._keyword_pattern = re.compile(
+            '|'.join(re.escape(keyword) for keyword in self.career_keywords), re.IGNORECASE
+        ) if self.career_keywords else None
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'UrlClassifier':
+        """Build a classifier from a JSON rules file (missing keys use the defaults)."""
+        with open(path, encoding='utf-8') as f:
+            rules = json.load(f)
+        return cls(
+            aggregator_domains=rules.get('aggregator_domains', DEFAULT_AGGREGATOR_DOMAINS),
+            career_keywords=rules.get('career_keywords', DEFAULT_CAREER_KEYWORDS)
+        )
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Lowercase host of a URL; scheme-less URLs ("linkedin.com/jobs") are accepted."""
+        parsed = urlparse(url if '//' in url else f"//{url}")
+        return (parsed.hostname or '').rstrip('.')
+
+    def is_aggregator_host(self, host: str) -> bool:
+        labels = host.split('.')
+        return any('.'.join(labels[i:]) in self.aggregator_domains for i in range(len(labels) - 1))
+
+    def _classify(self, url: str) -> str:
+        if not url:
+            return OTHER
+        if self.is_aggregator_host(self.host_of(url)):
+            return AGGREGATOR
+        if self._keyword_pattern and self._keyword_pattern.search(url):
+            return CAREER
+        return OTHER
+
+    def is_aggregator(self, url: str) -> bool:
+        return self.classify(url) == AGGREGATOR
+
+    def is_company_career_page(self, url: str) -> bool:
+        return self.classify(url) == CAREER
+
+    def cache_info(self):
+        return self.classify.cache_info()
+
+
+def load_url_classifier(path: Optional[str] = None) -> UrlClassifier:
+    """Use the rules file if it exists, otherwise the built-in lists."""
+    path = path or RULES_FILE
+    if path and os.path.exists(path):
+        return UrlClassifier.from_file(path)
+    return UrlClassifier()
+
+
+# Global instance shared by job_finder and main
+url_classifier = load_url_classifier()
+
+
+if __name__ == "__main__":
+    import random
+    import timeit
+
+    def legacy_is_company_career_page(url: str) -> bool:
+        """The substring scan this module replaces, kept for comparison."""
+        url_lower = url.lower()
+        for domain in DEFAULT_AGGREGATOR_DOMAINS:
+            if domain in url_lower:
+                return False
+        career_keywords = ['career', 'job', 'hiring', 'work-with-us', 'join', 'opportunity']
+        return any(keyword in url_lower for keyword in career_keywords)
+
+    random.seed(7)
+    hosts = ['careers.google.com', 'jobs.netflix.com', 'www.linkedin.com', 'in.indeed.com',
+             'notlinkedin.com', 'amazon.jobs', 'www.naukri.com', 'boards.greenhouse.io',
+             'jobs.lever.co', 'www.example.com', 'acme.com', 'glassdoor.co.in']
+    paths = ['/jobs/view/123', '/careers/backend-engineer', '/join-us', '/about', '/blog/hiring-tips',
+             '/en/position/42', '/opportunity/99', '/apply?ref=linkedin.com', '/']
+    unique = [f"https://{random.choice(hosts)}{random.choice(paths)}?id={i}" for i in range(5000)]
+    # Real runs see the same links many times (apply_options, related_links, retries)
+    corpus = [random.choice(unique) for _ in range(100000)]
+
+    classifier = UrlClassifier()
+    legacy = timeit.timeit(lambda: [legacy_is_company_career_page(u) for u in corpus], number=1)
+    compiled = timeit.timeit(lambda: [classifier.is_company_career_page(u) for u in corpus], number=1)
+    differ = [u for u in unique if legacy_is_company_career_page(u) != classifier.is_company_career_page(u)]
+
+    print(f"📊 {len(corpus)} URLs ({len(unique)} unique)")
+    print(f"   legacy substring scan: {legacy * 1000:.0f} ms")
+    print(f"   UrlClassifier:         {compiled * 1000:.0f} ms ({legacy / compiled:.1f}x) {classifier.cache_info()}")
+    print(f"   {len(differ)} URLs classified differently, e.g.:")
+    for url in sorted({re.sub(r'\?id=\d+', '', u) for u in differ})[:5]:
+        print(f"     {url}: legacy={legacy_is_company_career_page(url)} new={classifier.is_company_career_page(url)}")
@@ -0,0 +1,71 @@
+"""
+URL Utilities
+Canonical URL form used as a cache and deduplication key.
+"""
+
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+
+# Query parameters that only carry tracking information
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'dclid', 'gbraid', 'wbraid',
+    '_hsenc', '_hsmi', 'mc_cid', 'mc_eid', 'trk', 'trkinfo', 'ref_src'
+}
+TRACKING_PREFIXES = ('utm_',)
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalise a URL so the same page always maps to the same string.
+
+    - lowercases scheme and host, drops default ports
+    - drops fragments, except route-style ones (#/job/1, #!/job/1) that
+      select a posting in a hash-routed single-page app
+    - removes tracking parameters (utm_*, gclid, fbclid, ...)
+    - sorts the remaining query parameters
+
+    Args:
+        url (str): Any absolute URL
+
+    Returns:
+        str: Normalised URL (the input unchanged if it cannot be parsed)
+    """
+    try:
+        parsed = urlparse(url.strip())
+        port = parsed.port
+    except Exception:
+        return url
+
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if (scheme, port) in (('http', 80), ('https', 443)):
+        port = None
+    netloc = f"{host}:{port}" if port else host
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not is_tracking_param(k)
+    )
+
+    fragment = parsed.fragment if parsed.fragment.startswith(('/', '!')) else ''
+
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, urlencode(query), fragment))
+
+
+if __name__ == "__main__":
+    CASES = [
+        ('HTTPS://Acme.com:443/careers/42?utm_source=google&b=2&a=1#apply', 'https://acme.com/careers/42?a=1&b=2'),
+        ('https://x.com/careers/#/job/1', 'https://x.com/careers/#/job/1'),
+        ('https://x.com/careers/#!/job/1?gclid=abc', 'https://x.com/careers/#!/job/1?gclid=abc'),
+        ('https://x.com', 'https://x.com/'),
+    ]
+    for url, expected in CASES:
+        assert normalize_url(url) == expected, f"{url}: {normalize_url(url)} != {expected}"
+    # Hash-routed SPA postings must not share a cache key
+    assert normalize_url('https://x.com/careers/#/job/1') != normalize_url('https://x.com/careers/#/job/2')
+    print(f"🧪 {len(CASES) + 1} URL normalisation cases passed")